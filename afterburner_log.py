@@ -0,0 +1,155 @@
+# afterburner_log.py
+# Lecteur natif des logs texte de MSI Afterburner (.hml / .csv)
+#
+# Format d'un log (une ligne = un enregistrement, séparateur ',') :
+#   00, 20-11-2025 22:19:20, Hardware monitoring log v1.6
+#   01, 20-11-2025 22:19:20, NVIDIA GeForce RTX 3080
+#   02, 20-11-2025 22:19:20, GPU temperature   ,GPU usage   ,Core clock  ,...   <- noms des colonnes
+#   03, 20-11-2025 22:19:20, °C                ,%           ,MHz         ,...   <- unités
+#   80, 20-11-2025 22:19:21, 45.000            ,30.000      ,1800.000    ,...   <- données
+#
+# Contrairement à l'export Excel, les valeurs sont déjà dans leur unité réelle
+# (pas de x1000), donc pas de mise à l'échelle à faire.
+# Les colonnes lues sont déduites de la ligne 02 (voir schema.py) : seules les métriques
+# reconnues sont parsées (usecols), directement en float64.
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from schema import METRIC_COLUMNS, METRIC_PARSE_DTYPE, POSITIONAL, TIMESTAMP_FIELD, resolve_header
+
+TEXT_LOG_EXTENSIONS = ('.hml', '.csv', '.txt')
+
+DATA_CODE = '80'
+HEADER_CODE = '02'
+TIMESTAMP_FORMAT = '%d-%m-%Y %H:%M:%S'
+TIMESTAMP_WIDTH = 19
+CHUNK_SIZE = 200_000
+
+# Positions des chiffres et séparateurs dans 'dd-mm-YYYY HH:MM:SS'
+_DIGIT_POS = [0, 1, 3, 4, 6, 7, 8, 9, 11, 12, 14, 15, 17, 18]
+_SEPARATORS = {2: '-', 5: '-', 10: ' ', 13: ':', 16: ':'}
+_MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def is_text_log(file_path):
+    return os.path.splitext(str(file_path))[1].lower() in TEXT_LOG_EXTENSIONS
+
+
+def parse_timestamps(values):
+    # Décodage vectorisé de 'dd-mm-YYYY HH:MM:SS' -> datetime64[ns] (NaT si invalide),
+    # sans passer par strptime ligne par ligne
+    arr = np.asarray(values, dtype='U%d' % (TIMESTAMP_WIDTH + 1))
+    if arr.size == 0:
+        return np.array([], dtype='datetime64[ns]')
+    codes = arr.view(np.uint32).reshape(len(arr), TIMESTAMP_WIDTH + 1).astype(np.int64)
+
+    digits = codes[:, _DIGIT_POS] - ord('0')
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1) & (codes[:, TIMESTAMP_WIDTH] == 0)
+    for pos, sep in _SEPARATORS.items():
+        valid &= codes[:, pos] == ord(sep)
+
+    day = digits[:, 0] * 10 + digits[:, 1]
+    month = digits[:, 2] * 10 + digits[:, 3]
+    year = digits[:, 4] * 1000 + digits[:, 5] * 100 + digits[:, 6] * 10 + digits[:, 7]
+    hour = digits[:, 8] * 10 + digits[:, 9]
+    minute = digits[:, 10] * 10 + digits[:, 11]
+    second = digits[:, 12] * 10 + digits[:, 13]
+
+    valid &= (month >= 1) & (month <= 12) & (hour < 24) & (minute < 60) & (second < 60)
+    month = np.where(valid, month, 1)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    valid &= (day >= 1) & (day <= _MONTH_DAYS[month - 1] + (leap & (month == 2)))
+
+    # Jours depuis 1970-01-01 (algorithme "days from civil")
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+
+    seconds = days * 86400 + hour * 3600 + minute * 60 + second
+    out = (seconds * 1_000_000_000).astype('datetime64[ns]')
+    out[~valid] = np.datetime64('NaT')
+    return out
+
+
+class AfterburnerLogReader:
+    def __init__(self, file_path, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.mapping = POSITIONAL  # remplacé dès la première ligne 02
+        self.chars_read = 0  # avancement approximatif (caractères des lignes de données déjà converties)
+
+    def _convert_chunk(self, lines):
+        # Lignes 80 brutes -> colonnes NumPy typées, via le parseur C de pandas
+        self.chars_read += sum(map(len, lines))
+        fields = self.mapping.metric_fields
+        usecols = sorted({TIMESTAMP_FIELD, *fields.values()})
+        text = ''.join(lines)
+        try:
+            chunk = pd.read_csv(io.StringIO(text), header=None, usecols=usecols, skipinitialspace=True,
+                                on_bad_lines='skip', dtype={field: METRIC_PARSE_DTYPE for field in fields.values()})
+        except ValueError:
+            # Valeur non numérique dans une colonne : relecture sans type imposé (converti ci-dessous)
+            chunk = pd.read_csv(io.StringIO(text), header=None, usecols=usecols, skipinitialspace=True,
+                                on_bad_lines='skip')
+
+        timestamps = parse_timestamps(np.char.strip(chunk[TIMESTAMP_FIELD].to_numpy(dtype=str)))
+        metrics = {}
+        for metric in METRIC_COLUMNS:
+            field = fields.get(metric)
+            if field is None or field not in chunk.columns:
+                metrics[metric] = np.full(len(chunk), np.nan)
+            elif pd.api.types.is_float_dtype(chunk[field]):
+                metrics[metric] = chunk[field].to_numpy(dtype=METRIC_PARSE_DTYPE)
+            else:
+                metrics[metric] = pd.to_numeric(chunk[field], errors='coerce').to_numpy(dtype=METRIC_PARSE_DTYPE)
+        return timestamps, metrics
+
+    def iter_chunks(self):
+        # Une seule passe sur le fichier, par blocs de chunk_size lignes de données
+        with open(self.file_path, 'r', encoding=self.encoding, errors='replace') as f:
+            yield from self.iter_line_chunks(f)
+
+    def iter_line_chunks(self, lines):
+        # Lignes brutes (fichier ouvert, ou lignes ajoutées en mode live) -> blocs convertis.
+        # Les positions des colonnes (ligne 02) sont gardées d'un appel à l'autre.
+        buffer = []
+        for line in lines:
+            if line.startswith(DATA_CODE):
+                buffer.append(line)
+                if len(buffer) >= self.chunk_size:
+                    yield self._convert_chunk(buffer)
+                    buffer = []
+            elif line.startswith(HEADER_CODE):
+                # Afterburner réécrit l'en-tête si les sources changent en cours de session
+                if buffer:
+                    yield self._convert_chunk(buffer)
+                    buffer = []
+                self.mapping = resolve_header(line.split(',')[2:]) or POSITIONAL
+        if buffer:
+            yield self._convert_chunk(buffer)
+
+    def read(self):
+        ts_parts = []
+        metric_parts = {metric: [] for metric in METRIC_COLUMNS}
+        for timestamps, metrics in self.iter_chunks():
+            ts_parts.append(timestamps)
+            for metric in METRIC_COLUMNS:
+                metric_parts[metric].append(metrics[metric])
+
+        if not ts_parts:
+            return np.array([], dtype='datetime64[ns]'), {m: np.array([], dtype=np.float64) for m in METRIC_COLUMNS}
+
+        timestamps = np.concatenate(ts_parts)
+        metrics = {metric: np.concatenate(parts) for metric, parts in metric_parts.items()}
+        return timestamps, metrics
+
+
+def read_afterburner_log(file_path, chunk_size=CHUNK_SIZE):
+    return AfterburnerLogReader(file_path, chunk_size=chunk_size).read()
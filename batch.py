@@ -0,0 +1,187 @@
+# batch.py
+# Analyse en ligne de commande (sans Tk) d'une série de logs, répartie sur un pool de processus
+#
+#   python batch.py "runs/*.hml" other.xlsx -o results --workers 8
+#
+# Pour chaque log : <nom>.json (même structure que l'export JSON de l'appli),
+# plus un summary.json qui agrège toute la série. Un log en erreur n'arrête pas le batch.
+# --series parquet|arrow|csv : écrit aussi la série nettoyée (<nom>.parquet...), voir exporters.py.
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SUMMARY_FILE = 'summary.json'
+
+
+def expand_inputs(patterns):
+    files = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isdir(path):
+                continue
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                files.append(path)
+    return files
+
+
+def analyze_file(file_path, streaming=False, diagnostics=False, trace_memory=False, window=None, segments=None,
+                 series_path=None, cache_dir=None):
+    # Exécuté dans un processus du pool : on ne renvoie que le texte JSON (pas la session) ;
+    # la série nettoyée, si demandée, est écrite directement par le worker.
+    # cache_dir : cache disque partagé entre workers (mode service, voir service.py)
+    from exporters import export_session
+    from instrumentation import LoadDiagnostics
+    from model import StatsModel
+    from stats_cache import StatsCache
+
+    start = time.perf_counter()
+    model = StatsModel(cache=StatsCache(max_entries=1, cache_dir=cache_dir) if cache_dir else None)
+    instrument = LoadDiagnostics(memory=trace_memory) if diagnostics or trace_memory else None
+    options = {'window': window} if window is not None else {}
+    result, error = model.compute_stats(file_path, streaming=streaming, instrument=instrument,
+                                        segments=segments, **options)
+    elapsed = time.perf_counter() - start
+    if error:
+        return {'file': file_path, 'ok': False, 'error': error, 'seconds': elapsed}
+    if result is None:
+        return {'file': file_path, 'ok': False, 'error': "Aucune donnée.", 'seconds': elapsed}
+    export = model.generate_export_text(result['stats'], result.get('diagnostics'))
+    outcome = {'file': file_path, 'ok': True, 'export': export, 'seconds': elapsed}
+    if series_path is not None:
+        outcome['series'], outcome['series_error'] = export_session(result['session'], series_path)
+    return outcome
+
+
+def output_name(file_path, used):
+    base = os.path.splitext(os.path.basename(file_path))[0]
+    name, n = base, 1
+    while name in used:
+        n += 1
+        name = f"{base}_{n}"
+    used.add(name)
+    return name
+
+
+def run_batch(files, output_dir, workers=None, streaming=False, diagnostics=False, trace_memory=False,
+              window=None, segments=None, series=None, log=print):
+    from exporters import FORMAT_EXTENSIONS
+
+    os.makedirs(output_dir, exist_ok=True)
+    used_names = set()
+    summary = {'files': [], 'ok': 0, 'failed': 0}
+    start = time.perf_counter()
+
+    # Noms de sortie attribués dans l'ordre des entrées (stables d'un batch à l'autre)
+    names = {path: output_name(path, used_names) for path in files}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for path in files:
+            series_path = os.path.join(output_dir, names[path] + FORMAT_EXTENSIONS[series]) if series else None
+            futures[pool.submit(analyze_file, path, streaming, diagnostics, trace_memory, window, segments,
+                                series_path)] = path
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:  # crash du worker (mémoire, pickling...) : on note et on continue
+                outcome = {'file': path, 'ok': False, 'error': f"Erreur du worker : {e}", 'seconds': None}
+
+            entry = {'file': path, 'seconds': outcome['seconds']}
+            if outcome['ok']:
+                out_path = os.path.join(output_dir, names[path] + '.json')
+                with open(out_path, 'w') as f:
+                    f.write(outcome['export'])
+                entry.update({'ok': True, 'output': out_path, 'stats': json.loads(outcome['export'])})
+                if outcome.get('series'):
+                    entry['series'] = outcome['series']
+                elif outcome.get('series_error'):
+                    entry['series_error'] = outcome['series_error']
+                    log(f"SÉRIE  {path} : {outcome['series_error']}")
+                summary['ok'] += 1
+                log(f"OK     {path}")
+            else:
+                entry.update({'ok': False, 'error': outcome['error']})
+                summary['failed'] += 1
+                log(f"ERREUR {path} : {outcome['error']}")
+            summary['files'].append(entry)
+
+    summary['files'].sort(key=lambda e: e['file'])
+    summary['seconds'] = time.perf_counter() - start
+    summary['aggregate'] = aggregate(summary['files'])
+
+    with open(os.path.join(output_dir, SUMMARY_FILE), 'w') as f:
+        json.dump(summary, f, indent=4)
+    return summary
+
+
+def aggregate(entries):
+    # Moyenne / min / max, sur tous les logs réussis, de chaque stat numérique de l'export
+    values = {}
+    for entry in entries:
+        if not entry.get('ok'):
+            continue
+        for col, col_stats in entry['stats'].items():
+            if not isinstance(col_stats, dict) or col == 'Diagnostics':
+                continue
+            for stat, val in col_stats.items():
+                if isinstance(val, (int, float)):
+                    values.setdefault(col, {}).setdefault(stat, []).append(val)
+
+    result = {}
+    for col, col_stats in values.items():
+        result[col] = {stat: {'moyenne': round(sum(vals) / len(vals), 1), 'min': min(vals), 'max': max(vals),
+                              'logs': len(vals)}
+                       for stat, vals in col_stats.items()}
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse en batch de logs MSI Afterburner (.xlsx/.hml/.csv)")
+    parser.add_argument('inputs', nargs='+', help="fichiers ou globs (ex : 'runs/**/*.hml')")
+    parser.add_argument('-o', '--output-dir', default='batch_results', help="dossier de sortie des JSON")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="nombre de processus (défaut : nb de coeurs)")
+    parser.add_argument('--streaming', action='store_true', help="mode mémoire constante (voir streaming.py)")
+    parser.add_argument('--diagnostics', action='store_true',
+                        help="ajoute les mesures par étape (temps, lignes) à chaque JSON")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="avec --diagnostics : variation mémoire par étape (tracemalloc, plus lent)")
+    parser.add_argument('--window', help="fenêtre glissante : durée ('60s', '5min') ou nombre d'échantillons")
+    parser.add_argument('--segments', help="plages 'HH:MM:SS-HH:MM:SS,...' (défaut : détection automatique)")
+    parser.add_argument('--series', choices=['parquet', 'arrow', 'csv'],
+                        help="écrit aussi la série nettoyée de chaque log (parquet / arrow : pyarrow requis)")
+    args = parser.parse_args(argv)
+    if args.series and args.streaming:
+        parser.error("--series n'est pas disponible avec --streaming (la session n'est pas conservée)")
+
+    from windowing import parse_ranges
+
+    window = int(args.window) if args.window and args.window.isdigit() else args.window
+    try:
+        segments = parse_ranges(args.segments) if args.segments else None
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("Aucun fichier trouvé.", file=sys.stderr)
+        return 2
+
+    summary = run_batch(files, args.output_dir, workers=args.workers, streaming=args.streaming,
+                        diagnostics=args.diagnostics, trace_memory=args.trace_memory,
+                        window=window, segments=segments, series=args.series)
+    print(f"{summary['ok']} OK, {summary['failed']} en erreur, {summary['seconds']:.1f} s "
+          f"-> {os.path.join(args.output_dir, SUMMARY_FILE)}")
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+# benchmark.py
+# Benchmarks reproductibles de StatsModel sur des logs synthétiques (voir synthetic_logs.py)
+#
+#   python benchmark.py --sizes 10000 100000 1000000 --formats hml xlsx -o bench.json
+#   python benchmark.py --sizes 100000 --compare bench_baseline.json --threshold 0.2
+#
+# Pour chaque (format, taille) : temps de chaque étape de compute_stats (meilleur de --repeat),
+# temps de bout en bout, pic mémoire par étape (tracemalloc, passe séparée pour ne pas fausser
+# les temps). Sortie JSON ; --compare signale les étapes plus lentes que la baseline.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from afterburner_log import is_text_log
+from model import StatsModel
+from synthetic_logs import XLSX_MAX_DATA_ROWS, generate_log
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_FORMATS = ['hml', 'xlsx']
+DEFAULT_DATA_DIR = 'bench_data'
+COLUMNS_FOR_CALCS = ['Framerate', 'GPU temperature', 'GPU usage', 'Core clock ', 'Temp over limit', 'CPU usage']
+
+# Une étape n'est signalée que si elle est à la fois plus lente en relatif ET en absolu
+DEFAULT_THRESHOLD = 0.2
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def log_path(data_dir, rows, fmt, seed):
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"synthetic_{rows}_{seed}.{fmt}")
+    if not os.path.exists(path):
+        generate_log(path, rows, seed=seed)
+    return path
+
+
+def run_stages(model, file_path):
+    # Les étapes de compute_stats, une par une -> [(nom, fonction)] exécutées en chaîne
+    state = {}
+
+    def read():
+        chunks = list(model.iter_raw_chunks(file_path))
+        state['df'] = pd.concat(chunks, ignore_index=True)
+
+    def drop_headers():
+        if not is_text_log(file_path):
+            state['df'] = model.drop_header_rows(state['df'])
+
+    def scaling():
+        if not is_text_log(file_path):
+            state['df'] = model.scale_columns(state['df'])
+
+    def framerate_filter():
+        df = state['df']
+        state['df'] = df.drop(df[df['Framerate'] >= 1000].index)
+
+    def timestamps():
+        state['session'], state['duration'] = model.build_session(state.pop('df'), file_path, dtype=np.float64)
+
+    def stats():
+        state['stats'] = model.compute_basic_stats(state['session'], COLUMNS_FOR_CALCS)
+        state['stats']['Durée Partie'] = {'duration': state['duration']}
+
+    def rolling():
+        state['stats']['Fenêtre glissante'] = model.summarize_rolling(
+            model.compute_rolling_stats(state['session'], columns=COLUMNS_FOR_CALCS))
+
+    def segments():
+        state['stats']['Segments'] = model.compute_segments(state['session'], columns=COLUMNS_FOR_CALCS)
+
+    def export():
+        model.generate_export_text(state['stats'])
+
+    return [('read', read), ('drop_headers', drop_headers), ('scaling', scaling),
+            ('framerate_filter', framerate_filter), ('timestamps', timestamps), ('stats', stats),
+            ('rolling', rolling), ('segments', segments),
+            ('export', export)]
+
+
+def time_stages(file_path, repeat):
+    best = {}
+    for _ in range(repeat):
+        model = StatsModel()
+        for name, stage in run_stages(model, file_path):
+            start = time.perf_counter()
+            stage()
+            elapsed = time.perf_counter() - start
+            best[name] = min(best.get(name, elapsed), elapsed)
+
+    end_to_end = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result, error = StatsModel().compute_stats(file_path)
+        elapsed = time.perf_counter() - start
+        if error:
+            raise RuntimeError(error)
+        end_to_end = elapsed if end_to_end is None else min(end_to_end, elapsed)
+    return best, end_to_end
+
+
+def measure_memory(file_path):
+    # Pic mémoire (Mo) de chaque étape, et de compute_stats complet
+    peaks = {}
+    tracemalloc.start()
+    try:
+        model = StatsModel()
+        for name, stage in run_stages(model, file_path):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            stage()
+            peaks[name] = (tracemalloc.get_traced_memory()[1] - base) / 1e6
+        del model
+
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        StatsModel().compute_stats(file_path)
+        total = (tracemalloc.get_traced_memory()[1] - base) / 1e6
+    finally:
+        tracemalloc.stop()
+    return peaks, total
+
+
+def run_benchmarks(sizes, formats, data_dir=DEFAULT_DATA_DIR, repeat=3, seed=0, memory=True, log=print):
+    results = []
+    for fmt in formats:
+        for rows in sizes:
+            if fmt in ('xlsx', 'xls') and rows > XLSX_MAX_DATA_ROWS:
+                log(f"skip   {fmt} {rows} lignes (au-delà de la limite Excel)")
+                continue
+            path = log_path(data_dir, rows, fmt, seed)
+            stages, end_to_end = time_stages(path, repeat)
+            entry = {'format': fmt, 'rows': rows, 'file_bytes': os.path.getsize(path),
+                     'stages': stages, 'compute_stats': end_to_end}
+            if memory:
+                entry['peak_memory_mb'], entry['compute_stats_peak_memory_mb'] = measure_memory(path)
+            results.append(entry)
+            log(f"{fmt:5s} {rows:>10d} lignes : compute_stats {end_to_end:8.3f} s, "
+                f"{rows / end_to_end:,.0f} lignes/s")
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    # -> liste des régressions (étape plus lente de plus de `threshold` en relatif)
+    def index(report):
+        return {(r['format'], r['rows']): r for r in report['results']}
+
+    regressions = []
+    base_index = index(baseline)
+    for key, entry in index(current).items():
+        base = base_index.get(key)
+        if base is None:
+            continue
+        timings = dict(entry['stages'], compute_stats=entry['compute_stats'])
+        base_timings = dict(base['stages'], compute_stats=base['compute_stats'])
+        for stage, seconds in timings.items():
+            old = base_timings.get(stage)
+            if old is None or old <= 0:
+                continue
+            if seconds > old * (1 + threshold) and seconds - old > MIN_REGRESSION_SECONDS:
+                regressions.append({'format': key[0], 'rows': key[1], 'stage': stage,
+                                    'baseline': old, 'current': seconds, 'ratio': seconds / old})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de StatsModel sur logs synthétiques")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="nombre de lignes (10000 à 10000000 ; xlsx limité à ~1M)")
+    parser.add_argument('--formats', nargs='+', default=DEFAULT_FORMATS, choices=['hml', 'csv', 'xlsx'])
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="cache des logs générés")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="ne pas mesurer la mémoire (plus rapide)")
+    parser.add_argument('-o', '--output', help="fichier JSON de résultats")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON de référence à comparer")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="ralentissement relatif toléré (0.2 = +20%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.formats, data_dir=args.data_dir, repeat=args.repeat,
+                            seed=args.seed, memory=not args.no_memory)
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['format']} {r['rows']} {r['stage']} : "
+                  f"{r['baseline']:.4f} s -> {r['current']:.4f} s (x{r['ratio']:.2f})", file=sys.stderr)
+        if regressions:
+            return 1
+        print("Aucune régression.", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
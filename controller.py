@@ -1,66 +1,374 @@
 # controller.py
-from model import StatsModel
+import os
+import queue
+import threading
+
 from view import StatsView
-import pandas as pd
+
+POLL_INTERVAL_MS = 50  # fréquence de lecture des événements du thread de chargement
+LIVE_REFRESH_MS = 500  # mode live : rafraîchissement de la vue (2 Hz max)
+FOLLOW_POLL_SECONDS = 0.5  # mode live : lecture des nouvelles lignes du log
 
 
 class StatsController:
-    def __init__(self, root):
-        self.model = StatsModel()
-        self.view = StatsView(root, self.model)  # Passer self.model à StatsView
+    def __init__(self, root, diagnostics=False, trace_memory=False):
+        self.root = root
+        # Mesures par étape du chargement (onglet Diagnostics + export JSON), voir instrumentation.py
+        self.diagnostics = diagnostics
+        self.trace_memory = trace_memory
+        self._model = None  # créé au premier usage : pandas n'est pas importé au démarrage
+        self.view = StatsView(root)
         self.view.set_load_command(self.load_excel_file)
+        self.view.set_follow_command(self.follow_log_file)
+        self.view.set_compare_command(self.compare_log_files)
         self.stats = None  # To store stats for export
+        self.load_diagnostics = None
+        self.session = None  # Session affichée (recalcul des segments à la demande)
+        self.result = None  # résultat complet du chargement (enregistrement en .gsa)
+        self.comparison = None  # [(nom, stats)] de la comparaison affichée
+
+        self._cancel_event = None
+        self._events = None
+
+        self._follow_stop = None
+        self._follow_events = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            from model import StatsModel
+            from stats_cache import StatsCache
+            self._model = StatsModel( cache=StatsCache() )
+        return self._model
 
     def load_excel_file(self):
+        if self._cancel_event is not None:
+            return  # un chargement est déjà en cours
+
         file_path = self.view.ask_open_filename(
-            "Select Excel File",
-            (("Excel files", "*.xlsx *.xls"), ("All files", "*.*"))
+            "Select Log File",
+            (("Log files", "*.xlsx *.xls *.hml *.csv *.gsa"), ("Excel files", "*.xlsx *.xls"),
+             ("Afterburner logs", "*.hml *.csv"), ("Saved sessions", "*.gsa"), ("All files", "*.*"))
         )
         if not file_path:
             return
 
-        result, error = self.model.compute_stats( file_path )
+        self.start_loading( file_path )
+
+    # === CHARGEMENT EN ARRIÈRE-PLAN ===
+    # Le calcul tourne dans un thread ; Tk n'étant pas thread-safe, le thread ne touche jamais
+    # à la vue : il poste des événements dans une queue que le thread Tk relit via root.after.
+    def start_loading(self, file_path):
+        self._cancel_event = threading.Event()
+        self._events = queue.Queue()
+
+        self.view.hide_main()
+        self.view.show_loading( os.path.basename( file_path ), self.cancel_loading )
+
+        # Modèle créé ici, dans le thread Tk, jamais par le worker
+        worker = threading.Thread( target=self._load_worker,
+                                   args=(self.model, file_path, self._cancel_event, self._events), daemon=True )
+        worker.start()
+        self.root.after( POLL_INTERVAL_MS, self._poll_loading )
+
+    def _load_worker(self, model, file_path, cancel_event, events):
+        def progress(stage, fraction):
+            events.put( ('progress', stage, fraction) )
+
+        instrument = None
+        if self.diagnostics:
+            from instrumentation import LoadDiagnostics
+            instrument = LoadDiagnostics( memory=self.trace_memory )
+
+        result, error = model.compute_stats( file_path, progress=progress, cancel=cancel_event, instrument=instrument )
+        events.put( ('done', result, error) )
+
+    def _poll_loading(self):
+        events, cancel_event = self._events, self._cancel_event
+        if events is None:
+            return
+
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+
+            if event[0] == 'progress':
+                self.view.update_progress( event[1], event[2] )
+            else:
+                self._cancel_event = None
+                self._events = None
+                self.view.hide_loading()
+                if cancel_event.is_set():
+                    self.view.show_main()
+                elif event[0] == 'compare_done':
+                    self.on_comparison_loaded( event[1], event[2] )
+                else:
+                    self.on_stats_loaded( event[1], event[2] )
+                return
+
+        self.root.after( POLL_INTERVAL_MS, self._poll_loading )
+
+    def cancel_loading(self):
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self.view.update_progress( "Annulation...", None )
+
+    def on_stats_loaded(self, result, error):
         if error:
+            self.view.show_main()
             self.view.show_error( "Error", error )
             return
         if result is None:
+            self.view.show_main()
             self.view.show_info( "No Data", "No data to display." )
             return
 
         # On récupère tout proprement
         stats = result['stats']
-        df = result['df']
+        session = result['session']
         duration = result['duration']
+        diagnostics = result.get( 'diagnostics' )
 
         self.stats = stats
+        self.result = result
+        self.load_diagnostics = diagnostics
+        self.comparison = None
 
-        tree_columns, formatted_data = self.model.format_stats_for_display( stats )
+        tree_columns, formatted_data = self.model.format_stats_for_display( session or stats )
 
         self.view.hide_main()
-        self.view.show_results( tree_columns, formatted_data, duration, df )  # df bien passé !
+        self.view.show_results( tree_columns, formatted_data, duration, session, diagnostics,
+                                stats.get( 'Segments' ), result.get( 'rolling' ), result.get( 'events' ) )
+        self.session = session
+        self.view.set_segments_command( self.apply_segments )
 
         self.view.set_back_command( self.back_to_main )
         self.view.set_export_command( self.export_to_txt )
 
+        # Métriques absentes de l'en-tête (format du log changé ?) : affichées N/A, on prévient
+        from schema import missing_columns_warning
+        warning = missing_columns_warning( stats.get( 'Colonnes' ) )
+        if warning:
+            self.view.show_warning( "Colonnes manquantes", warning )
+
     def export_to_txt(self):
-        if not self.stats:
+        if not self.stats and not self.comparison:
             return
 
+        # Résumé JSON, ou série temporelle nettoyée (Parquet / Arrow / CSV) selon l'extension choisie
+        filetypes = [("JSON summary", "*.json"), ("Text files", "*.txt")]
+        if self.session is not None:
+            filetypes += [("Parquet time series", "*.parquet"), ("Arrow IPC time series", "*.arrow"),
+                          ("CSV time series", "*.csv"), ("Saved session", "*.gsa")]
         file_path = self.view.ask_save_filename(
-            "Save Stats as TXT",
-            (("Text files", "*.txt"), ("All files", "*.*")),
-            ".txt"
+            "Export Stats",
+            tuple(filetypes) + (("All files", "*.*"),),
+            ".json"
         )
         if not file_path:
             return  # User canceled
 
         try:
-            export_text = self.model.generate_export_text(self.stats)
-            with open(file_path, 'w') as f:
-                f.write(export_text)
+            if self.comparison:
+                export_text = self.model.generate_comparison_text(self.comparison)
+                with open(file_path, 'w') as f:
+                    f.write(export_text)
+            elif file_path.lower().endswith('.gsa'):
+                # Session nettoyée, rouverte instantanément par "Charger" (voir session_store.py)
+                _, error = self.model.save_session(dict(self.result, stats=self.stats), file_path)
+                if error:
+                    self.view.show_error("Error", error)
+                    return
+            else:
+                from exporters import export
+                _, error = export(file_path, stats=self.stats, session=self.session,
+                                  diagnostics=self.load_diagnostics)
+                if error:
+                    self.view.show_error("Error", error)
+                    return
             self.view.show_info("Success", "Stats exported successfully!")
         except Exception as e:
             self.view.show_error("Error", f"Failed to export: {str(e)}")
 
+    def apply_segments(self, text):
+        # Plages saisies par l'utilisateur (vide = détection automatique)
+        if self.session is None:
+            return
+        from windowing import parse_ranges
+
+        try:
+            ranges = parse_ranges( text ) if text.strip() else None
+        except ValueError as e:
+            self.view.show_error( "Error", str( e ) )
+            return
+        segments = self.model.compute_segments( self.session, ranges, list( self.session.columns ) )
+        self.stats = dict( self.stats, Segments=segments )  # le résultat en cache n'est pas modifié
+        self.view.update_segments( segments )
+
+    # === COMPARAISON ===
+    # Les logs sont chargés en parallèle (compute_stats_many, pool de processus) depuis un thread,
+    # avec la même fenêtre de progression / annulation qu'un chargement simple.
+    def compare_log_files(self):
+        if self._cancel_event is not None or self._follow_stop is not None:
+            return
+
+        file_paths = self.view.ask_open_filenames(
+            "Select Log Files",
+            (("Log files", "*.xlsx *.xls *.hml *.csv *.gsa"), ("Excel files", "*.xlsx *.xls"),
+             ("Afterburner logs", "*.hml *.csv"), ("Saved sessions", "*.gsa"), ("All files", "*.*"))
+        )
+        if not file_paths:
+            return
+        if len( file_paths ) < 2:
+            self.view.show_info( "Comparaison", "Sélectionnez au moins deux logs à comparer." )
+            return
+
+        self.start_compare( file_paths )
+
+    def start_compare(self, file_paths):
+        self._cancel_event = threading.Event()
+        self._events = queue.Queue()
+
+        self.view.hide_main()
+        self.view.show_loading( f"{len( file_paths )} logs", self.cancel_loading )
+
+        worker = threading.Thread( target=self._compare_worker,
+                                   args=(self.model, file_paths, self._cancel_event, self._events), daemon=True )
+        worker.start()
+        self.root.after( POLL_INTERVAL_MS, self._poll_loading )
+
+    def _compare_worker(self, model, file_paths, cancel_event, events):
+        def progress(stage, fraction):
+            events.put( ('progress', stage, fraction) )
+
+        outcomes = model.compute_stats_many( file_paths, progress=progress, cancel=cancel_event )
+        events.put( ('compare_done', file_paths, outcomes) )
+
+    def on_comparison_loaded(self, file_paths, outcomes):
+        loaded, failed = [], []
+        names = set()
+        for path, (result, error) in zip( file_paths, outcomes ):
+            if error or result is None:
+                failed.append( f"{os.path.basename( path )} : {error or 'aucune donnée'}" )
+                continue
+            # Deux logs de même nom (dossiers différents) : suffixe pour les distinguer
+            name = base = os.path.basename( path )
+            k = 2
+            while name in names:
+                name = f"{base} ({k})"
+                k += 1
+            names.add( name )
+            loaded.append( (name, result) )
+
+        if failed:
+            self.view.show_error( "Error", "Logs non chargés :\n" + "\n".join( failed ) )
+        if len( loaded ) < 2:
+            self.view.show_main()
+            return
+
+        self.stats = None
+        self.load_diagnostics = None
+        self.session = None
+        self.result = None
+        self.comparison = [(name, result['stats']) for name, result in loaded]
+
+        tree_columns, formatted_data = self.model.format_comparison( self.comparison )
+        self.view.hide_main()
+        self.view.show_comparison( tree_columns, formatted_data,
+                                   [(name, result['session']) for name, result in loaded] )
+        self.view.set_back_command( self.back_to_main )
+        self.view.set_export_command( self.export_to_txt )
+
+    # === MODE LIVE ===
+    # Un thread lit les lignes ajoutées au log (follow.py) et poste des instantanés de taille bornée ;
+    # le thread Tk n'affiche que le dernier, au plus LIVE_REFRESH_MS.
+    def follow_log_file(self):
+        if self._cancel_event is not None or self._follow_stop is not None:
+            return
+
+        file_path = self.view.ask_open_filename(
+            "Select Afterburner Log",
+            (("Afterburner logs", "*.hml *.csv"), ("All files", "*.*"))
+        )
+        if not file_path:
+            return
+
+        self.start_follow( file_path )
+
+    def start_follow(self, file_path):
+        from follow import LogFollower
+
+        try:
+            follower = LogFollower( file_path )
+        except ValueError as e:
+            self.view.show_error( "Error", str( e ) )
+            return
+
+        self._follow_stop = threading.Event()
+        self._follow_events = queue.Queue()
+        self.stats = None
+        self.load_diagnostics = None
+        self.comparison = None
+        self.session = None
+        self.result = None
+
+        tree_columns, empty_rows = self.model.format_stats_for_display( {} )
+        self.view.hide_main()
+        self.view.show_live( tree_columns, [row[0] for row in empty_rows], os.path.basename( file_path ) )
+        self.view.set_back_command( self.stop_follow )
+        self.view.set_export_command( self.export_to_txt )
+
+        worker = threading.Thread( target=self._follow_worker,
+                                   args=(follower, self.model, self._follow_stop, self._follow_events), daemon=True )
+        worker.start()
+        self.root.after( LIVE_REFRESH_MS, self._poll_follow )
+
+    def _follow_worker(self, follower, model, stop_event, events):
+        while not stop_event.is_set():
+            try:
+                added = follower.poll()
+                if added:
+                    events.put( ('snapshot', follower.snapshot( model )) )
+            except Exception as e:
+                events.put( ('error', f"Erreur de lecture du log : {str( e )}") )
+                return
+            # Rattrapage d'un log déjà long : on enchaîne sans attendre
+            if not follower.pending:
+                stop_event.wait( FOLLOW_POLL_SECONDS )
+
+    def _poll_follow(self):
+        events = self._follow_events
+        if events is None:
+            return
+
+        snapshot = None
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'error':
+                self.stop_follow()
+                self.view.show_error( "Error", event[1] )
+                return
+            snapshot = event[1]  # seul le plus récent est affiché
+
+        if snapshot is not None:
+            self.stats = snapshot['stats']
+            _, formatted_data = self.model.format_stats_for_display( snapshot['stats'] )
+            self.view.update_live( formatted_data, snapshot['duration'], snapshot['rows'], snapshot['series'] )
+
+        self.root.after( LIVE_REFRESH_MS, self._poll_follow )
+
+    def stop_follow(self):
+        if self._follow_stop is not None:
+            self._follow_stop.set()
+        self._follow_stop = None
+        self._follow_events = None
+        self.view.hide_live()
+        self.view.show_main()
+
     def back_to_main(self):
-        self.view.show_main()
\ No newline at end of file
+        self.view.show_main()
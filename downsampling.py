@@ -0,0 +1,119 @@
+# downsampling.py
+# Décimation min/max par bucket pour les graphiques : une série de plusieurs millions de points
+# est réduite à ~2 points par pixel (le min et le max de chaque bucket, dans l'ordre
+# chronologique), ce qui garde visibles les pics et les chutes.
+import numpy as np
+
+
+def minmax_decimate(x, y, n_buckets):
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = max(int(n_buckets), 1)
+    if n <= 2 * n_buckets:
+        return x, y
+
+    size = n // n_buckets
+    used = size * n_buckets
+    blocks = y[:used].reshape(n_buckets, size)
+    nan = np.isnan(blocks)
+
+    # NaN ignorés (un bucket entièrement NaN donne un point NaN = trou dans la courbe)
+    i_min = np.argmin(np.where(nan, np.inf, blocks), axis=1)
+    i_max = np.argmax(np.where(nan, -np.inf, blocks), axis=1)
+
+    base = np.arange(n_buckets) * size
+    first = base + np.minimum(i_min, i_max)
+    second = base + np.maximum(i_min, i_max)
+    idx = np.column_stack([first, second]).ravel()
+
+    # Reste (< size points) gardé tel quel
+    idx = np.concatenate([idx, np.arange(used, n)])
+    return x[idx], y[idx]
+
+
+def decimate_range(x, y, x_min, x_max, n_buckets):
+    # Re-décimation de la plage visible (zoom / pan) à partir des données pleine résolution.
+    # x doit être trié ; on garde un point de part et d'autre pour que la courbe touche les bords.
+    start = max(int(np.searchsorted(x, x_min, side='left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, x_max, side='right')) + 1, len(x))
+    return minmax_decimate(x[start:stop], y[start:stop], n_buckets)
+
+
+class StreamingDecimator:
+    # Décimation min/max incrémentale (mode live) : chaque bucket couvre `width` unités de x et
+    # garde son min et son max. Quand il y a plus de max_buckets buckets, la largeur double et
+    # les buckets voisins sont fusionnés : la taille reste bornée quelle que soit la durée de la
+    # session, et un ajout ne coûte que O(nouveaux points + max_buckets).
+    # x doit croître d'un ajout à l'autre (temps écoulé).
+    def __init__(self, max_buckets=2000, width=1 / 60):
+        self.max_buckets = max_buckets
+        self.width = width
+        self._keys = np.array([], dtype=np.int64)
+        self._min_x = np.array([], dtype=np.float64)
+        self._min_y = np.array([], dtype=np.float64)
+        self._max_x = np.array([], dtype=np.float64)
+        self._max_y = np.array([], dtype=np.float64)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def append(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        keep = ~np.isnan(y)
+        x, y = x[keep], y[keep]
+        if not len(x):
+            return
+        if np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind='stable')
+            x, y = x[order], y[order]
+
+        # Nouveaux points = buckets d'un point ; le dernier bucket existant peut encore grossir
+        keys = np.floor(x / self.width).astype(np.int64)
+        tail = max(len(self._keys) - 1, 0)
+        self._set(*_collapse(np.concatenate([self._keys[tail:], keys]),
+                             np.concatenate([self._min_x[tail:], x]), np.concatenate([self._min_y[tail:], y]),
+                             np.concatenate([self._max_x[tail:], x]), np.concatenate([self._max_y[tail:], y])),
+                  keep=tail)
+
+        while len(self._keys) > self.max_buckets:
+            self.width *= 2
+            self._set(*_collapse(self._keys // 2, self._min_x, self._min_y, self._max_x, self._max_y))
+
+    def _set(self, keys, min_x, min_y, max_x, max_y, keep=0):
+        self._keys = np.concatenate([self._keys[:keep], keys])
+        self._min_x = np.concatenate([self._min_x[:keep], min_x])
+        self._min_y = np.concatenate([self._min_y[:keep], min_y])
+        self._max_x = np.concatenate([self._max_x[:keep], max_x])
+        self._max_y = np.concatenate([self._max_y[:keep], max_y])
+
+    def series(self):
+        # -> (x, y) : 2 points par bucket (min et max, dans l'ordre chronologique)
+        min_first = self._min_x <= self._max_x
+        x = np.column_stack([np.where(min_first, self._min_x, self._max_x),
+                             np.where(min_first, self._max_x, self._min_x)]).ravel()
+        y = np.column_stack([np.where(min_first, self._min_y, self._max_y),
+                             np.where(min_first, self._max_y, self._min_y)]).ravel()
+        return x, y
+
+
+def _collapse(keys, min_x, min_y, max_x, max_y):
+    # Fusionne les buckets consécutifs de même clé (min des min, max des max, avec leur x)
+    if not len(keys):
+        return keys, min_x, min_y, max_x, max_y
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    if len(starts) == len(keys):
+        return keys, min_x, min_y, max_x, max_y
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(keys)]))
+    group_min = np.minimum.reduceat(min_y, starts)
+    group_max = np.maximum.reduceat(max_y, starts)
+    i_min = _first_per_group(min_y == group_min[group], group)
+    i_max = _first_per_group(max_y == group_max[group], group)
+    return keys[starts], min_x[i_min], group_min, max_x[i_max], group_max
+
+
+def _first_per_group(mask, group):
+    idx = np.flatnonzero(mask)
+    _, first = np.unique(group[idx], return_index=True)
+    return idx[first]
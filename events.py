@@ -0,0 +1,177 @@
+# events.py
+# Index des événements d'une session, construit une fois au chargement :
+#   - saccades : framerate sous STUTTER_RATIO x la moyenne glissante, pendant au plus
+#     MAX_STUTTER_SECONDS (au-delà c'est un chargement / menu, voir windowing.py)
+#   - limite thermique : 'Temp over limit' actif
+#   - saturation GPU / CPU : usage au-dessus du seuil pendant au moins MIN_SATURATION_SECONDS
+# Un capteur qui oscille autour du seuil donnerait une rafale de micro-plages : celles séparées
+# de moins de MERGE_SECONDS sont fusionnées.
+# Détection vectorisée (masque par échantillon -> plages consécutives, coupées sur les trous
+# du log). Les plages d'un même type ne se chevauchent pas : débuts ET fins sont triés, donc
+# une requête sur une plage de temps coûte deux recherches dichotomiques par type, O(log n + k).
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from windowing import GAP_SECONDS, LOADING_FPS, rolling_mean, window_samples
+
+STUTTER = 'saccade'
+THERMAL = 'limite thermique'
+GPU_SATURATION = 'saturation GPU'
+CPU_SATURATION = 'saturation CPU'
+EVENT_KINDS = [STUTTER, THERMAL, GPU_SATURATION, CPU_SATURATION]
+
+STUTTER_RATIO = 0.6
+BASELINE_WINDOW = '30s'
+GPU_SATURATION_PERCENT = 98.0
+CPU_SATURATION_PERCENT = 95.0
+MIN_SATURATION_SECONDS = 5.0
+MAX_STUTTER_SECONDS = 5.0
+MERGE_SECONDS = 10.0
+
+# start / stop : ns depuis epoch (début du premier échantillon, fin du dernier) ; value : FPS min (saccade),
+# GPU °C max (thermique), usage max (saturation)
+Event = namedtuple('Event', ['kind', 'start', 'stop', 'value'])
+
+
+def runs(mask, timestamps, merge_seconds=0.0, gap_seconds=GAP_SECONDS):
+    # Masque par échantillon -> (débuts, fins) en positions, fin exclue ; un trou dans le log coupe
+    # la plage, deux plages séparées de moins de merge_seconds sont fusionnées
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    edges = np.diff(np.concatenate([[0], mask.view(np.int8), [0]]))
+    cuts = np.flatnonzero((np.diff(timestamps) > gap_seconds * 1e9) & mask[:-1] & mask[1:]) + 1
+    starts = np.sort(np.concatenate([np.flatnonzero(edges == 1), cuts]))
+    stops = np.sort(np.concatenate([np.flatnonzero(edges == -1), cuts]))
+    if merge_seconds and len(starts) > 1:
+        # merge_seconds < gap_seconds : une coupure sur un trou du log n'est jamais refermée
+        separate = (timestamps[starts[1:]] - timestamps[stops[:-1] - 1]) > merge_seconds * 1e9
+        starts = starts[np.concatenate([[True], separate])]
+        stops = stops[np.concatenate([separate, [True]])]
+    return starts, stops
+
+
+class EventIndex:
+    __slots__ = ('origin', 'starts', 'stops', 'values')
+
+    def __init__(self, origin=0):
+        self.origin = origin  # ns du premier échantillon de la session (temps écoulé = t - origin)
+        self.starts = {}  # type -> int64 ns, triés
+        self.stops = {}
+        self.values = {}
+
+    def add(self, kind, starts, stops, values):
+        order = np.argsort(starts, kind='stable')
+        self.starts[kind] = np.asarray(starts, dtype=np.int64)[order]
+        self.stops[kind] = np.asarray(stops, dtype=np.int64)[order]
+        self.values[kind] = np.asarray(values, dtype=np.float64)[order]
+
+    @property
+    def kinds(self):
+        return [kind for kind in EVENT_KINDS if kind in self.starts] + \
+            [kind for kind in self.starts if kind not in EVENT_KINDS]
+
+    def __len__(self):
+        return sum(len(starts) for starts in self.starts.values())
+
+    def count(self, kind):
+        return len(self.starts.get(kind, ()))
+
+    def span(self, start, stop, kind):
+        # Positions [lo, hi) des événements de `kind` qui recoupent [start, stop] (ns depuis epoch)
+        lo = int(np.searchsorted(self.stops[kind], start, side='left'))
+        hi = int(np.searchsorted(self.starts[kind], stop, side='right'))
+        return lo, max(lo, hi)
+
+    def query(self, start=None, stop=None, kinds=None):
+        # -> [Event] qui recoupent [start, stop], triés par début ; None = sans borne
+        start = np.iinfo(np.int64).min if start is None else start
+        stop = np.iinfo(np.int64).max if stop is None else stop
+        events = []
+        for kind in kinds if kinds is not None else self.kinds:
+            if kind not in self.starts:
+                continue
+            lo, hi = self.span(start, stop, kind)
+            events.extend(Event(kind, int(a), int(b), float(v)) for a, b, v in
+                          zip(self.starts[kind][lo:hi], self.stops[kind][lo:hi], self.values[kind][lo:hi]))
+        events.sort(key=lambda e: e.start)
+        return events
+
+    def count_between(self, start, stop, kinds=None):
+        # Nombre d'événements dans [start, stop], sans les construire
+        total = 0
+        for kind in kinds if kinds is not None else self.kinds:
+            if kind in self.starts:
+                lo, hi = self.span(start, stop, kind)
+                total += hi - lo
+        return total
+
+    def elapsed(self, ns):
+        return pd.Timedelta(int(ns - self.origin), unit='ns')
+
+    def summary(self):
+        # Résumé par type, pour les stats / l'export JSON
+        result = {}
+        for kind in self.kinds:
+            starts, stops, values = self.starts[kind], self.stops[kind], self.values[kind]
+            durations = stops - starts
+            worst = (np.nanmin(values) if kind == STUTTER else np.nanmax(values)) if len(values) else np.nan
+            result[kind] = {
+                'nombre': int(len(starts)),
+                'durée totale': pd.Timedelta(int(durations.sum()), unit='ns'),
+                'plus long': pd.Timedelta(int(durations.max()) if len(durations) else 0, unit='ns'),
+                'pire valeur': float(worst) if not np.isnan(worst) else 'N/A',
+            }
+        return result
+
+
+def build_event_index(session, stutter_ratio=STUTTER_RATIO, baseline=BASELINE_WINDOW,
+                      gpu_percent=GPU_SATURATION_PERCENT, cpu_percent=CPU_SATURATION_PERCENT,
+                      min_saturation_seconds=MIN_SATURATION_SECONDS, max_stutter_seconds=MAX_STUTTER_SECONDS,
+                      merge_seconds=MERGE_SECONDS):
+    timestamps = session.timestamps
+    index = EventIndex(int(timestamps[0]) if len(timestamps) else 0)
+    if not len(timestamps):
+        return index
+    interval = session.meta.get('sample_interval', pd.Timedelta(seconds=1))
+    interval_ns = pd.Timedelta(interval).value  # un échantillon couvre l'intervalle qui le suit
+
+    def add(kind, mask, values, reduce, min_seconds=0.0, max_seconds=None, merge=merge_seconds):
+        starts, stops = runs(mask, timestamps, merge)
+        if len(starts):
+            durations = timestamps[stops - 1] - timestamps[starts]
+            keep = durations >= min_seconds * 1e9
+            if max_seconds is not None:
+                keep &= durations <= max_seconds * 1e9
+            starts, stops = starts[keep], stops[keep]
+        if len(starts):
+            # Valeur extrême de chaque plage en une passe (les plages sont disjointes et triées)
+            values = np.asarray(values, dtype=np.float64)
+            filled = np.where(np.isnan(values), np.inf if reduce is np.minimum else -np.inf, values)
+            edges = np.unique(np.concatenate([starts, stops[stops < len(filled)]]))
+            extreme = reduce.reduceat(filled, edges)[np.searchsorted(edges, starts)]
+        else:
+            extreme = np.empty(0)
+        index.add(kind, timestamps[starts], timestamps[stops - 1] + interval_ns, extreme)
+
+    with np.errstate(invalid='ignore'):
+        if 'Framerate' in session:
+            framerate = np.asarray(session['Framerate'], dtype=np.float64)
+            reference = rolling_mean(framerate, window_samples(baseline, interval))
+            # Référence prise juste avant l'échantillon : la chute ne tire pas sa propre référence vers le bas
+            reference = np.concatenate([reference[:1], reference[:-1]])
+            stutter = (reference >= LOADING_FPS) & (framerate < stutter_ratio * reference)
+            add(STUTTER, stutter, framerate, np.minimum, max_seconds=max_stutter_seconds, merge=0.0)
+        if 'Temp over limit' in session:
+            thermal = np.asarray(session['Temp over limit']) > 0
+            add(THERMAL, thermal, session['GPU temperature'] if 'GPU temperature' in session
+                else session['Temp over limit'], np.maximum)
+        if 'GPU usage' in session:
+            add(GPU_SATURATION, np.asarray(session['GPU usage']) >= gpu_percent, session['GPU usage'],
+                np.maximum, min_saturation_seconds)
+        if 'CPU usage' in session:
+            add(CPU_SATURATION, np.asarray(session['CPU usage']) >= cpu_percent, session['CPU usage'],
+                np.maximum, min_saturation_seconds)
+    return index
@@ -0,0 +1,202 @@
+# exporters.py
+# Export d'une session nettoyée (séries temporelles) et du résumé JSON.
+#
+#   - Parquet / Arrow IPC (.parquet, .arrow / .feather) : colonnaire, compressé (zstd), via
+#     pyarrow (optionnel : pip install pyarrow). Écrit par blocs de CHUNK_ROWS lignes
+#     (un row group / record batch par bloc), sans construire la table complète en mémoire.
+#   - CSV (.csv) : même découpage, un bloc formaté à la fois (pyarrow si présent, sinon pandas).
+#   - résumé (.json) : mêmes clés que l'ancien export texte, converti explicitement
+#     (Timedelta -> 'HH:MM:SS', scalaires numpy -> float, NaN -> null), sans handler par défaut.
+# Utilisé par le bouton Exporter (controller.py) et par batch.py --series.
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from session import Session
+
+CHUNK_ROWS = 256 * 1024
+COMPRESSION = 'zstd'
+TIMESTAMP_COLUMN = 'Timestamp'
+
+SERIES_FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow', '.csv': 'csv'}
+FORMAT_EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow', 'csv': '.csv'}
+
+
+def export_format(path):
+    # -> 'json' | 'parquet' | 'arrow' | 'csv' | None, d'après l'extension
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.json', '.txt'):
+        return 'json'
+    return SERIES_FORMATS.get(ext)
+
+
+# === RÉSUMÉ JSON ===
+def summary_dict(stats, diagnostics=None):
+    # Stats de compute_stats -> dict par colonne, prêt pour json.dumps
+    if isinstance(stats, Session):
+        stats = stats.stats
+
+    restructured = {}
+    for key, s in stats.items():
+        if key.startswith(('Moyenne', 'Min', 'Max')):
+            stat, col = key.split(' ', 1)
+            stat = stat.lower()
+            restructured.setdefault(col, {})[stat] = s.get(stat, 'N/A')
+        elif key == '1% Lows':
+            for sub_col, val in s.items():
+                restructured.setdefault(sub_col, {})['1% low'] = val
+        elif key == 'Percentiles':
+            for sub_col, values in s.items():
+                for name, val in values.items():
+                    restructured.setdefault(sub_col, {}).setdefault(name, val)
+        elif key == 'Durée Partie':
+            restructured['Durée Partie'] = s.get('duration', 'N/A')
+        else:
+            restructured[key] = s
+
+    # Mesures par étape du chargement (optionnel, voir instrumentation.py)
+    if diagnostics is not None:
+        restructured['Diagnostics'] = diagnostics.to_dict()
+    return _json_value(restructured)
+
+
+def summary_json(stats, diagnostics=None):
+    return json.dumps(summary_dict(stats, diagnostics), indent=4, allow_nan=False)
+
+
+def _json_value(value):
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    if isinstance(value, (str, bool)) or value is None:
+        return value
+    if isinstance(value, pd.Timedelta):
+        return format_hms(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return value if math.isfinite(value) else None
+    return str(value)
+
+
+def format_hms(td):
+    total_seconds = int(td.total_seconds())
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+# === SÉRIES TEMPORELLES ===
+def series_names(session):
+    # 'Core clock ' (espace final du log Afterburner) -> 'Core clock' dans les fichiers exportés
+    return [TIMESTAMP_COLUMN] + [col.strip() for col in session.columns]
+
+
+def iter_session_chunks(session, chunk_rows=CHUNK_ROWS):
+    # -> (timestamps datetime64[ns], values (n_colonnes, k)) ; des vues, pas de copie
+    datetimes = session.datetimes()
+    for start in range(0, len(session), chunk_rows):
+        stop = start + chunk_rows
+        yield datetimes[start:stop], session.values[:, start:stop]
+
+
+def write_csv(session, path, chunk_rows=CHUNK_ROWS):
+    # Horodatages ISO 8601 à la milliseconde. pyarrow, s'il est installé, formate les blocs
+    # en C++ (~15x plus rapide que DataFrame.to_csv) ; sinon pandas, un bloc à la fois.
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        pa = None
+
+    names = series_names(session)
+    if pa is not None:
+        schema = _arrow_schema(pa, session).set(0, pa.field(TIMESTAMP_COLUMN, pa.string()))
+        options = pa_csv.WriteOptions(quoting_style='none')
+        with pa_csv.CSVWriter(path, schema, write_options=options) as writer:
+            for timestamps, values in iter_session_chunks(session, chunk_rows):
+                arrays = [pa.array(np.datetime_as_string(timestamps, unit='ms'))]
+                arrays += [pa.array(row, from_pandas=True) for row in values]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        return
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write(','.join(names) + '\n')
+        for timestamps, values in iter_session_chunks(session, chunk_rows):
+            chunk = pd.DataFrame(dict(zip(names, [np.datetime_as_string(timestamps, unit='ms'), *values])))
+            chunk.to_csv(f, header=False, index=False)
+
+
+def _arrow_schema(pa, session):
+    metric_type = pa.from_numpy_dtype(session.values.dtype)
+    fields = [pa.field(TIMESTAMP_COLUMN, pa.timestamp('ns'))]
+    fields += [pa.field(name, metric_type) for name in series_names(session)[1:]]
+    metadata = {'source': str(session.meta.get('source') or ''),
+                'sample_interval': str(session.meta.get('sample_interval', ''))}
+    return pa.schema(fields, metadata=metadata)
+
+
+def _record_batches(pa, session, schema, chunk_rows):
+    for timestamps, values in iter_session_chunks(session, chunk_rows):
+        arrays = [pa.array(timestamps, type=schema.field(0).type)]
+        arrays += [pa.array(row, type=schema.field(i + 1).type, from_pandas=True) for i, row in enumerate(values)]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(session, path, chunk_rows=CHUNK_ROWS, compression=COMPRESSION):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, session)
+    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+        for batch in _record_batches(pa, session, schema, chunk_rows):
+            writer.write_batch(batch)
+
+
+def write_arrow(session, path, chunk_rows=CHUNK_ROWS, compression=COMPRESSION):
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa, session)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+        for batch in _record_batches(pa, session, schema, chunk_rows):
+            writer.write_batch(batch)
+
+
+WRITERS = {'parquet': write_parquet, 'arrow': write_arrow, 'csv': write_csv}
+
+
+def export_session(session, path, fmt=None, chunk_rows=CHUNK_ROWS):
+    # -> (chemin, erreur) ; format déduit de l'extension si fmt n'est pas donné
+    fmt = fmt or export_format(path)
+    if fmt not in WRITERS:
+        return None, f"Format d'export non supporté : {os.path.splitext(path)[1] or path}"
+    if session is None:
+        return None, "Aucune série temporelle à exporter (session non conservée en mode streaming)."
+    try:
+        WRITERS[fmt](session, path, chunk_rows=chunk_rows)
+    except ImportError:
+        return None, f"L'export {fmt} nécessite pyarrow (pip install pyarrow)."
+    except Exception as e:
+        return None, f"Erreur lors de l'export : {str(e)}"
+    return path, None
+
+
+def export(path, stats=None, session=None, diagnostics=None, chunk_rows=CHUNK_ROWS):
+    # Point d'entrée commun (bouton Exporter, batch) : résumé JSON ou séries selon l'extension
+    if export_format(path) == 'json':
+        if not stats:
+            return None, "Aucune statistique à exporter."
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(summary_json(stats, diagnostics))
+        except OSError as e:
+            return None, f"Erreur lors de l'export : {str(e)}"
+        return path, None
+    return export_session(session, path, chunk_rows=chunk_rows)
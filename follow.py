@@ -0,0 +1,113 @@
+# follow.py
+# Mode live : suit un log Afterburner (.hml / .csv) pendant que le jeu tourne.
+#
+# À chaque poll(), seules les lignes ajoutées depuis le poll précédent sont lues (on reprend
+# à l'octet où l'on s'était arrêté) et ajoutées aux accumulateurs de streaming.py
+# (moyenne / min / max exacts, 1% low par sketch) et aux décimateurs des graphiques.
+# Le coût d'une mise à jour dépend des nouvelles lignes, pas de la durée de la session.
+# L'export Excel (.xlsx) n'est pas écrit au fil de l'eau : seuls les logs texte sont suivis.
+import os
+
+import numpy as np
+import pandas as pd
+
+from afterburner_log import AfterburnerLogReader, is_text_log
+from downsampling import StreamingDecimator
+from streaming import StreamingStats
+
+FOLLOW_COLUMNS = ['Framerate', 'GPU temperature', 'GPU usage', 'Core clock ', 'Temp over limit', 'CPU usage']
+GRAPH_COLUMNS = ['Framerate', 'GPU temperature', 'CPU usage']
+GRAPH_MAX_BUCKETS = 2000
+MAX_READ_BYTES = 32 * 1024 * 1024  # rattrapage d'un gros log existant en plusieurs poll()
+
+
+class LogFollower:
+    def __init__(self, file_path, encoding='utf-8', max_read_bytes=MAX_READ_BYTES):
+        if not is_text_log(file_path):
+            raise ValueError("Le mode live ne suit que les logs texte Afterburner (.hml / .csv).")
+        self.file_path = file_path
+        self.encoding = encoding
+        self.max_read_bytes = max_read_bytes
+        self.reset()
+
+    def reset(self):
+        self.offset = 0  # octets déjà traités (toujours sur une fin de ligne)
+        self.reader = AfterburnerLogReader(self.file_path, encoding=self.encoding)
+        self.acc = StreamingStats(FOLLOW_COLUMNS)
+        self.decimators = {col: StreamingDecimator(GRAPH_MAX_BUCKETS) for col in GRAPH_COLUMNS}
+        self.start_ns = None  # premier timestamp valide : origine de l'axe des graphiques
+        self.dropped = 0
+
+    @property
+    def pending(self):
+        # Octets du fichier pas encore lus (rattrapage en cours)
+        try:
+            return max(os.path.getsize(self.file_path) - self.offset, 0)
+        except OSError:
+            return 0
+
+    def poll(self):
+        # -> nombre de lignes ajoutées aux stats depuis le dernier appel
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            self.reset()  # fichier tronqué / recréé (nouvelle session Afterburner)
+        if size == self.offset:
+            return 0
+
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(min(size - self.offset, self.max_read_bytes))
+
+        # Dernière ligne incomplète (en cours d'écriture) : relue au prochain poll
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return 0
+        self.offset += end
+        lines = data[:end].decode(self.encoding, errors='replace').splitlines(keepends=True)
+
+        added = 0
+        for timestamps, metrics in self.reader.iter_line_chunks(lines):
+            added += self._add_chunk(timestamps, metrics)
+        return added
+
+    def _add_chunk(self, timestamps, metrics):
+        # Mêmes filtres que compute_stats : framerate >= 1000 et horodatages invalides
+        keep = ~(metrics['Framerate'] >= 1000) & ~np.isnat(timestamps)
+        self.dropped += int(len(keep) - keep.sum())
+        if not keep.any():
+            return 0
+
+        timestamps = timestamps[keep]
+        chunk = pd.DataFrame({'Timestamp': timestamps, **{col: metrics[col][keep] for col in FOLLOW_COLUMNS}})
+        self.acc.update(chunk, time_column='Timestamp')
+
+        epoch = timestamps.view(np.int64)
+        if self.start_ns is None:
+            self.start_ns = int(epoch.min())
+        minutes = (epoch - self.start_ns) / 60e9
+        for col, decimator in self.decimators.items():
+            decimator.append(minutes, chunk[col].to_numpy())
+        return len(chunk)
+
+    @property
+    def rows(self):
+        return self.acc.rows
+
+    @property
+    def duration(self):
+        if self.acc.first_time is None:
+            return pd.Timedelta(0)
+        return self.acc.last_time - self.acc.first_time
+
+    def snapshot(self, model):
+        # État courant, de taille bornée (stats + séries décimées), transmissible au thread Tk
+        if self.acc.rows == 0:
+            return None
+        stats = model.stats_from_accumulator(self.acc, self.duration)
+        stats['Colonnes'] = self.reader.mapping.summary()
+        return {
+            'stats': stats,
+            'duration': self.duration,
+            'rows': self.acc.rows,
+            'series': {col: decimator.series() for col, decimator in self.decimators.items()},
+        }
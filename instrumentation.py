@@ -0,0 +1,196 @@
+# instrumentation.py
+# Mesures par étape du chargement (compute_stats) : temps, lignes en entrée / sortie,
+# lignes retirées par chaque filtre, variation mémoire.
+#
+#   diag = LoadDiagnostics(memory=True)
+#   result, error = model.compute_stats(path, instrument=diag)
+#   print(diag.report())          # ou result['diagnostics'].to_dict()
+#
+# Désactivé (instrument=None), le modèle utilise NULL_INSTRUMENTATION : chaque étape est
+# un context manager partagé qui ne fait rien (pas d'horloge, pas de tracemalloc).
+# Les étapes peuvent s'imbriquer (ex : 'nettoyage' dans 'lecture') : comme pour -X importtime,
+# le temps "self" exclut les sous-étapes. Une étape répétée (un appel par bloc) est cumulée.
+import time
+import tracemalloc
+
+
+class StageRecord:
+    __slots__ = ('name', 'depth', 'calls', 'seconds', 'self_seconds', 'rows_in', 'rows_out',
+                 'dropped', 'memory_delta', 'memory_peak')
+
+    def __init__(self, name, depth):
+        self.name = name
+        self.depth = depth
+        self.calls = 0
+        self.seconds = 0.0
+        self.self_seconds = 0.0
+        self.rows_in = None
+        self.rows_out = None
+        self.dropped = {}  # filtre -> nombre de lignes retirées
+        self.memory_delta = None  # octets (tracemalloc), None si la mémoire n'est pas suivie
+        self.memory_peak = None
+
+    def to_dict(self):
+        return {
+            'stage': self.name,
+            'depth': self.depth,
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'self_seconds': self.self_seconds,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'dropped': dict(self.dropped),
+            'memory_delta_mb': None if self.memory_delta is None else self.memory_delta / 1e6,
+            'memory_peak_mb': None if self.memory_peak is None else self.memory_peak / 1e6,
+        }
+
+
+class _Stage:
+    # Une exécution d'étape (context manager) ; les compteurs sont ajoutés au StageRecord
+    __slots__ = ('_diag', '_record', '_start', '_children', '_memory_start')
+
+    def __init__(self, diag, record):
+        self._diag = diag
+        self._record = record
+
+    def rows(self, rows_in, rows_out):
+        # None : inconnu (ex : la lecture n'a pas de lignes en entrée)
+        record = self._record
+        if rows_in is not None:
+            record.rows_in = (record.rows_in or 0) + rows_in
+        if rows_out is not None:
+            record.rows_out = (record.rows_out or 0) + rows_out
+
+    def dropped(self, reason, count):
+        self._record.dropped[reason] = self._record.dropped.get(reason, 0) + int(count)
+
+    def __enter__(self):
+        self._children = 0.0
+        self._memory_start = None
+        if self._diag.memory and tracemalloc.is_tracing():
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+        self._diag._stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        stack = self._diag._stack
+        stack.pop()
+        if stack:
+            stack[-1]._children += elapsed
+
+        record = self._record
+        record.calls += 1
+        record.seconds += elapsed
+        record.self_seconds += elapsed - self._children
+        if self._memory_start is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            record.memory_delta = (record.memory_delta or 0) + current - self._memory_start
+            # Pic global depuis le début du chargement : le max des étapes suffit à situer le pic
+            record.memory_peak = max(record.memory_peak or 0, peak - self._diag._memory_base)
+        return False
+
+
+class LoadDiagnostics:
+    # memory=True : tracemalloc est démarré le temps du chargement. Coûteux sur les étapes qui
+    # créent beaucoup d'objets Python (la lecture peut prendre 2 à 3 fois plus de temps) :
+    # désactivé par défaut pour que les temps mesurés restent ceux de production.
+    enabled = True
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = {}  # nom -> StageRecord, dans l'ordre de première exécution
+        self.source = None
+        self.cache_hit = False
+        self.columns = None  # disposition reconnue et métriques absentes (ColumnMapping.summary)
+        self._stack = []
+        self._memory_base = 0
+        self._started_tracing = False
+        self._start = None
+        self.total_seconds = None
+
+    def start(self, source=None):
+        self.source = source
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            self._memory_base = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+
+    def finish(self):
+        if self._start is not None:
+            self.total_seconds = time.perf_counter() - self._start
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def stage(self, name):
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = StageRecord(name, len(self._stack))
+        return _Stage(self, record)
+
+    @property
+    def stages(self):
+        return list(self.records.values())
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'cache_hit': self.cache_hit,
+            'columns': self.columns,
+            'total_seconds': self.total_seconds,
+            'stages': [record.to_dict() for record in self.records.values()],
+        }
+
+    def report(self):
+        lines = [f"{'étape':28s} {'temps (ms)':>11s} {'self (ms)':>10s} {'entrée':>10s} {'sortie':>10s} "
+                 f"{'Δ mém (Mo)':>11s}  lignes retirées"]
+        for r in self.records.values():
+            memory = '' if r.memory_delta is None else f"{r.memory_delta / 1e6:.1f}"
+            dropped = ', '.join(f"{reason} : {count}" for reason, count in r.dropped.items())
+            lines.append(f"{'  ' * r.depth + r.name:28s} {r.seconds * 1000:11.1f} {r.self_seconds * 1000:10.1f} "
+                         f"{'' if r.rows_in is None else r.rows_in:>10} {'' if r.rows_out is None else r.rows_out:>10} "
+                         f"{memory:>11s}  {dropped}")
+        if self.columns is not None:
+            missing = ', '.join(name.strip() for name in self.columns['manquantes']) or 'aucune'
+            lines.append(f"colonnes : disposition '{self.columns['disposition']}', manquantes : {missing}")
+        if self.total_seconds is not None:
+            lines.append(f"total : {self.total_seconds * 1000:.1f} ms" + (" (cache)" if self.cache_hit else ""))
+        return "\n".join(lines)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def rows(self, rows_in, rows_out):
+        pass
+
+    def dropped(self, reason, count):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _NullDiagnostics:
+    enabled = False
+
+    def start(self, source=None):
+        pass
+
+    def finish(self):
+        pass
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+
+_NULL_STAGE = _NullStage()
+NULL_INSTRUMENTATION = _NullDiagnostics()
@@ -1,7 +1,14 @@
+import time
+
+_T0 = time.perf_counter()  # avant tout autre import : base du rapport de démarrage
+
 import tkinter as tk
+import multiprocessing
 import os
 import sys
-from controller import StatsController
+from startup import StartupTimer
+from controller import StatsController  # léger : pandas / matplotlib sont chargés plus tard
+from splash import show_startup_status
 
 def resource_path(relative_path):
     try:
@@ -10,17 +17,38 @@ def resource_path(relative_path):
         base_path = os.path.dirname(__file__)
     return os.path.join(base_path, relative_path)
 
-# ========================================
-root = tk.Tk()
-root.title("Game Stats Analyzer")
-root.geometry("1200x800")
-root.configure(bg="#0d1117")
+def main():
+    timer = StartupTimer(_T0)
+    timer.mark("imports de main.py")
+
+    root = tk.Tk()
+    root.title("Game Stats Analyzer")
+    root.geometry("1200x800")
+    root.configure(bg="#0d1117")
+
+    # Icône (marche en dev ET en .exe)
+    try:
+        root.iconbitmap(resource_path("assets/fox.ico"))
+    except:
+        pass
+
+    StatsController(root, diagnostics="--diagnostics" in sys.argv, trace_memory="--trace-memory" in sys.argv)
+    root.update_idletasks()
+    root.after(0, lambda: timer.mark("première fenêtre affichée"))
+
+    # Préchargement de pandas / matplotlib en arrière-plan, progression réelle dans la barre d'état
+    def on_warm_up_done(errors):
+        for name, error in errors:
+            print(f"Préchargement de {name} impossible : {error}", file=sys.stderr)
+        if "--startup-report" in sys.argv:
+            print(timer.report())
+
+    show_startup_status(root, timer, on_warm_up_done)
+    root.mainloop()
 
-# Icône (marche en dev ET en .exe)
-try:
-    root.iconbitmap(resource_path("assets/fox.ico"))
-except:
-    pass
 
-StatsController(root)
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    # Les pools de processus (comparaison de logs) ré-importent ce module dans chaque worker :
+    # la fenêtre ne doit être créée que dans le processus principal (et l'exe PyInstaller)
+    multiprocessing.freeze_support()
+    main()
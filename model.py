@@ -2,88 +2,645 @@
 import pandas as pd
 import numpy as np
 
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import zip_longest
 
-class StatsModel:
-    def __init__(self):
-        pass
+from afterburner_log import METRIC_COLUMNS, AfterburnerLogReader, is_text_log, parse_timestamps
+from events import EventIndex, build_event_index
+from instrumentation import NULL_INSTRUMENTATION
+from schema import ACTION_FIELD, METRIC_PARSE_DTYPE, TIMESTAMP_FIELD, find_header
+from session import Session
+from stats_kernel import PERCENTILES, column_stats, nan_percentiles, stack_columns
+from session_store import SessionStoreError, is_session_store, open_session, save_session
+from streaming import StreamingStats
+from windowing import (ROLLING_WINDOW, detect_segments, full_windows, ranges_to_segments, rolling_max,
+                       rolling_mean, rolling_min, segment_reductions, window_samples)
 
-    def compute_stats(self, file_path):
-        try:
-            df = pd.read_excel( file_path, engine='openpyxl' )
+STREAM_CHUNK_ROWS = 50_000
+HEADER_SCAN_ROWS = 10  # lignes lues au début de la feuille pour trouver l'en-tête (code 02)
+XLSX_EXTENSIONS = ('.xlsx', '.xlsm')  # lus par xlsx_reader.py ; les autres (.xls) par openpyxl
+
+CANCELLED_MESSAGE = "Chargement annulé."
+
+# Étapes signalées au callback de progression : progress(étape, fraction globale 0..1 ou None)
+STAGE_READ = "Lecture du fichier"
+STAGE_TIMESTAMPS = "Traitement des horodatages"
+STAGE_STATS = "Calcul des statistiques"
+STAGE_FILES = "Chargement des fichiers"
+READ_WEIGHT = 0.8  # part de la barre de progression consacrée à la lecture
+ROLLING_REDUCTIONS = {'moyenne': rolling_mean, 'min': rolling_min, 'max': rolling_max}  # fenêtre glissante
+
+# Filtres dont on compte les lignes retirées (voir instrumentation.py)
+DROP_ACTION_TYPE = "Action type 0-3"
+DROP_HIGH_FRAMERATE = ">= 1000 FPS"
+DROP_INVALID_TIMESTAMP = "horodatage invalide (NaT)"
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+def _compute_in_worker(file_path, window, segments):
+    # Exécuté dans un processus du pool de compute_stats_many (fonction de module : picklable)
+    return StatsModel().compute_stats( file_path, window=window, segments=segments )
 
-            # === TOUS TES TRAITEMENTS EXISTANTS (drops, colonnes, scaling, etc.) ===
-            # (je les laisse exactement comme tu les avais, je touche rien)
-            df = df.drop( columns=df.columns[[8, 9, 10, 11, 12]] )
-            indices_a_supprimer = df[df.iloc[:, 0].isin( [0, 1, 2, 3] )].index
-            df = df.drop( indices_a_supprimer )
 
-            df.columns = ['Action type', 'Timestamp', 'GPU temperature', 'GPU usage', 'Core clock ',
-                          'Temp over limit', 'CPU usage', 'Framerate']
+def _float_column(values):
+    # Cellules -> float64 (None -> NaN) ; texte non numérique -> NaN comme pd.to_numeric(errors='coerce')
+    try:
+        return np.array( values, dtype=METRIC_PARSE_DTYPE )
+    except (TypeError, ValueError):
+        return pd.to_numeric( pd.Series( values, dtype=object ), errors='coerce' ).to_numpy( dtype=METRIC_PARSE_DTYPE )
 
-            columns_to_scale = ['GPU temperature', 'GPU usage', 'Core clock ', 'Temp over limit',
-                                'CPU usage', 'Framerate']
-            for col in columns_to_scale:
-                if col in df.columns:
-                    df[col] = pd.to_numeric( df[col], errors='coerce' ) / 1000
 
-            tooHighFramerateIndexes = df[df['Framerate'] >= 1000].index
-            df = df.drop( tooHighFramerateIndexes )
+def _stat_or_na(value):
+    return float( value ) if not np.isnan( value ) else 'N/A'
 
-            df, duration = self.process_timestamp_column( df, col_index=1 )
 
-            if df.empty:
+def _report(progress, stage, fraction):
+    if progress is not None:
+        progress( stage, fraction )
+
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise LoadCancelled()
+
+
+class StatsModel:
+    def __init__(self, cache=None):
+        self.cache = cache  # StatsCache optionnel (voir stats_cache.py)
+
+    def compute_stats(self, file_path, streaming=False, progress=None, cancel=None, instrument=None,
+                      window=ROLLING_WINDOW, segments=None):
+        # progress : callable(étape, fraction) appelé depuis le thread de calcul
+        # cancel : objet avec is_set() (threading.Event) vérifié entre chaque bloc / étape
+        # instrument : LoadDiagnostics optionnel, renvoyé dans result['diagnostics']
+        # window : fenêtre glissante ('60s' ou nombre d'échantillons) ; segments : plages
+        #   [(début, fin)] en temps écoulé, None = détection automatique (voir windowing.py)
+        inst = instrument if instrument is not None else NULL_INSTRUMENTATION
+        inst.start( file_path )
+        try:
+            result, error = self._compute_stats( file_path, streaming, progress, cancel, inst, window, segments )
+        finally:
+            inst.finish()
+        if instrument is not None and result is not None:
+            result = dict( result, diagnostics=instrument )
+        return result, error
+
+    def _cache_key(self, file_path, streaming, window, segments):
+        if self.cache is None:
+            return None
+        params = {'streaming': streaming, 'window': str( window ),
+                  'segments': None if segments is None else [tuple( map( str, r ) ) for r in segments]}
+        try:
+            return self.cache.make_key( file_path, params )
+        except OSError:
+            return None  # fichier illisible : l'erreur sera remontée par le chargement
+
+    def _compute_stats(self, file_path, streaming, progress, cancel, inst, window, segments):
+        if is_session_store( file_path ):
+            # Session déjà nettoyée : rien à parser ni à mettre en cache
+            with inst.stage( "session mappée" ) as stage:
+                result, error = self.load_session( file_path )
+                if result is not None:
+                    stage.rows( len( result['session'] ), len( result['session'] ) )
+            return result, error
+
+        key = self._cache_key( file_path, streaming, window, segments )
+        if key is not None:
+            with inst.stage( "cache" ):
+                cached = self.cache.get( key )
+            if cached is not None:
+                if inst.enabled:
+                    inst.cache_hit = True
+                return cached, None
+
+        if streaming:
+            result, error = self.compute_stats_streaming( file_path, progress=progress, cancel=cancel, instrument=inst )
+        else:
+            result, error = self.compute_stats_in_memory( file_path, progress=progress, cancel=cancel, instrument=inst,
+                                                          window=window, segments=segments )
+
+        if key is not None and result is not None:
+            self.cache.put( key, result )
+        return result, error
+
+    def compute_stats_many(self, file_paths, workers=None, progress=None, cancel=None,
+                           window=ROLLING_WINDOW, segments=None):
+        # Plusieurs logs en parallèle (pool de processus) -> [(result, error)] dans l'ordre de file_paths.
+        # Les résultats déjà en cache ne sont pas recalculés ; les nouveaux y sont ajoutés.
+        outcomes = [None] * len( file_paths )
+        # Sessions enregistrées (.gsa) : mappées ici, ni pool (copie par pickle) ni cache
+        stores = [is_session_store( path ) for path in file_paths]
+        for i, path in enumerate( file_paths ):
+            if stores[i]:
+                outcomes[i] = self.load_session( path )
+        keys = [None if stores[i] else self._cache_key( path, False, window, segments )
+                for i, path in enumerate( file_paths )]
+        for i, key in enumerate( keys ):
+            cached = self.cache.get( key ) if key is not None else None
+            if cached is not None:
+                outcomes[i] = (cached, None)
+
+        todo = [i for i, outcome in enumerate( outcomes ) if outcome is None]
+        done = len( file_paths ) - len( todo )
+        _report( progress, f"{STAGE_FILES} ({done}/{len( file_paths )})", done / max( len( file_paths ), 1 ) )
+        if not todo:
+            return outcomes
+
+        workers = min( workers or os.cpu_count() or 1, len( todo ) )
+        pool = ProcessPoolExecutor( max_workers=workers )
+        try:
+            futures = {pool.submit( _compute_in_worker, file_paths[i], window, segments ): i for i in todo}
+            pending = set( futures )
+            while pending:
+                finished, pending = wait( pending, timeout=0.2, return_when=FIRST_COMPLETED )
+                _check_cancel( cancel )
+                for future in finished:
+                    i = futures[future]
+                    try:
+                        outcomes[i] = future.result()
+                    except Exception as e:  # crash du worker (mémoire, pickling...)
+                        outcomes[i] = (None, f"Erreur lors du chargement : {str( e )}")
+                    if outcomes[i][0] is not None and keys[i] is not None:
+                        self.cache.put( keys[i], outcomes[i][0] )
+                    done += 1
+                    _report( progress, f"{STAGE_FILES} ({done}/{len( file_paths )})", done / len( file_paths ) )
+        except LoadCancelled:
+            return [(None, CANCELLED_MESSAGE)] * len( file_paths )
+        finally:
+            # Annulation : les fichiers pas encore commencés sont abandonnés sans attendre
+            pool.shutdown( wait=False, cancel_futures=True )
+        return outcomes
+
+    def compute_stats_in_memory(self, file_path, progress=None, cancel=None, instrument=NULL_INSTRUMENTATION,
+                                window=ROLLING_WINDOW, segments=None):
+        inst = instrument
+        try:
+            mapping = {}
+            df = self.read_log( file_path, progress=progress, cancel=cancel, instrument=inst,
+                                on_mapping=lambda found: mapping.update( found=found ) )
+
+            with inst.stage( "filtre framerate" ) as stage:
+                rows_in = len( df )
+                tooHighFramerateIndexes = df[df['Framerate'] >= 1000].index
+                df = df.drop( tooHighFramerateIndexes )
+                stage.rows( rows_in, len( df ) )
+                stage.dropped( DROP_HIGH_FRAMERATE, rows_in - len( df ) )
+
+            _check_cancel( cancel )
+            _report( progress, STAGE_TIMESTAMPS, READ_WEIGHT )
+            # Session de calcul en float64 (stats exactes), puis gardée en float32
+            session, duration = self.build_session( df, file_path, dtype=np.float64, instrument=inst )
+            del df
+
+            if len( session ) == 0:
                 return None, "DataFrame vide après nettoyage."
 
+            _check_cancel( cancel )
+            _report( progress, STAGE_STATS, 0.9 )
+
             columns_for_calcs = ['Framerate', 'GPU temperature', 'GPU usage',
                                  'Core clock ', 'Temp over limit', 'CPU usage']
 
-            custom_stats = {}
-
-            # Moyenne / Min / Max
-            for col in columns_for_calcs:
-                if col in df.columns and pd.api.types.is_numeric_dtype( df[col] ):
-                    custom_stats[f'Moyenne {col}'] = {'moyenne': df[col].mean()}
-                    custom_stats[f'Min {col}'] = {'min': df[col].min()}
-                    custom_stats[f'Max {col}'] = {'max': df[col].max()}
-                else:
-                    custom_stats[f'Moyenne {col}'] = {'moyenne': 'N/A'}
-                    custom_stats[f'Min {col}'] = {'min': 'N/A'}
-                    custom_stats[f'Max {col}'] = {'max': 'N/A'}
+            # Moyenne / min / max, 1% lows et percentiles : un seul passage (voir stats_kernel.py)
+            with inst.stage( "moyenne / min / max / percentiles" ) as stage:
+                custom_stats = self.compute_basic_stats( session, columns_for_calcs )
+                stage.rows( len( session ), len( session ) )
 
             custom_stats['Durée Partie'] = {'duration': duration}
-
-            one_percent_lows = self.calculateOnePercentLow( df, columns=columns_for_calcs )
-            custom_stats['1% Lows'] = one_percent_lows
+            self.record_columns( custom_stats, mapping.get( 'found' ), inst )
+
+            # Fenêtre glissante et segments (chargements / menus exclus) : voir windowing.py
+            with inst.stage( "fenêtre glissante" ) as stage:
+                rolling = self.compute_rolling_stats( session, window, columns_for_calcs )
+                custom_stats['Fenêtre glissante'] = self.summarize_rolling( rolling )
+                stage.rows( len( session ), len( session ) )
+            with inst.stage( "segments" ) as stage:
+                custom_stats['Segments'] = self.compute_segments( session, segments, columns_for_calcs )
+                stage.rows( len( session ), len( custom_stats['Segments'] ) )
+            # Saccades, limite thermique, saturation : index trié pour la navigation (voir events.py)
+            with inst.stage( "événements" ) as stage:
+                events = build_event_index( session )
+                custom_stats['Événements'] = events.summary()
+                stage.rows( len( session ), len( events ) )
+
+            session.stats = custom_stats
+            with inst.stage( "conversion float32" ):
+                session = session.astype( np.float32 )
+            _report( progress, STAGE_STATS, 1.0 )
 
             # === NOUVELLE RETOUR (tout ce qu’il faut pour les graphs) ===
             return {
                 'stats': custom_stats,
-                'df': df.copy(),  # on renvoie une copie propre
+                'session': session,  # tableaux float32 / int64 compacts, plus de copie de DataFrame
+                'duration': duration,
+                # Moyenne glissante du framerate (float32), pour le graphique
+                'rolling': {'window': rolling['window'],
+                            'Framerate': rolling['columns']['Framerate']['moyenne'].astype( np.float32 )},
+                'events': events,
+            }, None
+
+        except LoadCancelled:
+            return None, CANCELLED_MESSAGE
+        except Exception as e:
+            return None, f"Erreur lors du chargement : {str( e )}"
+
+    # === SESSIONS ENREGISTRÉES (.gsa, voir session_store.py) ===
+    def save_session(self, result, path):
+        # -> (chemin, erreur) ; moyenne glissante et événements gardés comme tableaux annexes
+        session = result.get( 'session' ) if result else None
+        if session is None:
+            return None, "Aucune session à enregistrer (session non conservée en mode streaming)."
+        meta = dict( session.meta )
+        extras = {}
+        rolling = result.get( 'rolling' )
+        if rolling is not None:
+            meta['rolling_window'] = str( rolling['window'] )
+            extras['rolling/Framerate'] = rolling['Framerate']
+        events = result.get( 'events' )
+        if events is not None:
+            meta['events_origin'] = int( events.origin )
+            meta['event_kinds'] = events.kinds
+            for kind in events.kinds:
+                extras[f'events/{kind}/starts'] = events.starts[kind]
+                extras[f'events/{kind}/stops'] = events.stops[kind]
+                extras[f'events/{kind}/values'] = events.values[kind]
+        try:
+            stats = result.get( 'stats', session.stats )
+            save_session( Session( session.columns, session.values, session.timestamps, stats, meta ),
+                          path, extras )
+        except (OSError, SessionStoreError) as e:
+            return None, f"Erreur lors de l'enregistrement de la session : {str( e )}"
+        return path, None
+
+    def load_session(self, path):
+        # -> (résultat au format de compute_stats, erreur) ; tableaux mappés, seul l'en-tête est lu
+        try:
+            session, extras = open_session( path )
+        except (OSError, SessionStoreError) as e:
+            return None, f"Erreur lors de l'ouverture de la session : {str( e )}"
+        meta = session.meta
+        result = {
+            'stats': session.stats,
+            'session': session,
+            'duration': session.stats.get( 'Durée Partie', {} ).get( 'duration', meta.get( 'duration' ) ),
+        }
+        window = meta.pop( 'rolling_window', None )
+        if 'rolling/Framerate' in extras:
+            result['rolling'] = {'window': window, 'Framerate': extras['rolling/Framerate']}
+        kinds = meta.pop( 'event_kinds', None )
+        origin = meta.pop( 'events_origin', None )
+        if kinds is not None:
+            events = EventIndex( origin )
+            for kind in kinds:
+                events.add( kind, extras[f'events/{kind}/starts'], extras[f'events/{kind}/stops'],
+                            extras[f'events/{kind}/values'] )
+            result['events'] = events
+        return result, None
+
+    def compute_basic_stats(self, session, columns, percentiles=PERCENTILES):
+        # Toutes les colonnes empilées en un tableau 2D, réduites ensemble (voir stats_kernel.py) :
+        # 'Moyenne / Min / Max <col>', '1% Lows' et 'Percentiles' (percentiles + écart-type)
+        present, values = stack_columns( session, columns )
+        reductions = column_stats( values, percentiles )
+        custom_stats = {}
+        one_percent_lows = {}
+        distribution = {}
+
+        for col in columns:
+            if col in present:
+                i = present.index( col )
+                # Colonne sans aucune valeur (absente de l'en-tête, voir record_columns) : N/A, comme en streaming
+                custom_stats[f'Moyenne {col}'] = {'moyenne': _stat_or_na( reductions['moyenne'][i] )}
+                custom_stats[f'Min {col}'] = {'min': _stat_or_na( reductions['min'][i] )}
+                custom_stats[f'Max {col}'] = {'max': _stat_or_na( reductions['max'][i] )}
+                distribution[col] = {name: _stat_or_na( reductions[name][i] )
+                                     for name in list( percentiles ) + ['écart-type']}
+                one_percent_lows[col] = distribution[col].get( '1% low', 'N/A' )
+                if one_percent_lows[col] == 'N/A':
+                    one_percent_lows[col] = 'N/A (pas assez de données)'
+            else:
+                custom_stats[f'Moyenne {col}'] = {'moyenne': 'N/A'}
+                custom_stats[f'Min {col}'] = {'min': 'N/A'}
+                custom_stats[f'Max {col}'] = {'max': 'N/A'}
+                one_percent_lows[col] = 'N/A (colonne absente)'
+
+        custom_stats['1% Lows'] = one_percent_lows
+        custom_stats['Percentiles'] = distribution
+        return custom_stats
+
+    def compute_stats_streaming(self, file_path, chunk_rows=STREAM_CHUNK_ROWS, progress=None, cancel=None,
+                                instrument=NULL_INSTRUMENTATION):
+        # Mode streaming : mémoire constante, le log est lu et agrégé bloc par bloc.
+        # Pas de 'session' en retour (les séries complètes ne sont jamais gardées en mémoire).
+        # Tolérance vs compute_stats : voir streaming.py
+        columns_for_calcs = ['Framerate', 'GPU temperature', 'GPU usage',
+                             'Core clock ', 'Temp over limit', 'CPU usage']
+        inst = instrument
+        try:
+            acc = StreamingStats( columns_for_calcs )
+            mapping = {}
+            chunks = self.iter_log_chunks( file_path, chunk_rows, progress=progress, cancel=cancel, instrument=inst,
+                                           on_mapping=lambda found: mapping.update( found=found ) )
+            while True:
+                # La lecture d'un bloc est mesurée à chaque next() (le générateur lit paresseusement)
+                with inst.stage( "lecture" ) as stage:
+                    chunk = next( chunks, None )
+                    if chunk is not None:
+                        stage.rows( None, len( chunk ) )
+                if chunk is None:
+                    break
+
+                with inst.stage( "filtre framerate" ) as stage:
+                    rows_in = len( chunk )
+                    chunk = chunk[~(chunk['Framerate'] >= 1000)]
+                    stage.rows( rows_in, len( chunk ) )
+                    stage.dropped( DROP_HIGH_FRAMERATE, rows_in - len( chunk ) )
+
+                with inst.stage( "horodatages" ) as stage:
+                    rows_in = len( chunk )
+                    times = self.to_datetime_column( chunk['Timestamp'] )
+                    chunk = chunk.assign( Timestamp=times )[times.notna()]
+                    stage.rows( rows_in, len( chunk ) )
+                    stage.dropped( DROP_INVALID_TIMESTAMP, rows_in - len( chunk ) )
+
+                with inst.stage( "agrégation" ) as stage:
+                    acc.update( chunk, time_column='Timestamp' )
+                    stage.rows( len( chunk ), len( chunk ) )
+
+            if acc.rows == 0:
+                return None, "DataFrame vide après nettoyage."
+
+            duration = acc.last_time - acc.first_time
+            custom_stats = self.stats_from_accumulator( acc, duration )
+            self.record_columns( custom_stats, mapping.get( 'found' ), inst )
+
+            _report( progress, STAGE_STATS, 1.0 )
+            return {
+                'stats': custom_stats,
+                'session': None,
                 'duration': duration
             }, None
 
+        except LoadCancelled:
+            return None, CANCELLED_MESSAGE
         except Exception as e:
             return None, f"Erreur lors du chargement : {str( e )}"
 
+    def record_columns(self, custom_stats, mapping, inst):
+        # Disposition reconnue et métriques absentes de l'en-tête (lues N/A) : stats['Colonnes'],
+        # diagnostics, et avertissement dans la vue (schema.missing_columns_warning)
+        if mapping is None:
+            return
+        custom_stats['Colonnes'] = mapping.summary()
+        if inst.enabled:
+            inst.columns = custom_stats['Colonnes']
+
+    def compute_rolling_stats(self, session, window=ROLLING_WINDOW, columns=None, reductions=('moyenne',)):
+        # -> {'window', 'samples', 'columns': {col: {réduction: tableau par échantillon}}}
+        # reductions : parmi ROLLING_REDUCTIONS ; au chargement seule la moyenne sert (résumé, graphique),
+        # min / max glissants (un tableau de plus par colonne et par réduction) seulement sur demande
+        columns = [col for col in (columns or session.columns) if col in session]
+        samples = window_samples( window, session.meta.get( 'sample_interval', pd.Timedelta( seconds=1 ) ) )
+        rolling = {}
+        for col in columns:
+            values = session[col]
+            rolling[col] = {name: ROLLING_REDUCTIONS[name]( values, samples ) for name in reductions}
+        return {'window': str( window ), 'samples': samples, 'columns': rolling}
+
+    def summarize_rolling(self, rolling):
+        # Extrêmes de la moyenne glissante (fenêtres complètes) : ex. la pire minute de la partie
+        summary = {'fenêtre': rolling['window'], 'échantillons': rolling['samples']}
+        for col, series in rolling['columns'].items():
+            means = full_windows( series['moyenne'], rolling['samples'] )
+            means = means[~np.isnan( means )]
+            if len( means ):
+                summary[col] = {'pire moyenne': float( means.min() ), 'meilleure moyenne': float( means.max() )}
+            else:
+                summary[col] = {'pire moyenne': 'N/A', 'meilleure moyenne': 'N/A'}
+        return summary
+
+    def compute_segments(self, session, ranges=None, columns=None):
+        # ranges : [(début, fin)] en temps écoulé ('HH:MM:SS', secondes, Timedelta) ;
+        # None = segments détectés automatiquement (parties de jeu entre chargements / menus)
+        columns = [col for col in (columns or session.columns) if col in session]
+        if not len( session ) or not columns:
+            return []
+        if ranges is None:
+            bounds = detect_segments( session['Framerate'], session.timestamps,
+                                      session.meta.get( 'sample_interval', pd.Timedelta( seconds=1 ) ) )
+            source = 'auto'
+        else:
+            bounds = ranges_to_segments( session.timestamps, ranges )
+            source = 'utilisateur'
+
+        values = np.stack( [session[col] for col in columns] )
+        reductions = segment_reductions( values, bounds )
+        origin = session.timestamps[0]
+        segments = []
+        for k, (start, stop) in enumerate( bounds ):
+            first, last = session.timestamps[start], session.timestamps[stop - 1]
+            segment = {
+                'début': pd.Timedelta( int( first - origin ), unit='ns' ),
+                'fin': pd.Timedelta( int( last - origin ), unit='ns' ),
+                'durée': pd.Timedelta( int( last - first ), unit='ns' ),
+                'échantillons': int( stop - start ),
+                'source': source,
+            }
+            for i, col in enumerate( columns ):
+                segment[col] = {stat: (float( array[i, k] ) if not np.isnan( array[i, k] ) else 'N/A')
+                                for stat, array in reductions.items()}
+            segments.append( segment )
+        return segments
+
+    def stats_from_accumulator(self, acc, duration):
+        # StreamingStats -> dict de stats au format de compute_stats (streaming et mode live)
+        custom_stats = {}
+        for col in acc.columns:
+            running = acc.running[col]
+            if running.count:
+                custom_stats[f'Moyenne {col}'] = {'moyenne': running.mean}
+                custom_stats[f'Min {col}'] = {'min': running.min}
+                custom_stats[f'Max {col}'] = {'max': running.max}
+            else:
+                custom_stats[f'Moyenne {col}'] = {'moyenne': 'N/A'}
+                custom_stats[f'Min {col}'] = {'min': 'N/A'}
+                custom_stats[f'Max {col}'] = {'max': 'N/A'}
+
+        custom_stats['Durée Partie'] = {'duration': duration}
+
+        one_percent_lows = {}
+        for col in acc.columns:
+            if acc.running[col].count >= 5:
+                one_percent_lows[col] = acc.one_percent_low( col )
+            else:
+                one_percent_lows[col] = 'N/A (pas assez de données)'
+        custom_stats['1% Lows'] = one_percent_lows
+        return custom_stats
+
+    def iter_log_chunks(self, file_path, chunk_rows=STREAM_CHUNK_ROWS, progress=None, cancel=None,
+                        instrument=NULL_INSTRUMENTATION, on_mapping=None):
+        # Blocs déjà nettoyés (colonnes renommées, lignes d'en-tête retirées, valeurs à l'échelle)
+        text_log = is_text_log( file_path )
+        for chunk in self.iter_raw_chunks( file_path, chunk_rows, progress=progress, cancel=cancel,
+                                           on_mapping=on_mapping ):
+            if text_log:
+                yield chunk
+                continue
+            with instrument.stage( "nettoyage Excel" ) as stage:
+                rows_in = len( chunk )
+                chunk = self.clean_excel_frame( chunk )
+                stage.rows( rows_in, len( chunk ) )
+                stage.dropped( DROP_ACTION_TYPE, rows_in - len( chunk ) )
+            yield chunk
+
+    def iter_raw_chunks(self, file_path, chunk_rows=STREAM_CHUNK_ROWS, progress=None, cancel=None, on_mapping=None):
+        # Blocs bruts typés : 'Action type', 'Timestamp' et les métriques (x1000 pour l'Excel)
+        # on_mapping(ColumnMapping) : colonnes reconnues dans l'en-tête (voir schema.py)
+        _report( progress, STAGE_READ, 0.0 )
+        if is_text_log( file_path ):
+            size = os.path.getsize( file_path ) or 1
+            reader = AfterburnerLogReader( file_path, chunk_size=chunk_rows )
+            for timestamps, metrics in reader.iter_chunks():
+                _check_cancel( cancel )
+                _report( progress, STAGE_READ, READ_WEIGHT * min( reader.chars_read / size, 1.0 ) )
+                yield pd.DataFrame( {'Action type': 80, 'Timestamp': timestamps, **metrics} )
+            if on_mapping is not None:
+                on_mapping( reader.mapping )  # en-tête lu au fil du fichier : connu à la fin
+            return
+
+        opened = self.open_xlsx( file_path )
+        if opened is not None:
+            reader, mapping = opened
+            if on_mapping is not None:
+                on_mapping( mapping )
+            with reader:
+                fields = mapping.fields
+                for columns in reader.iter_columns( fields, text_fields=(TIMESTAMP_FIELD,), chunk_rows=chunk_rows,
+                                                    min_row=2 ):
+                    _check_cancel( cancel )
+                    _report( progress, STAGE_READ, READ_WEIGHT * min( reader.bytes_read / reader.sheet_bytes, 1.0 ) )
+                    yield self.excel_frame( columns, mapping )
+            _report( progress, STAGE_READ, READ_WEIGHT )
+            return
+
+        import openpyxl
+        wb = openpyxl.load_workbook( file_path, read_only=True, data_only=True )
+        try:
+            ws = wb.active
+            total_rows = ws.max_row  # None si le fichier n'a pas de dimension : progression indéterminée
+            # Colonnes déduites de l'en-tête (voir schema.py) ; les capteurs au-delà de la dernière
+            # métrique utile ne sont pas lus, les autres ne sont pas convertis
+            mapping = find_header( ws.iter_rows( max_row=HEADER_SCAN_ROWS, values_only=True ) )
+            if on_mapping is not None:
+                on_mapping( mapping )
+            # 1re ligne = en-tête, comme pd.read_excel
+            rows = ws.iter_rows( min_row=2, max_col=mapping.fields[-1] + 1, values_only=True )
+            buffer = []
+            done = 0
+            for row in rows:
+                buffer.append( row )
+                if len( buffer ) >= chunk_rows:
+                    _check_cancel( cancel )
+                    done += len( buffer )
+                    _report( progress, STAGE_READ, READ_WEIGHT * min( done / total_rows, 1.0 ) if total_rows else None )
+                    yield self.excel_chunk( buffer, mapping )
+                    buffer = []
+            if buffer:
+                _check_cancel( cancel )
+                yield self.excel_chunk( buffer, mapping )
+            _report( progress, STAGE_READ, READ_WEIGHT )
+        finally:
+            wb.close()
+
+    def open_xlsx(self, file_path):
+        # -> (XlsxSheetReader, ColumnMapping), ou None si le fichier doit passer par openpyxl
+        if os.path.splitext( str( file_path ) )[1].lower() not in XLSX_EXTENSIONS:
+            return None
+        from xlsx_reader import XlsxFormatError, XlsxSheetReader
+
+        try:
+            reader = XlsxSheetReader( file_path )
+        except (XlsxFormatError, zipfile.BadZipFile, KeyError):
+            return None
+        try:
+            return reader, find_header( reader.head( HEADER_SCAN_ROWS ) )
+        except XlsxFormatError:
+            reader.close()
+            return None
+
+    def excel_chunk(self, rows, mapping):
+        # Lignes openpyxl -> colonnes, chacune convertie une seule fois dans son type final
+        cells = list( zip_longest( *rows ) )
+        columns = {field: cells[field] if field < len( cells ) else (None,) * len( rows ) for field in mapping.fields}
+        columns = {field: np.array( values, dtype=object ) if field == TIMESTAMP_FIELD else _float_column( values )
+                   for field, values in columns.items()}
+        return self.excel_frame( columns, mapping )
+
+    def excel_frame(self, columns, mapping):
+        # {position: tableau} -> DataFrame aux colonnes nommées (valeurs encore x1000)
+        n = len( columns[ACTION_FIELD] )
+        frame = {'Action type': columns[ACTION_FIELD], 'Timestamp': columns[TIMESTAMP_FIELD]}
+        fields = mapping.metric_fields
+        for metric in METRIC_COLUMNS:
+            frame[metric] = columns[fields[metric]] if metric in fields else np.full( n, np.nan )
+        return pd.DataFrame( frame )
+
+    def read_log(self, file_path, progress=None, cancel=None, instrument=NULL_INSTRUMENTATION, on_mapping=None):
+        # Lecture complète par blocs (progression + annulation possibles entre deux blocs)
+        with instrument.stage( "lecture" ) as stage:
+            chunks = list( self.iter_log_chunks( file_path, progress=progress, cancel=cancel, instrument=instrument,
+                                                 on_mapping=on_mapping ) )
+            if not chunks:
+                return pd.DataFrame( columns=['Action type', 'Timestamp'] + METRIC_COLUMNS )
+            df = pd.concat( chunks, ignore_index=True )
+            stage.rows( None, len( df ) )
+        return df
+
+    def clean_excel_frame(self, df):
+        df = self.drop_header_rows( df )
+        return self.scale_columns( df )
+
+    def drop_header_rows(self, df):
+        # Lignes 00 à 03 (en-têtes Afterburner) ; les colonnes sont déjà nommées par excel_chunk
+        indices_a_supprimer = df[df['Action type'].isin( [0, 1, 2, 3] )].index
+        return df.drop( indices_a_supprimer )
+
+    def scale_columns(self, df):
+        columns_to_scale = ['GPU temperature', 'GPU usage', 'Core clock ', 'Temp over limit',
+                            'CPU usage', 'Framerate']
+        for col in columns_to_scale:
+            if col in df.columns:
+                df[col] = pd.to_numeric( df[col], errors='coerce' ) / 1000
+
+        return df
+
     def format_stats_for_display(self, stats):
         # Colonnes pour la table
         columns = ['Framerate', 'GPU temperature', 'GPU usage', 'Core clock ', 'Temp over limit', 'CPU usage']
 
-        # Types de stats
+        if isinstance(stats, Session):
+            session, stats = stats, stats.stats
+            if 'Percentiles' not in stats and len(session):
+                # Session enregistrée avant les percentiles : calculés ici, par le même noyau
+                kernel = self.compute_basic_stats(session, columns)
+                stats = dict(stats, Percentiles=kernel['Percentiles'])
+
+        # Types de stats (percentiles seulement s'ils ont été calculés : pas en streaming / live)
         stat_types = ['Moyenne', 'Min', 'Max', '1% Low']
+        if stats.get('Percentiles'):
+            stat_types += list(self.DISTRIBUTION_ROWS)
 
         # Build formatted_data
         formatted_data = []
         for stat in stat_types:
             row = [stat]
             for col in columns:
-                if stat == '1% Low':
-                    # Extract from the dict '1% Lows'
-                    one_low_dict = stats.get('1% Lows', {})
-                    val = one_low_dict.get(col, 'N/A')
-                else:
-                    key = f"{stat} {col}"
-                    val = stats.get(key, {}).get(stat.lower(), 'N/A')
+                val = self.stat_value(stats, stat, col)
 
                 if isinstance(val, float):
                     row.append(f"{val:.1f}")
@@ -95,88 +652,157 @@ class StatsModel:
 
         return tree_columns, formatted_data
 
-    def generate_export_text(self, stats):
-        import json
+    # Lignes de la table -> clés de stats['Percentiles'][col]
+    DISTRIBUTION_ROWS = {'0.1% Low': '0.1% low', 'P5': 'p5', 'Médiane': 'médiane', 'P95': 'p95', 'P99': 'p99',
+                         'Écart-type': 'écart-type'}
+
+    def stat_value(self, stats, stat, col):
+        # stat : 'Moyenne' | 'Min' | 'Max' | '1% Low' | une ligne de DISTRIBUTION_ROWS
+        if stat == '1% Low':
+            # Extract from the dict '1% Lows'
+            return stats.get('1% Lows', {}).get(col, 'N/A')
+        if stat in self.DISTRIBUTION_ROWS:
+            return stats.get('Percentiles', {}).get(col, {}).get(self.DISTRIBUTION_ROWS[stat], 'N/A')
+        return stats.get(f"{stat} {col}", {}).get(stat.lower(), 'N/A')
+
+    def format_comparison(self, named_stats):
+        # named_stats : [(nom, stats)] ; la première session sert de référence pour les écarts
+        columns = ['Framerate', 'GPU temperature', 'GPU usage', 'Core clock ', 'Temp over limit', 'CPU usage']
+        stat_types = ['Moyenne', 'Min', 'Max', '1% Low']
+        names = [name for name, _ in named_stats]
 
-        # Restructure par colonne
-        restructured = {}
-        stat_types = ['moyenne', 'min', 'max', '1% low', 'duration']
-
-        for key, s in stats.items():
-            if key.startswith(('Moyenne', 'Min', 'Max')):
-                parts = key.split(' ', 1)
-                stat = parts[0].lower()
-                col = parts[1]
-                if col not in restructured:
-                    restructured[col] = {}
-                restructured[col][stat] = s.get(stat, 'N/A')
-            elif key == '1% Lows':  # Changé ici
-                for sub_col, val in s.items():  # Directement s.items()
-                    if sub_col not in restructured:
-                        restructured[sub_col] = {}
-                    restructured[sub_col]['1% low'] = val
-            elif key == 'Durée Partie':
-                restructured['Durée Partie'] = s.get('duration', 'N/A')
-            else:
-                restructured[key] = s
-
-        # Handler pour JSON (Timedelta -> HH:MM:SS, floats -> 1 decimal)
-        def default_handler(o):
-            if isinstance(o, pd.Timedelta):
-                total_seconds = int(o.total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                seconds = total_seconds % 60
-                return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            elif isinstance(o, float):
-                return round(o, 1)
-            return str(o)
-
-        return json.dumps(restructured, indent=4, default=default_handler)
+        def delta(value, ref):
+            if not isinstance(value, float) or not isinstance(ref, float):
+                return 'N/A'
+            diff = value - ref
+            return f"{diff:+.1f} ({diff / abs(ref) * 100:+.1f}%)" if ref else f"{diff:+.1f}"
 
-    def process_timestamp_column(self, df, col_index=1):
-        # Nettoyage : str, strip, normalize spaces
-        df.iloc[:, col_index] = df.iloc[:, col_index].astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
+        def hms(td):
+            total = int(abs(td.total_seconds()))
+            sign = '-' if td.total_seconds() < 0 else ''
+            return f"{sign}{total // 3600:02d}:{(total % 3600) // 60:02d}:{total % 60:02d}"
 
-        # Conversion to datetime
-        df.iloc[:, col_index] = pd.to_datetime(df.iloc[:, col_index], format='%d-%m-%Y %H:%M:%S', errors='coerce')
+        formatted_data = []
+        durations = [stats.get('Durée Partie', {}).get('duration') for _, stats in named_stats]
+        row = ['Durée'] + [hms(d) if d is not None else 'N/A' for d in durations]
+        for d in durations[1:]:
+            row.append(('+' if d >= durations[0] else '') + hms(d - durations[0])
+                       if d is not None and durations[0] is not None else 'N/A')
+        formatted_data.append(tuple(row))
+
+        for col in columns:
+            for stat in stat_types:
+                values = [self.stat_value(stats, stat, col) for _, stats in named_stats]
+                row = [f"{stat} {col.strip()}"]
+                row += [f"{v:.1f}" if isinstance(v, float) else str(v) for v in values]
+                row += [delta(v, values[0]) for v in values[1:]]
+                formatted_data.append(tuple(row))
+
+        tree_columns = ("Stat",) + tuple(names) + tuple(f"Δ {name}" for name in names[1:])
+        return tree_columns, formatted_data
 
-        # Drop NaT
-        df = df[df.iloc[:, col_index].notna()]
+    def generate_comparison_text(self, named_stats):
+        import json
 
-        # Extract time as string 'HH:MM:SS'
-        df.iloc[:, col_index] = df.iloc[:, col_index].apply(
-            lambda x: x.strftime('%H:%M:%S') if isinstance(x, pd.Timestamp) else None)
+        # Un export JSON par session (même format que generate_export_text), regroupés par nom
+        return json.dumps({name: json.loads(self.generate_export_text(stats)) for name, stats in named_stats},
+                          indent=4)
 
-        # Drop None
-        df = df[df.iloc[:, col_index].notna()]
+    def generate_export_text(self, stats, diagnostics=None):
+        from exporters import summary_json
 
-        # Sort ascending on time string
-        df = df.sort_values(by=df.columns[col_index], ascending=True).reset_index(drop=True)
+        # Résumé par colonne (voir exporters.summary_dict) ; les séries passent par exporters.export
+        return summary_json(stats, diagnostics)
 
-        # Calcul durée
-        if not df.empty:
-            min_time = pd.to_timedelta(df.iloc[:, col_index].min())
-            max_time = pd.to_timedelta(df.iloc[:, col_index].max())
-            duration = max_time - min_time
-        else:
-            duration = pd.Timedelta(0)
+    def process_timestamp_column(self, df, col_index=1):
+        # Tout reste en datetime64[ns] / int64 : pas de strftime ligne par ligne ni de tri sur des chaînes
+        col = df.columns[col_index]
+        index, epoch, duration, sample_interval = self.sort_timestamps(self.to_datetime_column(df[col]))
+
+        df = df.iloc[index].reset_index(drop=True)
+        df[col] = epoch.view('datetime64[ns]')
+        if len(epoch):
+            df.attrs['sample_interval'] = sample_interval
 
         return df, duration
 
+    def sort_timestamps(self, times):
+        # -> (positions des lignes gardées dans l'ordre chronologique, epoch int64 trié,
+        #     durée, intervalle d'échantillonnage médian)
+        # Drop NaT
+        valid = np.flatnonzero(times.notna().to_numpy())
+        epoch = times.to_numpy(dtype='datetime64[ns]')[valid].view(np.int64)
+
+        # Tri numérique (stable pour garder l'ordre du log à timestamp égal)
+        order = np.argsort(epoch, kind='stable')
+        epoch = epoch[order]
+
+        # Durée et intervalle d'échantillonnage en une passe (la date est gardée : passage de minuit OK)
+        if len(epoch):
+            duration = pd.Timedelta(int(epoch[-1] - epoch[0]), unit='ns')
+            intervals = np.diff(epoch)
+            sample_interval = pd.Timedelta(int(np.median(intervals)), unit='ns') if len(intervals) else pd.Timedelta(0)
+        else:
+            duration = pd.Timedelta(0)
+            sample_interval = pd.Timedelta(0)
+
+        return valid[order], epoch, duration, sample_interval
+
+    def build_session(self, df, file_path=None, dtype=np.float32, instrument=NULL_INSTRUMENTATION):
+        # DataFrame nettoyée -> Session compacte, colonnes copiées une seule fois (déjà triées)
+        with instrument.stage("horodatages") as stage:
+            with instrument.stage("décodage"):
+                times = self.to_datetime_column(df['Timestamp'])
+            with instrument.stage("tri"):
+                index, epoch, duration, sample_interval = self.sort_timestamps(times)
+            stage.rows(len(df), len(index))
+            stage.dropped(DROP_INVALID_TIMESTAMP, len(df) - len(index))
+
+        with instrument.stage("colonnes session") as stage:
+            arrays = [pd.to_numeric(df[col], errors='coerce').to_numpy() for col in METRIC_COLUMNS]
+            session = Session.from_columns(METRIC_COLUMNS, arrays, index, epoch, dtype=dtype)
+            stage.rows(len(df), len(session))
+        session.meta = {
+            'source': str(file_path) if file_path is not None else None,
+            'duration': duration,
+            'sample_interval': sample_interval,
+            'rows': len(index),
+        }
+        return session, duration
+
+    def to_datetime_column(self, series):
+        # Fast path : déjà typé datetime (lecteur texte), rien à nettoyer
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+
+        # Décodage vectorisé du format Afterburner 'dd-mm-YYYY HH:MM:SS'
+        raw = series.to_numpy(dtype=str)
+        times = pd.Series(parse_timestamps(np.char.strip(raw)), index=series.index)
+
+        # Le reste (espaces multiples, formats bizarres) passe par le nettoyage complet
+        failed = times.isna() & series.notna()
+        if failed.any():
+            # Nettoyage : str, strip, normalize spaces
+            cleaned = series[failed].astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
+            times[failed] = pd.to_datetime(cleaned, format='%d-%m-%Y %H:%M:%S', errors='coerce')
+            # Cellules date de l'Excel (t="d") : ISO 8601 ('2025-11-20T22:19:20')
+            iso = failed & times.isna() & series.astype(str).str.match(r'\s*\d{4}-\d{2}-\d{2}[T ]\d')
+            if iso.any():
+                times[iso] = pd.to_datetime(series[iso].astype(str).str.strip(), errors='coerce')
+
+        return times
+
     def calculateOnePercentLow(self, df, columns=None):
+        # df : DataFrame ou Session ; percentile 1 par sélection (np.partition), sans tri complet
         results = {}
         if columns is None:
             columns = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
 
         for col_name in columns:
             if col_name in df.columns:
-                series = pd.to_numeric(df[col_name], errors='coerce')
-                sorted_series = series.sort_values(ascending=True).dropna()
-                if len(sorted_series) >= 5:  # Baissé à 5 pour petits datasets
-                    one_percent_low = sorted_series.quantile(0.01)
-                else:
-                    one_percent_low = 'N/A (pas assez de données)'
+                values = pd.to_numeric(pd.Series(df[col_name]), errors='coerce').to_numpy(dtype=np.float64)
+                low = nan_percentiles(values, {'1% low': PERCENTILES['1% low']})['1% low'][0]
+                one_percent_low = float(low) if not np.isnan(low) else 'N/A (pas assez de données)'
             else:
                 one_percent_low = 'N/A (colonne absente)'
             results[col_name] = one_percent_low
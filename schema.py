@@ -0,0 +1,148 @@
+# schema.py
+# Disposition des colonnes des logs Afterburner, déduite de la ligne d'en-tête (code 02)
+# au lieu de positions codées en dur.
+#
+# Un LogLayout associe des noms de capteurs Afterburner (en minuscules, sans espaces autour)
+# aux colonnes internes. resolve_header() essaie chaque disposition enregistrée et garde
+# celle qui reconnaît le plus de métriques ; sans en-tête exploitable, on retombe sur la
+# disposition positionnelle historique de l'export Excel (métriques en colonnes 2 à 7).
+#
+# Les métriques que l'en-tête ne nomme pas sont lues comme NaN (N/A) : ColumnMapping.summary()
+# part dans les stats ('Colonnes') et les diagnostics, et la vue avertit si l'une manque.
+#
+# Le ColumnMapping obtenu donne les seules colonnes à lire (projection) : les lecteurs
+# (afterburner_log.py pour le texte, StatsModel.iter_raw_chunks pour l'Excel) ne
+# convertissent que celles-là, directement dans leur type final.
+import numpy as np
+
+# Colonnes métriques, dans l'ordre de l'export Excel (noms repris tels quels, espace compris)
+METRIC_COLUMNS = ['GPU temperature', 'GPU usage', 'Core clock ', 'Temp over limit', 'CPU usage', 'Framerate']
+METRIC_PARSE_DTYPE = np.float64  # type des métriques à la lecture (float32 seulement dans la Session)
+REQUIRED_METRICS = ['Framerate']  # sans elles, l'analyse n'a pas de sens (saccades, 1% low...)
+
+ACTION_FIELD = 0  # positions dans une ligne complète : code de ligne, horodatage, puis capteurs
+TIMESTAMP_FIELD = 1
+FIRST_METRIC_FIELD = 2
+
+
+class LogLayout:
+    __slots__ = ('name', 'aliases')
+
+    def __init__(self, name, aliases):
+        self.name = name
+        self.aliases = {key.strip().lower(): metric for key, metric in aliases.items()}
+
+    def match(self, names):
+        # Noms des capteurs (champs après l'horodatage) -> {métrique: position}
+        positions = {}
+        for i, name in enumerate(names):
+            if not isinstance(name, str):
+                continue
+            metric = self.aliases.get(name.strip().lower())
+            if metric is not None and metric not in positions:
+                positions[metric] = i
+        return positions
+
+
+class ColumnMapping:
+    __slots__ = ('layout', 'positions')
+
+    def __init__(self, layout, positions):
+        self.layout = layout  # nom de la disposition reconnue
+        self.positions = positions  # {métrique: position parmi les capteurs}
+
+    @property
+    def metric_fields(self):
+        # {métrique: position dans la ligne complète}
+        return {metric: FIRST_METRIC_FIELD + pos for metric, pos in self.positions.items()}
+
+    @property
+    def fields(self):
+        # Positions à lire dans une ligne complète, triées (code, horodatage, métriques trouvées)
+        return sorted({ACTION_FIELD, TIMESTAMP_FIELD, *self.metric_fields.values()})
+
+    @property
+    def missing(self):
+        return [metric for metric in METRIC_COLUMNS if metric not in self.positions]
+
+    @property
+    def missing_required(self):
+        return [metric for metric in REQUIRED_METRICS if metric not in self.positions]
+
+    def summary(self):
+        # -> stats['Colonnes'] (export, diagnostics, avertissement de la vue)
+        return {'disposition': self.layout, 'manquantes': self.missing, 'requises manquantes': self.missing_required}
+
+    def __repr__(self):
+        return f"ColumnMapping({self.layout!r}, {self.positions!r})"
+
+
+AFTERBURNER = LogLayout('afterburner', {
+    'GPU temperature': 'GPU temperature',
+    'GPU usage': 'GPU usage',
+    'Core clock': 'Core clock ',
+    'Temp limit': 'Temp over limit',
+    'Temp over limit': 'Temp over limit',
+    'CPU usage': 'CPU usage',
+    'Framerate': 'Framerate',
+})
+
+# Machines multi-GPU : capteurs préfixés 'GPU1 ', 'GPU2 '... ; on suit le premier GPU
+AFTERBURNER_MULTI_GPU = LogLayout('afterburner-multi-gpu', {
+    'GPU1 temperature': 'GPU temperature',
+    'GPU1 usage': 'GPU usage',
+    'GPU1 core clock': 'Core clock ',
+    'GPU1 temp limit': 'Temp over limit',
+    'CPU usage': 'CPU usage',
+    'Framerate': 'Framerate',
+})
+
+LAYOUTS = [AFTERBURNER, AFTERBURNER_MULTI_GPU]
+
+# Export Excel historique, sans en-tête exploitable : métriques en colonnes 2 à 7
+POSITIONAL = ColumnMapping('positionnel', {metric: i for i, metric in enumerate(METRIC_COLUMNS)})
+
+
+def register_layout(layout):
+    # Les dispositions ajoutées passent avant les dispositions intégrées à score égal
+    LAYOUTS.insert(0, layout)
+    return layout
+
+
+def resolve_header(names, layouts=None):
+    # Noms des capteurs (ligne 02, après l'horodatage) -> ColumnMapping, ou None si aucun reconnu
+    best = None
+    for layout in layouts if layouts is not None else LAYOUTS:
+        positions = layout.match(names)
+        if positions and (best is None or len(positions) > len(best.positions)):
+            best = ColumnMapping(layout.name, positions)
+    return best
+
+
+def find_header(rows):
+    # Premières lignes d'une feuille (tuples de cellules) -> ColumnMapping ; positionnel par défaut
+    for row in rows:
+        if row and _is_header_code(row[ACTION_FIELD]):
+            mapping = resolve_header(row[FIRST_METRIC_FIELD:])
+            if mapping is not None:
+                return mapping
+    return POSITIONAL
+
+
+def missing_columns_warning(summary):
+    # stats['Colonnes'] -> message d'avertissement, ou None si toutes les métriques sont présentes
+    if not summary or not summary.get('manquantes'):
+        return None
+    message = (f"Colonnes absentes du log (disposition '{summary['disposition']}') : "
+               f"{', '.join(name.strip() for name in summary['manquantes'])}. Leurs stats sont affichées N/A.")
+    if summary.get('requises manquantes'):
+        message += (f"\nMétrique indispensable absente : {', '.join(summary['requises manquantes'])}. "
+                    "Le format du log a peut-être changé : voir schema.register_layout.")
+    return message
+
+
+def _is_header_code(value):
+    try:
+        return int(float(value)) == 2
+    except (TypeError, ValueError):
+        return False
@@ -0,0 +1,424 @@
+# service.py
+# Mode service local : une instance partagée (équipe, CI) au lieu d'une appli Tk par personne.
+#
+#   python service.py --port 8765 --workers 4 --queue 16 --root C:/logs
+#
+#   POST /analyze    {"path": "C:/logs/run.hml", "series": "parquet", "window": "60s", "segments": "..."}
+#                    (chemins sous --root uniquement ; sans --root, seul l'envoi du log est accepté)
+#                    ou le log lui-même en corps brut : POST /analyze?name=run.hml[&series=csv]
+#                    -> 200 {"file", "stats" (export JSON de l'appli), "seconds", "deduplicated", "series"...}
+#                       503 + Retry-After si la file est pleine, 422 si l'analyse échoue,
+#                       413 si le corps dépasse MAX_JSON_BYTES (JSON) ou MAX_UPLOAD_BYTES (log)
+#   GET  /series/<nom>  série nettoyée écrite par une requête avec "series"
+#   GET  /metrics       file d'attente, latences (p50 / p95 / p99), débit
+#   GET  /health
+#
+# Les analyses tournent dans un pool de processus borné (batch.analyze_file) avec un cache
+# disque commun (stats_cache.py) : un log déjà vu n'est pas re-parsé. Les requêtes simultanées
+# sur le même contenu (même hash, mêmes options) partagent une seule analyse. Au-delà de
+# max_pending analyses en file ou en cours, les nouvelles requêtes sont refusées (503) plutôt
+# que d'accumuler du travail.
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from batch import analyze_file
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_PENDING = 16
+REQUEST_TIMEOUT = 600.0  # secondes d'attente max d'une analyse avant 504
+MAX_UPLOAD_BYTES = 4 * 1024 ** 3
+UPLOAD_BLOCK_BYTES = 1 << 20
+DISCARD_BYTES = 1 << 16  # corps refusé (503) lu et jeté en dessous de cette taille, sinon connexion coupée
+MAX_JSON_BYTES = DISCARD_BYTES  # requête JSON (chemin + options) : quelques centaines d'octets en pratique
+LATENCY_SAMPLES = 1000  # latences gardées pour les percentiles de /metrics
+THROUGHPUT_WINDOW = 60.0  # secondes
+RETRY_AFTER_SECONDS = 2
+SERIES_FORMATS = ('parquet', 'arrow', 'csv')
+
+BUSY_MESSAGE = "Service saturé : trop d'analyses en attente, réessayer plus tard."
+BROKEN_MESSAGE = "Pool d'analyse indisponible, réessayer plus tard."
+
+
+class ServiceBusy(Exception):
+    pass
+
+
+class AnalysisService:
+    def __init__(self, workers=None, max_pending=DEFAULT_MAX_PENDING, work_dir=None, cache_dir=None, root=None):
+        from stats_cache import StatsCache, default_cache_dir
+
+        self.max_pending = max_pending
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix='gsa-service-')
+        self.upload_dir = os.path.join(self.work_dir, 'uploads')
+        self.series_dir = os.path.join(self.work_dir, 'series')
+        os.makedirs(self.upload_dir, exist_ok=True)
+        os.makedirs(self.series_dir, exist_ok=True)
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.root = os.path.realpath(root) if root else None  # dossier des logs analysables par chemin
+        # Empreintes des fichiers (taille + mtime avant de hasher), partagées sur disque avec les workers :
+        # un log hashé ici pour la clé de requête n'est pas relu par le worker pour la clé du cache
+        self._hasher = StatsCache(max_entries=0, cache_dir=self.cache_dir)
+
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._lock = threading.Lock()
+        self._inflight = {}  # clé (contenu + options) -> Future partagé
+        self._reserved = 0  # uploads en cours de réception, comptés dans max_pending
+
+        self.started = time.monotonic()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.deduplicated = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._finished_at = deque()
+
+    # === SOUMISSION ===
+    def allowed_path(self, path):
+        # Mode chemin : -> chemin réel si path est sous root (liens et '..' résolus), sinon None.
+        # Chemin relatif : relatif à root
+        if self.root is None or not isinstance(path, str) or not path:
+            return None
+        real = os.path.realpath(os.path.join(self.root, path))
+        try:
+            inside = os.path.commonpath([real, self.root]) == self.root
+        except ValueError:  # autre lecteur (Windows)
+            inside = False
+        return real if inside else None
+
+    def job_key(self, digest, options):
+        return digest + '-' + hashlib.sha256(repr(sorted(options.items())).encode()).hexdigest()[:16]
+
+    @contextmanager
+    def reservation(self):
+        # Place réservée dans la file avant de recevoir un upload : ServiceBusy si la file est pleine,
+        # sans avoir lu le corps de la requête. Dans le bloc : submit(..., reserved=True)
+        with self._lock:
+            if len(self._inflight) + self._reserved >= self.max_pending:
+                self.rejected += 1
+                raise ServiceBusy(BUSY_MESSAGE)
+            self._reserved += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._reserved -= 1
+
+    def submit(self, file_path, options=None, digest=None, on_done=None, reserved=False):
+        # -> (Future, partagé) ; ServiceBusy si la file est pleine. options : window, segments, series.
+        # on_done(Future) : appelé une fois l'analyse terminée (ex : suppression d'un upload)
+        # reserved : appel depuis reservation(), sa place est déjà comptée
+        options = dict(options or {})
+        digest = digest or self._hasher.content_hash(file_path)
+        key = self.job_key(digest, options)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                return future, True
+            if len(self._inflight) + self._reserved - reserved >= self.max_pending:
+                self.rejected += 1
+                raise ServiceBusy(BUSY_MESSAGE)
+
+            series = options.get('series')
+            series_path = os.path.join(self.series_dir, f"{key}.{series}") if series else None
+            args = (analyze_file, file_path, False, False, False, options.get('window'), options.get('segments'),
+                    series_path, self.cache_dir)
+            try:
+                future = self._pool.submit(*args)
+            except BrokenProcessPool:
+                # Un worker a été tué (mémoire, segfault) : le pool est inutilisable, on le remplace
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                try:
+                    future = self._pool.submit(*args)
+                except BrokenProcessPool:
+                    raise ServiceBusy(BROKEN_MESSAGE)
+            self._inflight[key] = future
+
+        def finished(done):
+            with self._lock:
+                self._inflight.pop(key, None)
+            if on_done is not None:
+                on_done(done)
+
+        future.add_done_callback(finished)
+        return future, False
+
+    def store_upload(self, stream, length, name):
+        # Corps de requête -> fichier dans upload_dir (par blocs, hashé au passage) ; -> (chemin, hash)
+        ext = os.path.splitext(name)[1].lower() or '.hml'
+        h = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.upload_dir, suffix=ext)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                remaining = length
+                while remaining > 0:
+                    block = stream.read(min(UPLOAD_BLOCK_BYTES, remaining))
+                    if not block:
+                        raise ValueError("Corps de requête incomplet.")
+                    h.update(block)
+                    f.write(block)
+                    remaining -= len(block)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path, h.hexdigest()
+
+    # === MESURES ===
+    def record(self, seconds, ok):
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self._latencies.append(seconds)
+            now = time.monotonic()
+            self._finished_at.append(now)
+            while self._finished_at and self._finished_at[0] < now - THROUGHPUT_WINDOW:
+                self._finished_at.popleft()
+
+    def metrics(self):
+        with self._lock:
+            futures = list(self._inflight.values())
+            latencies = sorted(self._latencies)
+            now = time.monotonic()
+            recent = sum(1 for t in self._finished_at if t >= now - THROUGHPUT_WINDOW)
+            uptime = now - self.started
+            # ProcessPoolExecutor passe aussi à "running" les futures déjà mis dans sa file d'appel
+            # (workers + 1) : plafonné au nombre de workers, le surplus est compté en file
+            running = min(sum(1 for f in futures if f.running()), self.workers)
+            return {
+                'queue_depth': len(futures) - running,
+                'running': running,
+                'receiving': self._reserved,
+                'max_pending': self.max_pending,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'deduplicated': self.deduplicated,
+                'latency_seconds': {name: _percentile(latencies, q) for name, q in
+                                    (('p50', 50), ('p95', 95), ('p99', 99))},
+                'throughput_per_minute': recent * 60.0 / min(THROUGHPUT_WINDOW, max(uptime, 1e-9)),
+                'uptime_seconds': uptime,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def parse_options(values):
+    # Paramètres de requête (JSON ou query string) -> options d'analyse ; ValueError si invalides
+    from windowing import parse_ranges
+
+    options = {}
+    window = values.get('window')
+    if window:
+        options['window'] = int(window) if str(window).isdigit() else str(window)
+    if values.get('segments'):
+        options['segments'] = parse_ranges(str(values['segments']))
+    series = values.get('series')
+    if series:
+        if series not in SERIES_FORMATS:
+            raise ValueError(f"Format de série non supporté : {series}")
+        options['series'] = series
+    return options
+
+
+# === HTTP ===
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None  # AnalysisService, fixé par make_server
+    timeout_seconds = REQUEST_TIMEOUT
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        elif url.path == '/metrics':
+            self.send_json(200, self.service.metrics())
+        elif url.path.startswith('/series/'):
+            self.send_series(unquote(url.path[len('/series/'):]))
+        else:
+            self.send_json(404, {'error': "Ressource inconnue."})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/analyze':
+            self.send_json(404, {'error': "Ressource inconnue."})
+            return
+        start = time.perf_counter()
+        cleanup = None
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if self.headers.get_content_type() == 'application/json':
+                if length > MAX_JSON_BYTES:
+                    self.skip_body(length)
+                    self.send_json(413, {'error': "Requête JSON trop volumineuse."})
+                    return
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(request, dict):
+                    self.send_json(400, {'error': "Corps JSON invalide : objet attendu."})
+                    return
+                name = request.get('path')
+                if self.service.root is None:
+                    self.send_json(403, {'error': "Analyse par chemin désactivée (service lancé sans --root)."})
+                    return
+                file_path = self.service.allowed_path(name)
+                if file_path is None:
+                    self.send_json(403, {'error': f"Chemin hors du dossier autorisé : {name}"})
+                    return
+                if not os.path.isfile(file_path):
+                    self.send_json(400, {'error': f"Fichier introuvable : {name}"})
+                    return
+                future, shared = self.service.submit(file_path, parse_options(request))
+            else:
+                # Log envoyé tel quel dans le corps de la requête ; place réservée dans la file avant
+                # de le recevoir : service saturé -> 503 sans lire (ni écrire sur disque) le corps
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                name = query.get('name', 'upload.hml')
+                if not 0 < length <= MAX_UPLOAD_BYTES:
+                    self.skip_body(length)
+                    self.send_json(413 if length else 400, {'error': "Taille du log envoyé invalide."})
+                    return
+                receiving = False
+                try:
+                    options = parse_options(query)
+                    with self.service.reservation():
+                        receiving = True
+                        file_path, digest = self.service.store_upload(self.rfile, length, name)
+                        cleanup = file_path
+                        future, shared = self.service.submit(file_path, options, digest,
+                                                             on_done=lambda _: _remove(cleanup), reserved=True)
+                except Exception:
+                    if cleanup:
+                        _remove(cleanup)
+                    if not receiving:
+                        self.skip_body(length)
+                    raise
+        except ServiceBusy as e:
+            self.send_json(503, {'error': str(e)}, {'Retry-After': str(RETRY_AFTER_SECONDS)})
+            return
+        except (ValueError, OSError) as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        if shared and cleanup:
+            _remove(cleanup)  # même contenu déjà en cours d'analyse, depuis son propre fichier
+
+        try:
+            outcome = future.result(timeout=self.timeout_seconds)
+        except TimeoutError:
+            self.send_json(504, {'error': "Analyse trop longue, réessayer plus tard."})
+            return
+        except Exception as e:  # crash du worker : réponse d'erreur, le service continue
+            outcome = {'ok': False, 'error': f"Erreur du worker : {e}", 'seconds': None}
+
+        latency = time.perf_counter() - start
+        self.service.record(latency, outcome['ok'])
+        if not outcome['ok']:
+            self.send_json(422, {'file': name, 'error': outcome['error']})
+            return
+        response = {'file': name, 'stats': json.loads(outcome['export']), 'seconds': outcome['seconds'],
+                    'latency': latency, 'deduplicated': shared}
+        if outcome.get('series'):
+            response['series'] = '/series/' + os.path.basename(outcome['series'])
+        elif outcome.get('series_error'):
+            response['series_error'] = outcome['series_error']
+        self.send_json(200, response)
+
+    def skip_body(self, length):
+        # Réponse envoyée sans lire le corps : un petit corps est lu et jeté (connexion propre),
+        # un gros n'est pas reçu du tout, la connexion est fermée après la réponse
+        self.close_connection = True
+        if 0 < length <= DISCARD_BYTES:
+            self.rfile.read(length)
+
+    def send_series(self, name):
+        path = os.path.join(self.service.series_dir, os.path.basename(name))
+        if not name or not os.path.isfile(path):
+            self.send_json(404, {'error': "Série inconnue."})
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv' if path.endswith('.csv') else 'application/octet-stream')
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, indent=4, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # pas de log par requête sur stderr (voir /metrics)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def make_server(service, host='127.0.0.1', port=DEFAULT_PORT, timeout=REQUEST_TIMEOUT):
+    handler = type('BoundServiceHandler', (ServiceHandler,), {'service': service, 'timeout_seconds': timeout})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service local d'analyse de logs MSI Afterburner")
+    parser.add_argument('--host', default='127.0.0.1', help="adresse d'écoute (défaut : locale uniquement)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-w', '--workers', type=int, default=None, help="processus d'analyse (défaut : nb de coeurs)")
+    parser.add_argument('--queue', type=int, default=DEFAULT_MAX_PENDING,
+                        help="analyses en file ou en cours au-delà desquelles les requêtes sont refusées (503)")
+    parser.add_argument('--root', help="dossier des logs analysables par chemin (défaut : aucun, envoi seulement)")
+    parser.add_argument('--work-dir', help="dossier des logs envoyés et des séries (défaut : temporaire)")
+    parser.add_argument('--cache-dir', help="cache disque des résultats (défaut : cache de l'appli)")
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT, help="attente max d'une analyse (s)")
+    args = parser.parse_args(argv)
+
+    service = AnalysisService(args.workers, args.queue, args.work_dir, args.cache_dir, args.root)
+    server = make_server(service, args.host, args.port, args.timeout)
+    print(f"Service d'analyse sur http://{args.host}:{server.server_port} (Ctrl+C pour arrêter)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# session.py
+# Représentation compacte d'une session nettoyée, à la place d'une copie de DataFrame :
+#   - values     : tableau float32 (n_métriques, n_lignes), une ligne par métrique, C-contigu
+#   - timestamps : int64, nanosecondes depuis epoch, triés
+#   - stats      : dict de stats (même format que compute_stats)
+#   - meta       : petit dict (fichier source, durée, intervalle d'échantillonnage...)
+# ~32 octets par échantillon contre ~125 pour l'ancienne DataFrame (timestamps en chaînes 'HH:MM:SS').
+import numpy as np
+
+METRIC_DTYPE = np.float32
+TIMESTAMP_DTYPE = np.int64
+
+
+class Session:
+    __slots__ = ('columns', 'values', 'timestamps', 'stats', 'meta')
+
+    def __init__(self, columns, values, timestamps, stats=None, meta=None):
+        self.columns = tuple(columns)
+        self.values = values
+        self.timestamps = timestamps
+        self.stats = stats if stats is not None else {}
+        self.meta = meta if meta is not None else {}
+
+    @classmethod
+    def from_columns(cls, columns, arrays, index, timestamps, meta=None, dtype=METRIC_DTYPE):
+        # Remplit directement le tableau 2D : chaque colonne est lue via `index`
+        # (lignes gardées, dans l'ordre chronologique) sans DataFrame intermédiaire
+        values = np.empty((len(columns), len(index)), dtype=dtype)
+        for i, array in enumerate(arrays):
+            values[i] = np.asarray(array)[index]
+        return cls(columns, values, np.asarray(timestamps, dtype=TIMESTAMP_DTYPE), meta=meta)
+
+    def astype(self, dtype=METRIC_DTYPE):
+        # Ex : session float64 de calcul -> session float32 gardée en mémoire
+        return Session(self.columns, self.values.astype(dtype), self.timestamps, self.stats, dict(self.meta))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        # session['Framerate'] -> vue float32 (pas de copie)
+        return self.values[self.columns.index(name)]
+
+    def elapsed_seconds(self):
+        if not len(self.timestamps):
+            return np.array([], dtype=np.float64)
+        return (self.timestamps - self.timestamps[0]) / 1e9
+
+    def datetimes(self):
+        return self.timestamps.view('datetime64[ns]')
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.timestamps.nbytes
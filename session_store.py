@@ -0,0 +1,157 @@
+# session_store.py
+# Stockage colonnaire d'une session nettoyée (.gsa), rouvert sans copie via np.memmap.
+#
+# Format (petit-boutiste) :
+#   MAGIC (8 octets) | version (uint32) | taille de l'en-tête (uint32) | en-tête JSON (utf-8)
+#   puis les tableaux bruts, chacun aligné sur ALIGNMENT octets (une page) :
+#     values     : (n_métriques, n) dans le dtype de la session (float32), C-contigu
+#     timestamps : (n,) int64, ns depuis epoch
+#     + tableaux annexes optionnels (moyenne glissante, événements...), nommés librement
+# L'en-tête porte les colonnes, la position / forme / dtype de chaque tableau, la meta et les
+# stats de la session (Timedelta encodés en ns). À la réouverture, seul l'en-tête est lu :
+# les tableaux sont des vues en lecture seule sur le fichier, les pages sont chargées par
+# l'OS à la demande (stats, graphiques et exports travaillent directement dessus).
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from session import Session
+
+MAGIC = b'GSASTORE'
+STORE_VERSION = 1
+STORE_EXTENSION = '.gsa'
+ALIGNMENT = 4096
+WRITE_BLOCK_BYTES = 64 * 1024 * 1024
+_PREFIX = struct.Struct('<8sII')
+
+
+class SessionStoreError(ValueError):
+    pass
+
+
+def is_session_store(file_path):
+    return os.path.splitext(str(file_path))[1].lower() == STORE_EXTENSION
+
+
+def save_session(session, path, extras=None):
+    # Écriture atomique (fichier temporaire puis remplacement) ; extras : {nom: tableau}
+    arrays = {'values': np.ascontiguousarray(session.values),
+              'timestamps': np.ascontiguousarray(session.timestamps)}
+    for name, array in (extras or {}).items():
+        if name in arrays:
+            raise SessionStoreError(f"Nom de tableau réservé : {name}")
+        arrays[name] = np.ascontiguousarray(array)
+
+    entries = {name: {'dtype': array.dtype.newbyteorder('<').str, 'shape': list(array.shape)}
+               for name, array in arrays.items()}
+    header = {'columns': list(session.columns), 'arrays': entries,
+              'meta': _encode(session.meta), 'stats': _encode(session.stats)}
+    # Les positions dépendent de la taille de l'en-tête, qui dépend des positions : on la
+    # réserve arrondie à la page supérieure, et on recommence si elle ne suffit pas
+    reserved = ALIGNMENT
+    while True:
+        offset = _align(_PREFIX.size + reserved)
+        for name, array in arrays.items():
+            entries[name]['offset'] = offset
+            offset = _align(offset + array.nbytes)
+        blob = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        if len(blob) <= reserved:
+            break
+        reserved = _align(len(blob))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PREFIX.pack(MAGIC, STORE_VERSION, len(blob)))
+            f.write(blob)
+            for name, array in arrays.items():
+                f.seek(entries[name]['offset'])
+                _write_array(f, array.astype(entries[name]['dtype'], copy=False))
+            f.truncate(offset)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise SessionStoreError("Fichier de session tronqué.")
+        magic, version, size = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise SessionStoreError("Ce fichier n'est pas une session enregistrée.")
+        if version != STORE_VERSION:
+            raise SessionStoreError(f"Version de session non supportée : {version}")
+        blob = f.read(size)
+    try:
+        return json.loads(blob.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        raise SessionStoreError("En-tête de session illisible.")
+
+
+def open_session(path, mode='r'):
+    # -> (Session, {nom: tableau annexe}) ; tableaux mappés, rien n'est lu en dehors de l'en-tête
+    header = read_header(path)
+    file_size = os.path.getsize(path)
+    arrays = {}
+    for name, entry in header['arrays'].items():
+        dtype, shape, offset = np.dtype(entry['dtype']), tuple(entry['shape']), entry['offset']
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        if offset + nbytes > file_size:
+            raise SessionStoreError("Fichier de session tronqué.")
+        if nbytes == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)  # np.memmap refuse les tableaux vides
+        else:
+            arrays[name] = np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+
+    session = Session(header['columns'], arrays.pop('values'), arrays.pop('timestamps'),
+                      _decode(header['stats']), _decode(header['meta']))
+    return session, arrays
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _write_array(f, array):
+    # Par blocs : pas de copie complète d'une session de plusieurs Go
+    flat = array.reshape(-1)
+    step = max(WRITE_BLOCK_BYTES // max(array.itemsize, 1), 1)
+    for start in range(0, len(flat), step):
+        f.write(flat[start:start + step].tobytes())
+
+
+# === EN-TÊTE : stats / meta <-> JSON ===
+def _encode(value):
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, pd.Timedelta):
+        return {'__timedelta__': int(value.value)}
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if set(value) == {'__timedelta__'}:
+            return pd.Timedelta(value['__timedelta__'], unit='ns')
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
@@ -1,36 +1,52 @@
 # splash.py
+# Barre d'état de démarrage, en bas de la fenêtre principale, pilotée par le vrai préchargement
+# des modules (voir startup.py) : la barre avance à chaque module importé, plus de fausse animation.
+# Pas de fenêtre par-dessus : les boutons restent visibles et utilisables pendant le préchargement.
+import queue
 import tkinter as tk
 from tkinter import ttk
-import time
-import threading
 
-def show_splash(root, on_finish):
-    splash = tk.Toplevel(root)
-    splash.configure(bg="#0d1117")
-    splash.overrideredirect(True)  # sans bordure
-    splash.geometry(f"500x300+{root.winfo_screenwidth()//2-250}+{root.winfo_screenheight()//2-150}")
-    splash.lift()
-    splash.attributes("-topmost", True)
+from startup import warm_up
 
-    # Titre
-    tk.Label(splash, text="Game Stats Analyzer", font=("Segoe UI", 28, "bold"),
-             fg="#58a6ff", bg="#0d1117").pack(pady=60)
+POLL_INTERVAL_MS = 30
 
-    # Sous-titre
-    tk.Label(splash, text="Chargement des modules...", font=("Segoe UI", 12),
-             fg="#8b949e", bg="#0d1117").pack(pady=10)
+
+def show_startup_status(root, timer, on_finish):
+    bar = tk.Frame(root, bg="#161b22")
+    slaves = root.pack_slaves()
+    bar.pack(side="bottom", fill="x", **({'before': slaves[0]} if slaves else {}))
+
+    # Module en cours de chargement
+    status = tk.Label(bar, text="Chargement des modules...", font=("Segoe UI", 10),
+                      fg="#8b949e", bg="#161b22")
+    status.pack(side="left", padx=15, pady=6)
 
     # Barre de progression
-    progress = ttk.Progressbar(splash, length=300, mode="determinate")
-    progress.pack(pady=30)
-
-    # Animation
-    def animate():
-        for i in range(101):
-            progress['value'] = i
-            splash.update()
-            time.sleep(0.03)
-        splash.destroy()
-        on_finish()  # lance l’app principale
-
-    threading.Thread(target=animate, daemon=True).start()
\ No newline at end of file
+    progress = ttk.Progressbar(bar, length=200, mode="determinate")
+    progress.pack(side="right", padx=15, pady=6)
+
+    # Le préchargement tourne dans un thread ; on relit ses événements depuis le thread Tk
+    events = queue.Queue()
+    warm_up(timer,
+            on_progress=lambda name, fraction: events.put(('progress', name, fraction)),
+            on_done=lambda errors: events.put(('done', errors)))
+
+    def poll():
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'progress':
+                _, name, fraction = event
+                progress['value'] = fraction * 100
+                if name:
+                    status.config(text=f"Chargement de {name}...")
+            else:
+                bar.destroy()
+                on_finish(event[1])
+                return
+        bar.after(POLL_INTERVAL_MS, poll)
+
+    bar.after(POLL_INTERVAL_MS, poll)
+    return bar
@@ -0,0 +1,140 @@
+# startup.py
+# Démarrage rapide : la fenêtre s'affiche tout de suite, les modules lourds (pandas, matplotlib...)
+# sont importés en arrière-plan, et on mesure le tout.
+#
+#   python main.py --startup-report
+#
+# affiche, une fois le préchargement terminé, les jalons (fenêtre affichée, préchargement fini)
+# et le détail des imports à la manière de `python -X importtime` (self / cumulé, en µs).
+import importlib
+import sys
+import threading
+import time
+
+# Modules préchargés, dans l'ordre (les premiers sont les plus lourds et servent aux suivants)
+WARM_UP_MODULES = [
+    'numpy',
+    'pandas',
+    'openpyxl',
+    'matplotlib.figure',
+    'matplotlib.backends.backend_tkagg',
+    'model',
+    'stats_cache',
+    'downsampling',
+]
+
+
+class _TimedLoader:
+    # Enveloppe d'un loader : chronomètre exec_module, délègue tout le reste
+    def __init__(self, loader, timer, name):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave(self._name)
+            # Le module garde son vrai loader (importlib.resources, reload...)
+            module.__loader__ = self._loader
+            if getattr(module, '__spec__', None) is not None:
+                module.__spec__.loader = self._loader
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class ImportTimer:
+    # Finder placé en tête de sys.meta_path le temps du préchargement : pour chaque module
+    # réellement chargé, temps "self" (hors sous-imports) et cumulé, comme -X importtime.
+    def __init__(self):
+        self.records = []  # (profondeur, nom, self_us, cumulé_us) dans l'ordre de fin de chargement
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def find_spec(self, name, path=None, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self, name)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    def enter(self, name):
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def leave(self, name):
+        stack = self._stack()
+        _, start, children = stack.pop()
+        cumulative = time.perf_counter() - start
+        self.records.append((len(stack), name, (cumulative - children) * 1e6, cumulative * 1e6))
+        if stack:
+            stack[-1][2] += cumulative
+
+    def __enter__(self):
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        return False
+
+
+class StartupTimer:
+    def __init__(self, t0=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.marks = []
+        self.import_timer = ImportTimer()
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - self.t0))
+
+    def report(self):
+        lines = ["=== Démarrage ==="]
+        for label, seconds in self.marks:
+            lines.append(f"{seconds * 1000:9.1f} ms  {label}")
+        lines.append("")
+        lines.append("import time: self [us] | cumulative | imported package")
+        for depth, name, self_us, cumulative_us in self.import_timer.records:
+            lines.append(f"import time: {self_us:9.0f} | {cumulative_us:10.0f} | {'  ' * depth}{name}")
+        return "\n".join(lines)
+
+
+def warm_up(timer, on_progress, on_done, modules=WARM_UP_MODULES):
+    # Thread d'arrière-plan : importe les modules un par un.
+    # on_progress(nom, fraction) / on_done(erreurs) sont appelés DEPUIS CE THREAD.
+    def run():
+        errors = []
+        with timer.import_timer:
+            for i, name in enumerate(modules):
+                on_progress(name, i / len(modules))
+                try:
+                    importlib.import_module(name)
+                except Exception as e:  # le module sera ré-importé (et l'erreur affichée) à l'usage
+                    errors.append((name, e))
+        timer.mark("préchargement des modules terminé")
+        on_progress(None, 1.0)
+        on_done(errors)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
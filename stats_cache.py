@@ -0,0 +1,247 @@
+# stats_cache.py
+# Cache des résultats de StatsModel.compute_stats
+#   - clé = hash du contenu du fichier + paramètres de nettoyage
+#     (taille + mtime servent de pré-check pour ne pas re-hasher un fichier inchangé ; ces empreintes
+#     sont aussi gardées sur disque, pour qu'un nouveau process ne relise pas un gros log pour rien)
+#   - niveau 1 : LRU en mémoire (process courant)
+#   - niveau 2 : fichiers pickle sur disque, taille totale plafonnée, éviction des plus anciens ;
+#     la session (séries nettoyées) est à côté, au format .gsa, et rouverte mappée (session_store.py)
+#     au lieu d'être dé-picklée en entier
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+from session import Session
+from session_store import STORE_EXTENSION, SessionStoreError, open_session, save_session
+
+CACHE_VERSION = 5  # à incrémenter quand le format du résultat change
+HASH_BLOCK_SIZE = 1 << 20
+DEFAULT_MEMORY_ENTRIES = 8
+DEFAULT_DISK_BYTES = 512 * 1024 * 1024
+DISK_EXTENSIONS = ('.pkl', STORE_EXTENSION)
+STORED_SESSION = '_session_store'  # marque un résultat dont la session est dans le .gsa voisin
+FINGERPRINTS_FILE = 'fingerprints.json'  # chemin -> [taille, mtime_ns, hash], partagé entre process
+MAX_FINGERPRINTS = 10_000
+
+
+def default_cache_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'GameStatsAnalyzer', 'cache')
+
+
+class StatsCache:
+    def __init__(self, max_entries=DEFAULT_MEMORY_ENTRIES, cache_dir=None, max_disk_bytes=DEFAULT_DISK_BYTES,
+                 use_disk=True):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_disk_bytes = max_disk_bytes
+        self.use_disk = use_disk
+
+        self._memory = OrderedDict()
+        self._fingerprints = {}  # (chemin, taille, mtime_ns) -> hash du contenu
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # === CLÉS ===
+    def content_hash(self, file_path):
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        fingerprint = (path, st.st_size, st.st_mtime_ns)
+        digest = self._fingerprints.get(fingerprint)
+        if digest is None:
+            stored = self._read_fingerprints().get(path)
+            if stored is not None and (stored[0], stored[1]) == (st.st_size, st.st_mtime_ns):
+                digest = stored[2]  # hashé par un autre process (session précédente, worker...)
+            else:
+                digest = self._hash_file(path)
+                self._write_fingerprint(path, st, digest)
+            # Une seule empreinte par chemin : l'ancienne version du fichier ne sert plus
+            for old in [fp for fp in self._fingerprints if fp[0] == path]:
+                del self._fingerprints[old]
+            self._fingerprints[fingerprint] = digest
+        return digest
+
+    def _hash_file(self, path):
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                h.update(block)
+        return h.hexdigest()
+
+    def _fingerprints_path(self):
+        return os.path.join(self.cache_dir, FINGERPRINTS_FILE)
+
+    def _read_fingerprints(self):
+        if not self.use_disk:
+            return {}
+        try:
+            with open(self._fingerprints_path(), encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return stored if isinstance(stored, dict) else {}
+
+    def _save_fingerprints(self, stored):
+        # Best-effort comme le reste du cache disque ; écriture atomique (tmp + replace)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self._fingerprints_path())
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _write_fingerprint(self, path, st, digest):
+        if not self.use_disk:
+            return
+        stored = self._read_fingerprints()
+        stored.pop(path, None)
+        stored[path] = [st.st_size, st.st_mtime_ns, digest]
+        while len(stored) > MAX_FINGERPRINTS:  # les plus anciennes en premier (ordre d'insertion)
+            del stored[next(iter(stored))]
+        self._save_fingerprints(stored)
+
+    def make_key(self, file_path, params=None):
+        params_repr = repr(sorted((params or {}).items()))
+        params_hash = hashlib.sha256(f"{CACHE_VERSION}:{params_repr}".encode()).hexdigest()[:16]
+        return f"{self.content_hash(file_path)}-{params_hash}"
+
+    # === LECTURE / ÉCRITURE ===
+    def get(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return dict(self._memory[key])
+
+        if self.use_disk:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    result = pickle.load(f)
+                os.utime(path)  # "récemment utilisé" pour l'éviction
+                if result.pop(STORED_SESSION, False):
+                    result['session'], _ = open_session(self._store_path(key))
+                    os.utime(self._store_path(key))
+            except (OSError, pickle.UnpicklingError, EOFError, SessionStoreError):
+                result = None
+            if result is not None:
+                self.disk_hits += 1
+                self._remember(key, result)
+                return dict(result)
+
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        self._remember(key, result)
+        if self.use_disk:
+            try:
+                self._write_disk(key, result)
+            except OSError:
+                pass  # cache disque best-effort : une erreur d'écriture ne doit pas casser le chargement
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _store_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}{STORE_EXTENSION}")
+
+    def _write_disk(self, key, result):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if isinstance(result, dict) and isinstance(result.get('session'), Session):
+            save_session(result['session'], self._store_path(key))
+            result = dict(result, session=None, **{STORED_SESSION: True})
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict_disk()
+
+    def _disk_entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(DISK_EXTENSIONS):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    # === INVALIDATION / COMPTEURS ===
+    def invalidate(self, file_path=None):
+        # Sans argument : vide tout le cache. Sinon : toutes les entrées du contenu actuel du fichier.
+        if file_path is None:
+            self._memory.clear()
+            self._fingerprints.clear()
+            prefix = ''
+        else:
+            prefix = self.content_hash(file_path) + '-'
+            for key in [k for k in self._memory if k.startswith(prefix)]:
+                del self._memory[key]
+            path = os.path.abspath(file_path)
+            for fp in [fp for fp in self._fingerprints if fp[0] == path]:
+                del self._fingerprints[fp]
+
+        if self.use_disk:
+            stored = self._read_fingerprints()
+            if file_path is None:
+                stored.clear()
+            else:
+                stored.pop(os.path.abspath(file_path), None)
+            self._save_fingerprints(stored)
+            for _, _, path in self._disk_entries():
+                if os.path.basename(path).startswith(prefix):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    @property
+    def hits(self):
+        return self.memory_hits + self.disk_hits
+
+    def counters(self):
+        return {
+            'hits': self.hits,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'memory_entries': len(self._memory),
+        }
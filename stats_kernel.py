@@ -0,0 +1,73 @@
+# stats_kernel.py
+# Stats de toutes les métriques en un appel, sur un tableau 2D (n_métriques, n) :
+#   - moyenne / min / max / écart-type : réductions le long de l'axe 1, NaN ignorés
+#     (nansum, fmin / fmax qui sautent les NaN), sans DataFrame ni boucle par colonne
+#   - percentiles : sélection par np.partition (tous les rangs utiles en un appel par métrique)
+#     au lieu d'un tri complet ; interpolation linéaire, comme Series.quantile
+# Utilisé par StatsModel.compute_basic_stats et format_stats_for_display.
+import numpy as np
+
+# Nom -> percentile (0-100) ; les "lows" du framerate sont des percentiles bas
+PERCENTILES = {
+    '1% low': 1.0,
+    '0.1% low': 0.1,
+    'p5': 5.0,
+    'médiane': 50.0,
+    'p95': 95.0,
+    'p99': 99.0,
+}
+MIN_PERCENTILE_SAMPLES = 5  # en dessous, percentiles non significatifs (N/A)
+
+
+def stack_columns(session, columns):
+    # Colonnes demandées présentes dans la session -> (noms, tableau float64 (k, n)), dans l'ordre
+    # de la session : pas de copie si toutes les colonnes sont demandées et déjà en float64
+    present = [col for col in session.columns if col in columns]
+    if len(present) == len(session.columns):
+        stacked = session.values
+    else:
+        stacked = session.values[[session.columns.index(col) for col in present]]
+    return present, np.asarray(stacked, dtype=np.float64).reshape(len(present), len(session))
+
+
+def column_stats(values, percentiles=PERCENTILES):
+    # values : (k, n) -> {stat: tableau (k,)} ; NaN là où la métrique n'a aucune valeur
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(values, axis=1) / count
+        squares = np.nansum((values - mean[:, None]) ** 2, axis=1)
+        std = np.where(count > 1, np.sqrt(squares / (count - 1)), np.nan)
+    empty = count == 0
+    result = {
+        'nombre': count,
+        'moyenne': mean,
+        'min': np.where(empty, np.nan, np.fmin.reduce(values, axis=1)) if values.shape[1] else mean,
+        'max': np.where(empty, np.nan, np.fmax.reduce(values, axis=1)) if values.shape[1] else mean,
+        'écart-type': std,
+    }
+    result.update(nan_percentiles(values, percentiles, valid))
+    return result
+
+
+def nan_percentiles(values, percentiles=PERCENTILES, valid=None):
+    # {nom: q} -> {nom: tableau (k,)} ; une seule sélection multi-rangs par métrique
+    values = np.atleast_2d(values)
+    if valid is None:
+        valid = ~np.isnan(values)
+    names = list(percentiles)
+    qs = np.array([percentiles[name] for name in names], dtype=np.float64) / 100
+    out = np.full((len(names), len(values)), np.nan)
+    for i, row in enumerate(values):
+        data = row[valid[i]] if not valid[i].all() else row.copy()
+        n = len(data)
+        if n < MIN_PERCENTILE_SAMPLES:
+            continue
+        positions = qs * (n - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, n - 1)
+        data.partition(np.unique(np.concatenate([lower, upper])))
+        fraction = positions - lower
+        out[:, i] = data[lower] + (data[upper] - data[lower]) * fraction
+    return dict(zip(names, out))
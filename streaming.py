@@ -0,0 +1,148 @@
+# streaming.py
+# Accumulateurs "en ligne" pour calculer les stats sans garder tout le log en mémoire :
+#   - RunningStats : count / somme / min / max (exacts)
+#   - QuantileSketch : sketch de quantiles fusionnable à précision relative (type DDSketch)
+#
+# Tolérance par rapport au calcul en mémoire :
+#   - moyenne / min / max : identiques (à l'arrondi flottant près)
+#   - 1% low : erreur relative <= RELATIVE_ACCURACY sur la valeur au rang floor(0.01 * (n - 1)),
+#     l'interpolation linéaire de pandas entre deux échantillons voisins n'étant pas reproduite
+import math
+
+import numpy as np
+import pandas as pd
+
+RELATIVE_ACCURACY = 0.005
+MIN_INDEXABLE = 1e-9
+
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.count += int(values.size)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+
+class QuantileSketch:
+    # Buckets logarithmiques : une valeur x > 0 tombe dans le bucket ceil(log_gamma(x)),
+    # chaque bucket couvrant ]gamma^(i-1), gamma^i]. Le nombre de buckets ne dépend que
+    # de l'étendue des valeurs, pas du nombre d'échantillons.
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _add_to_store(self, store, magnitudes):
+        keys = np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+        uniq, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(uniq.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.count += int(values.size)
+        positive = values[values > MIN_INDEXABLE]
+        negative = values[values < -MIN_INDEXABLE]
+        self.zero_count += int(values.size - positive.size - negative.size)
+        if positive.size:
+            self._add_to_store(self.positive, positive)
+        if negative.size:
+            self._add_to_store(self.negative, -negative)
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Impossible de fusionner des sketches de précisions différentes.")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _value(self, key):
+        # Représentant du bucket : erreur relative <= relative_accuracy
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return math.nan
+        rank = int(q * (self.count - 1))
+
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+
+class StreamingStats:
+    # Stats complètes d'une session, mises à jour bloc par bloc
+    def __init__(self, columns, relative_accuracy=RELATIVE_ACCURACY):
+        self.columns = list(columns)
+        self.running = {col: RunningStats() for col in self.columns}
+        self.sketches = {col: QuantileSketch(relative_accuracy) for col in self.columns}
+        self.first_time = None
+        self.last_time = None
+        self.rows = 0
+
+    def update(self, df, time_column=None):
+        if df.empty:
+            return
+        self.rows += len(df)
+        for col in self.columns:
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+                self.running[col].update(values)
+                self.sketches[col].update(values)
+        if time_column is not None:
+            times = df[time_column]
+            chunk_min, chunk_max = times.min(), times.max()
+            self.first_time = chunk_min if self.first_time is None else min(self.first_time, chunk_min)
+            self.last_time = chunk_max if self.last_time is None else max(self.last_time, chunk_max)
+
+    def merge(self, other):
+        for col in self.columns:
+            self.running[col].merge(other.running[col])
+            self.sketches[col].merge(other.sketches[col])
+        self.rows += other.rows
+        if other.first_time is not None:
+            self.first_time = other.first_time if self.first_time is None else min(self.first_time, other.first_time)
+            self.last_time = other.last_time if self.last_time is None else max(self.last_time, other.last_time)
+
+    def one_percent_low(self, col):
+        return self.sketches[col].quantile(0.01)
@@ -0,0 +1,117 @@
+# synthetic_logs.py
+# Générateur déterministe de logs MSI Afterburner réalistes (pour les benchmarks et les tests)
+#
+#   python synthetic_logs.py 100000 bench_data/log_100k.xlsx
+#
+# Même disposition que les vrais logs :
+#   - 13 colonnes (Action type, Timestamp + 11 capteurs), lignes d'en-tête 00 à 03
+#   - .xlsx : valeurs x1000 (comme l'import Excel des logs), .hml/.csv : valeurs réelles
+#   - quelques timestamps invalides et des pics de framerate > 1000 FPS à filtrer
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+SENSOR_NAMES = ['GPU temperature', 'GPU usage', 'Core clock', 'Temp limit', 'CPU usage', 'Framerate',
+                'Memory usage', 'Fan speed', 'Power', 'GPU voltage', 'RAM usage']
+SENSOR_UNITS = ['°C', '%', 'MHz', '', '%', 'FPS', 'MB', '%', 'W', 'V', 'MB']
+
+START = pd.Timestamp('2025-11-20 22:00:00')
+INVALID_TIMESTAMP_RATE = 0.001
+FRAMERATE_OUTLIER_RATE = 0.002
+XLSX_MAX_DATA_ROWS = 1_048_576 - 5  # limite d'une feuille Excel, moins l'en-tête
+
+
+def generate_frame(rows, seed=0, sample_period_s=1.0):
+    # -> DataFrame brute : 'Action type', 'Timestamp' (chaînes) + 11 capteurs en unités réelles
+    rng = np.random.default_rng(seed)
+    t = np.arange(rows, dtype=np.float64) * sample_period_s
+
+    # Framerate : niveau qui dérive, bruit, et des écrans de chargement (chutes) réguliers
+    framerate = 90 + 25 * np.sin(t / 600) + rng.normal(0, 4, rows)
+    loading = (t % 1800) < 20
+    framerate[loading] = rng.uniform(5, 30, int(loading.sum()))
+    outliers = rng.random(rows) < FRAMERATE_OUTLIER_RATE
+    framerate[outliers] = rng.uniform(1000, 5000, int(outliers.sum()))
+
+    gpu_temp = 55 + 20 * (1 - np.exp(-t / 900)) + rng.normal(0, 0.8, rows)
+    sensors = np.column_stack([
+        gpu_temp,
+        np.clip(85 + rng.normal(0, 8, rows), 0, 100),
+        1800 + rng.normal(0, 25, rows),
+        (gpu_temp > 74).astype(np.float64),
+        np.clip(35 + 15 * np.sin(t / 120) + rng.normal(0, 6, rows), 0, 100),
+        framerate,
+        6000 + rng.normal(0, 200, rows),
+        np.clip(40 + (gpu_temp - 55) * 2 + rng.normal(0, 2, rows), 0, 100),
+        220 + rng.normal(0, 15, rows),
+        1.0 + rng.normal(0, 0.02, rows),
+        12000 + rng.normal(0, 300, rows),
+    ])
+
+    timestamps = pd.Series(START + pd.to_timedelta(t, unit='s')).dt.strftime('%d-%m-%Y %H:%M:%S')
+    timestamps = timestamps.to_numpy(dtype=object)
+    invalid = rng.random(rows) < INVALID_TIMESTAMP_RATE
+    timestamps[invalid] = 'invalid'
+
+    df = pd.DataFrame(np.round(sensors, 3), columns=SENSOR_NAMES)
+    df.insert(0, 'Timestamp', timestamps)
+    df.insert(0, 'Action type', 80)
+    return df
+
+
+def _header_rows():
+    stamp = START.strftime('%d-%m-%Y %H:%M:%S')
+    return [
+        [0, stamp, 'Hardware monitoring log v1.6'],
+        [1, stamp, 'NVIDIA GeForce RTX 3080'],
+        [2, stamp] + SENSOR_NAMES,
+        [3, stamp] + SENSOR_UNITS,
+    ]
+
+
+def write_xlsx(df, path):
+    import openpyxl
+
+    if len(df) > XLSX_MAX_DATA_ROWS:
+        raise ValueError(f"{len(df)} lignes : trop pour une feuille Excel (max {XLSX_MAX_DATA_ROWS}), utiliser .hml")
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in _header_rows():
+        ws.append(row + [None] * (13 - len(row)))
+
+    # Valeurs x1000 entières, comme dans les exports Excel réels
+    scaled = np.round(df[SENSOR_NAMES].to_numpy() * 1000).astype(np.int64)
+    for action, stamp, values in zip(df['Action type'].tolist(), df['Timestamp'].tolist(), scaled.tolist()):
+        ws.append([action, stamp] + values)
+    wb.save(path)
+
+
+def write_text(df, path):
+    with open(path, 'w', encoding='cp1252', newline='\n') as f:
+        for row in _header_rows():
+            f.write(', '.join(f'{v:02d}' if i == 0 else str(v) for i, v in enumerate(row)) + '\n')
+        df.to_csv(f, header=False, index=False, sep=',', float_format='%.3f', lineterminator='\n')
+
+
+def generate_log(path, rows, seed=0):
+    df = generate_frame(rows, seed=seed)
+    if os.path.splitext(path)[1].lower() in ('.xlsx', '.xls'):
+        write_xlsx(df, path)
+    else:
+        write_text(df, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un log Afterburner synthétique")
+    parser.add_argument('rows', type=int)
+    parser.add_argument('path', help=".xlsx (valeurs x1000) ou .hml/.csv (valeurs réelles)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    generate_log(args.path, args.rows, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
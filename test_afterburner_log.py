@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from afterburner_log import read_afterburner_log
+from model import StatsModel
+
+LOG = """00, 20-11-2025 22:19:20, Hardware monitoring log v1.6
+01, 20-11-2025 22:19:20, NVIDIA GeForce RTX 3080
+02, 20-11-2025 22:19:20, Framerate       ,GPU temperature ,GPU usage ,Core clock ,Temp limit ,CPU usage ,Fan speed
+03, 20-11-2025 22:19:20, FPS             ,°C              ,%         ,MHz        ,           ,%         ,%
+80, 20-11-2025 22:19:21, 60.000          ,65.000          ,90.000    ,1800.000   ,0.000      ,40.000    ,50.000
+80, 20-11-2025 22:19:22, 2500.000        ,66.000          ,91.000    ,1810.000   ,0.000      ,41.000    ,50.000
+80, invalid            , 55.000          ,67.000          ,92.000    ,1820.000   ,1.000      ,42.000    ,50.000
+80, 20-11-2025 22:19:24, 58.000          ,68.000          ,N/A       ,1830.000   ,1.000      ,43.000    ,50.000
+"""
+
+
+class TestAfterburnerLog( unittest.TestCase ):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp( suffix='.hml' )
+        with os.fdopen( fd, 'w', encoding='utf-8' ) as f:
+            f.write( LOG )
+
+    def tearDown(self):
+        os.remove( self.path )
+
+    def test_header_mapping_and_types(self):
+        timestamps, metrics = read_afterburner_log( self.path, chunk_size=2 )
+
+        # Les colonnes sont retrouvées par leur nom, pas par leur position
+        self.assertEqual( len( timestamps ), 4 )
+        self.assertTrue( np.issubdtype( timestamps.dtype, np.datetime64 ) )
+        self.assertTrue( np.isnat( timestamps[2] ) )
+        np.testing.assert_allclose( metrics['Framerate'], [60, 2500, 55, 58] )
+        np.testing.assert_allclose( metrics['GPU temperature'], [65, 66, 67, 68] )
+        self.assertTrue( np.isnan( metrics['GPU usage'][3] ) )
+
+    def test_compute_stats_from_text_log(self):
+        result, error = StatsModel().compute_stats( self.path )
+
+        self.assertIsNone( error )
+        stats = result['stats']
+        # 2500 FPS rejeté, ligne au timestamp invalide supprimée
+        self.assertAlmostEqual( stats['Max Framerate']['max'], 60.0 )
+        self.assertAlmostEqual( stats['Min Framerate']['min'], 58.0 )
+        self.assertEqual( len( result['session'] ), 2 )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+import unittest
+
+from batch import SUMMARY_FILE, expand_inputs, main, output_name
+from synthetic_logs import generate_log
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_expand_inputs_and_output_names(self):
+        for name in ('a.hml', 'b.hml'):
+            open(os.path.join(self.tmp.name, name), 'w').close()
+        os.makedirs(os.path.join(self.tmp.name, 'dossier.hml'))
+        pattern = os.path.join(self.tmp.name, '*.hml')
+        files = expand_inputs([pattern, os.path.join(self.tmp.name, 'a.hml')])
+        self.assertEqual([os.path.basename(f) for f in files], ['a.hml', 'b.hml'])  # ni dossier ni doublon
+
+        used = set()
+        names = [output_name(path, used) for path in ('x/a.hml', 'y/a.xlsx', 'z/a.csv', 'b.hml')]
+        self.assertEqual(names, ['a', 'a_2', 'a_3', 'b'])
+
+    def test_failure_is_recorded_without_aborting(self):
+        good = generate_log(os.path.join(self.tmp.name, 'good.hml'), 2_000, seed=1)
+        bad = os.path.join(self.tmp.name, 'bad.hml')
+        with open(bad, 'w') as f:
+            f.write("pas un log\n")
+        output_dir = os.path.join(self.tmp.name, 'out')
+
+        code = main([good, bad, '-o', output_dir, '--workers', '1'])
+        self.assertEqual(code, 1)
+
+        with open(os.path.join(output_dir, SUMMARY_FILE)) as f:
+            summary = json.load(f)
+        self.assertEqual((summary['ok'], summary['failed']), (1, 1))
+        entries = {os.path.basename(e['file']): e for e in summary['files']}
+        self.assertTrue(entries['bad.hml']['error'])
+        with open(os.path.join(output_dir, 'good.json')) as f:
+            self.assertIn('moyenne', json.load(f)['Framerate'])
+        self.assertFalse(os.path.exists(os.path.join(output_dir, 'bad.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+
+from benchmark import compare
+from model import StatsModel
+from synthetic_logs import generate_frame, generate_log
+
+
+class TestSyntheticLogs(unittest.TestCase):
+    def test_generation_is_deterministic(self):
+        a = generate_frame(2000, seed=3)
+        b = generate_frame(2000, seed=3)
+        self.assertTrue(a.equals(b))
+
+    def test_generated_log_is_readable(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = generate_log(os.path.join(tmp, 'log.hml'), 3000, seed=1)
+            result, error = StatsModel().compute_stats(path)
+        self.assertIsNone(error)
+        self.assertLess(result['stats']['Max Framerate']['max'], 1000)
+        self.assertEqual(str(result['duration']), '0 days 00:49:59')
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_only_significant_slowdowns(self):
+        def report(read, stats):
+            return {'results': [{'format': 'hml', 'rows': 10, 'compute_stats': read + stats,
+                                 'stages': {'read': read, 'stats': stats}}]}
+
+        regressions = compare(report(2.0, 0.0011), report(1.0, 0.001), threshold=0.2)
+        self.assertEqual([r['stage'] for r in regressions], ['read', 'compute_stats'])
+
+
+if __name__ == '__main__':
+    unittest.main()
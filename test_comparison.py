@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import unittest
+
+from model import StatsModel
+from stats_cache import StatsCache
+from synthetic_logs import generate_log
+
+
+class TestComparison(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = [generate_log(os.path.join(self.tmp.name, f'log{i}.hml'), 3_000 + 1_000 * i, seed=i)
+                      for i in range(3)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_many_keeps_order_and_matches_single(self):
+        model = StatsModel(cache=StatsCache(cache_dir=os.path.join(self.tmp.name, 'cache')))
+        missing = os.path.join(self.tmp.name, 'absent.hml')
+        outcomes = model.compute_stats_many(self.paths + [missing], workers=2)
+
+        self.assertEqual(len(outcomes), 4)
+        for path, (result, error) in zip(self.paths, outcomes):
+            self.assertIsNone(error)
+            single, _ = StatsModel().compute_stats(path)
+            self.assertAlmostEqual(model.stat_value(result['stats'], 'Moyenne', 'Framerate'),
+                                   model.stat_value(single['stats'], 'Moyenne', 'Framerate'), places=4)
+            self.assertEqual(len(result['session']), len(single['session']))
+        self.assertIsNone(outcomes[3][0])
+        self.assertTrue(outcomes[3][1])
+
+        # Second appel : tout vient du cache, sans pool de processus
+        again = model.compute_stats_many(self.paths)
+        self.assertEqual(model.cache.memory_hits, len(self.paths))
+        for (first, _), (second, _) in zip(outcomes, again):
+            self.assertIs(first['session'], second['session'])
+
+    def test_format_comparison_deltas(self):
+        model = StatsModel()
+        named = [(f'log{i}', model.compute_stats(path)[0]['stats']) for i, path in enumerate(self.paths)]
+        columns, rows = model.format_comparison(named)
+
+        self.assertEqual(columns, ('Stat', 'log0', 'log1', 'log2', 'Δ log1', 'Δ log2'))
+        self.assertEqual(rows[0][0], 'Durée')
+        by_stat = {row[0]: row for row in rows}
+        row = by_stat['Moyenne Framerate']
+        ref = model.stat_value(named[0][1], 'Moyenne', 'Framerate')
+        other = model.stat_value(named[1][1], 'Moyenne', 'Framerate')
+        self.assertEqual(row[4], f"{other - ref:+.1f} ({(other - ref) / abs(ref) * 100:+.1f}%)")
+
+        exported = json.loads(model.generate_comparison_text(named))
+        self.assertEqual(list(exported), ['log0', 'log1', 'log2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+import numpy as np
+
+from downsampling import decimate_range, minmax_decimate
+
+
+class TestDownsampling( unittest.TestCase ):
+    def test_spikes_and_dips_survive(self):
+        x = np.arange( 100_000 ) / 60
+        y = np.full( 100_000, 60.0 )
+        y[12_345] = 500.0
+        y[67_890] = 1.0
+
+        xd, yd = minmax_decimate( x, y, 500 )
+
+        self.assertLessEqual( len( xd ), 2 * 500 + 200 )
+        self.assertEqual( yd.max(), 500.0 )
+        self.assertEqual( yd.min(), 1.0 )
+        self.assertTrue( np.all( np.diff( xd ) >= 0 ) )  # ordre chronologique conservé
+
+    def test_visible_range_uses_full_resolution(self):
+        x = np.arange( 100_000, dtype=float )
+        y = np.sin( x )
+
+        xd, yd = decimate_range( x, y, 1000, 1100, 500 )
+
+        # Plage plus petite que 2 points par bucket : données brutes
+        np.testing.assert_array_equal( xd, x[999:1102] )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from events import CPU_SATURATION, GPU_SATURATION, STUTTER, THERMAL, EventIndex, build_event_index, runs
+from exporters import summary_dict
+from model import StatsModel
+from session import Session
+from synthetic_logs import generate_log
+
+T0 = np.int64(1_700_000_000) * 10**9
+
+
+class TestRuns(unittest.TestCase):
+    def test_runs_cut_on_gaps_and_merge(self):
+        timestamps = T0 + np.arange(12, dtype=np.int64) * 10**9
+        timestamps[8:] += 100 * 10**9  # trou de 100 s avant l'échantillon 8
+        mask = np.array([0, 1, 1, 0, 1, 0, 0, 1, 1, 1, 0, 1], dtype=bool)
+
+        starts, stops = runs(mask, timestamps)
+        self.assertEqual(list(zip(starts, stops)), [(1, 3), (4, 5), (7, 8), (8, 10), (11, 12)])
+
+        # Fusion des plages proches, jamais par-dessus le trou
+        starts, stops = runs(mask, timestamps, merge_seconds=5)
+        self.assertEqual(list(zip(starts, stops)), [(1, 8), (8, 12)])
+
+    def test_empty_mask(self):
+        starts, stops = runs(np.zeros(5, dtype=bool), T0 + np.arange(5))
+        self.assertEqual(len(starts), 0)
+        self.assertEqual(len(stops), 0)
+
+
+class TestEventIndex(unittest.TestCase):
+    def test_query_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        index = EventIndex(origin=0)
+        for kind in (STUTTER, THERMAL):
+            bounds = np.sort(rng.choice(10_000, size=400, replace=False)).reshape(-1, 2)
+            index.add(kind, bounds[:, 0], bounds[:, 1], rng.normal(size=len(bounds)))
+
+        for _ in range(200):
+            start, stop = np.sort(rng.integers(-100, 10_100, size=2))
+            expected = sorted((kind, a) for kind in index.kinds
+                              for a, b in zip(index.starts[kind], index.stops[kind]) if a <= stop and b >= start)
+            found = index.query(start, stop)
+            self.assertEqual(sorted((e.kind, e.start) for e in found), expected)
+            self.assertEqual(index.count_between(start, stop), len(expected))
+            self.assertEqual([e.start for e in found], sorted(e.start for e in found))
+
+    def test_build_detects_stutter_thermal_and_saturation(self):
+        n = 600
+        timestamps = T0 + np.arange(n, dtype=np.int64) * 10**9
+        fps = np.full(n, 100.0)
+        fps[200:202] = 20.0  # saccade de 2 s
+        fps[400:430] = 5.0  # écran de chargement : pas une saccade
+        temp_limit = np.zeros(n)
+        temp_limit[100:110] = 1.0
+        temp_limit[113:120] = 1.0  # à moins de MERGE_SECONDS : même événement
+        gpu = np.full(n, 80.0)
+        gpu[300:320] = 99.0
+        gpu[500:502] = 99.0  # trop court
+        cpu = np.full(n, 40.0)
+        temperature = np.full(n, 70.0)
+        temperature[105] = 88.0
+        session = Session(['Framerate', 'GPU temperature', 'Temp over limit', 'GPU usage', 'CPU usage'],
+                          np.stack([fps, temperature, temp_limit, gpu, cpu]), timestamps,
+                          meta={'sample_interval': pd.Timedelta(seconds=1)})
+
+        index = build_event_index(session)
+        stutter, = index.query(kinds=[STUTTER])
+        self.assertEqual((stutter.start, stutter.stop), (timestamps[200], timestamps[202]))
+        self.assertEqual(stutter.value, 20.0)
+
+        thermal, = index.query(kinds=[THERMAL])
+        self.assertEqual((thermal.start, thermal.stop), (timestamps[100], timestamps[120]))
+        self.assertEqual(thermal.value, 88.0)
+
+        saturation, = index.query(kinds=[GPU_SATURATION])
+        self.assertEqual(index.elapsed(saturation.start), pd.Timedelta(seconds=300))
+        self.assertEqual(index.count(CPU_SATURATION), 0)
+
+        summary = index.summary()
+        self.assertEqual(summary[THERMAL]['durée totale'], pd.Timedelta(seconds=20))
+        self.assertEqual(summary[STUTTER]['pire valeur'], 20.0)
+
+
+class TestEventsInStats(unittest.TestCase):
+    def test_summary_in_json_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = generate_log(os.path.join(tmp, 'log.hml'), 5_000, seed=3)
+            result, error = StatsModel().compute_stats(path)
+        self.assertIsNone(error)
+        self.assertIsInstance(result['events'], EventIndex)
+
+        exported = json.loads(json.dumps(summary_dict(result['stats'])))
+        self.assertEqual(set(exported['Événements']), set(result['events'].kinds))
+        for kind, summary in exported['Événements'].items():
+            self.assertEqual(summary['nombre'], result['events'].count(kind))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from exporters import export, export_session, summary_dict
+from model import StatsModel
+from synthetic_logs import generate_log
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestExporters(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        path = generate_log(os.path.join(cls.tmp.name, 'log.hml'), 5_000, seed=3)
+        cls.result, error = StatsModel().compute_stats(path)
+        assert error is None, error
+        cls.session = cls.result['session']
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def out(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def check_frame(self, df):
+        self.assertEqual(list(df.columns), ['Timestamp'] + [col.strip() for col in self.session.columns])
+        self.assertEqual(len(df), len(self.session))
+        np.testing.assert_array_equal(df['Timestamp'].to_numpy().view(np.int64), self.session.timestamps)
+        np.testing.assert_allclose(df['Framerate'].to_numpy(), self.session['Framerate'], rtol=1e-6)
+
+    def test_csv_chunked(self):
+        path, error = export_session(self.session, self.out('series.csv'), chunk_rows=700)
+        self.assertIsNone(error)
+        df = pd.read_csv(path, parse_dates=['Timestamp'])
+        df['Timestamp'] = df['Timestamp'].astype('datetime64[ns]')
+        self.check_frame(df)
+
+    def test_csv_without_pyarrow(self):
+        with mock.patch.dict(sys.modules, {'pyarrow': None, 'pyarrow.csv': None}):
+            path, error = export_session(self.session, self.out('series_pandas.csv'), chunk_rows=700)
+        self.assertIsNone(error)
+        df = pd.read_csv(path, parse_dates=['Timestamp'])
+        df['Timestamp'] = df['Timestamp'].astype('datetime64[ns]')
+        self.check_frame(df)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow non installé")
+    def test_parquet_and_arrow(self):
+        import pyarrow.feather
+        import pyarrow.parquet
+
+        path, error = export_session(self.session, self.out('series.parquet'), chunk_rows=1_000)
+        self.assertIsNone(error)
+        parquet = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(parquet.metadata.num_row_groups, 5)
+        self.check_frame(parquet.read().to_pandas())
+
+        path, error = export_session(self.session, self.out('series.arrow'), chunk_rows=1_000)
+        self.assertIsNone(error)
+        self.check_frame(pyarrow.feather.read_table(path).to_pandas())
+
+    def test_unsupported_format(self):
+        path, error = export_session(self.session, self.out('series.xyz'))
+        self.assertIsNone(path)
+        self.assertTrue(error)
+
+    def test_summary_json_typed(self):
+        stats = dict(self.result['stats'], Extra={'nan': np.float32('nan'), 'n': np.int64(3)})
+        summary = summary_dict(stats)
+        self.assertRegex(summary['Durée Partie'], r'^\d{2}:\d{2}:\d{2}$')
+        self.assertEqual(summary['Extra'], {'nan': None, 'n': 3})
+        self.assertIn('1% low', summary['Framerate'])
+
+        path, error = export(self.out('summary.json'), stats=self.result['stats'])
+        self.assertIsNone(error)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), summary_dict(self.result['stats']))
+
+
+if __name__ == '__main__':
+    unittest.main()
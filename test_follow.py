@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from downsampling import StreamingDecimator
+from follow import LogFollower
+from model import StatsModel
+from synthetic_logs import generate_log
+
+
+class TestLogFollower(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.full = generate_log(os.path.join(self.tmp.name, 'full.hml'), 20_000, seed=5)
+        self.live = os.path.join(self.tmp.name, 'live.hml')
+        with open(self.full, 'rb') as f:
+            self.data = f.read()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def append(self, start, stop):
+        with open(self.live, 'ab') as f:
+            f.write(self.data[start:stop])
+
+    def test_incremental_matches_full_streaming(self):
+        model = StatsModel()
+        open(self.live, 'wb').close()
+        follower = LogFollower(self.live)
+
+        # Découpes arbitraires, y compris au milieu d'une ligne
+        cuts = [0, 37, 5000, 5001, 250_000, 900_000, len(self.data)]
+        for start, stop in zip(cuts, cuts[1:]):
+            self.append(start, stop)
+            follower.poll()
+
+        live = follower.snapshot(model)['stats']
+        full, error = model.compute_stats(self.full, streaming=True)
+        self.assertIsNone(error)
+        for key, value in full['stats'].items():
+            for stat, expected in value.items():
+                if isinstance(expected, float):
+                    self.assertAlmostEqual(live[key][stat], expected, places=6)
+                else:
+                    self.assertEqual(live[key][stat], expected)
+
+    def test_only_new_bytes_are_read(self):
+        self.append(0, 500_000)
+        follower = LogFollower(self.live)
+        first = follower.poll()
+        self.assertEqual(follower.poll(), 0)
+        self.append(500_000, len(self.data))
+        self.assertEqual(first + follower.poll(), follower.rows)
+
+    def test_truncated_file_restarts(self):
+        self.append(0, len(self.data))
+        follower = LogFollower(self.live)
+        follower.poll()
+        with open(self.live, 'wb') as f:
+            f.write(self.data[:100_000])
+        follower.poll()
+        self.assertLess(follower.rows, 2000)
+
+
+class TestStreamingDecimator(unittest.TestCase):
+    def test_bounded_and_keeps_extremes(self):
+        decimator = StreamingDecimator(max_buckets=100, width=1.0)
+        x = np.arange(50_000, dtype=float)
+        y = np.zeros(50_000)
+        y[12_345] = 10.0
+        y[40_000] = -3.0
+        for start in range(0, len(x), 777):
+            decimator.append(x[start:start + 777], y[start:start + 777])
+
+        xd, yd = decimator.series()
+        self.assertLessEqual(len(decimator), 100)
+        self.assertEqual(yd.max(), 10.0)
+        self.assertEqual(xd[np.argmax(yd)], 12_345)
+        self.assertEqual(yd.min(), -3.0)
+        self.assertTrue(np.all(np.diff(xd) >= 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
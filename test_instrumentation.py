@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+
+from instrumentation import LoadDiagnostics
+from model import DROP_HIGH_FRAMERATE, DROP_INVALID_TIMESTAMP, StatsModel
+from stats_cache import StatsCache
+from synthetic_logs import generate_log
+
+
+class TestLoadDiagnostics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = generate_log(os.path.join(cls.tmp.name, 'log.hml'), 5000, seed=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_disabled_by_default(self):
+        result, error = StatsModel().compute_stats(self.path)
+        self.assertIsNone(error)
+        self.assertNotIn('diagnostics', result)
+
+    def test_stage_rows_and_drops(self):
+        diag = LoadDiagnostics(memory=True)
+        result, error = StatsModel().compute_stats(self.path, instrument=diag)
+        self.assertIsNone(error)
+        self.assertIs(result['diagnostics'], diag)
+
+        records = diag.records
+        self.assertEqual(records['lecture'].rows_out, 5000)
+        framerate = records['filtre framerate']
+        self.assertEqual(framerate.rows_in - framerate.rows_out, framerate.dropped[DROP_HIGH_FRAMERATE])
+        timestamps = records['horodatages']
+        self.assertEqual(timestamps.rows_out, len(result['session']))
+        self.assertEqual(timestamps.rows_in - timestamps.rows_out, timestamps.dropped[DROP_INVALID_TIMESTAMP])
+        # Sous-étapes : le temps "self" exclut les enfants
+        self.assertLessEqual(timestamps.self_seconds, timestamps.seconds)
+        self.assertEqual(records['tri'].depth, 1)
+        self.assertIsNotNone(records['colonnes session'].memory_delta)
+
+    def test_streaming_accumulates_chunks(self):
+        diag = LoadDiagnostics()
+        result, error = StatsModel().compute_stats(self.path, streaming=True, instrument=diag)
+        self.assertIsNone(error)
+        self.assertEqual(diag.records['lecture'].rows_out, 5000)
+        self.assertIsNone(diag.records['lecture'].memory_delta)
+
+    def test_cache_hit_and_export(self):
+        model = StatsModel(cache=StatsCache(use_disk=False))
+        model.compute_stats(self.path)
+        diag = LoadDiagnostics()
+        result, error = model.compute_stats(self.path, instrument=diag)
+        self.assertTrue(diag.cache_hit)
+
+        exported = json.loads(model.generate_export_text(result['stats'], result['diagnostics']))
+        self.assertTrue(exported['Diagnostics']['cache_hit'])
+        self.assertEqual(exported['Diagnostics']['stages'][0]['stage'], 'cache')
+        # Le résultat mis en cache ne garde pas les mesures d'un appel précédent
+        self.assertNotIn('diagnostics', model.compute_stats(self.path)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import openpyxl
+
+from instrumentation import LoadDiagnostics
+from model import StatsModel
+from schema import (LAYOUTS, POSITIONAL, LogLayout, find_header, missing_columns_warning, register_layout,
+                    resolve_header)
+from synthetic_logs import SENSOR_NAMES, generate_frame, generate_log
+from xlsx_reader import XlsxSheetReader
+
+
+class TestSchema(unittest.TestCase):
+    def test_resolve_header(self):
+        mapping = resolve_header([' Framerate ', 'Fan speed', 'GPU temperature'])
+        self.assertEqual(mapping.layout, 'afterburner')
+        self.assertEqual(mapping.positions, {'Framerate': 0, 'GPU temperature': 2})
+        self.assertEqual(mapping.fields, [0, 1, 2, 4])
+        self.assertIn('CPU usage', mapping.missing)
+
+        multi = resolve_header(['GPU1 temperature', 'GPU2 temperature', 'GPU1 usage', 'Framerate'])
+        self.assertEqual(multi.layout, 'afterburner-multi-gpu')
+        self.assertEqual(multi.positions['GPU temperature'], 0)
+
+        self.assertIsNone(resolve_header(['Fan speed', 'Power']))
+        self.assertIs(find_header([(0, 'x', 'Hardware monitoring log v1.6'), (80, 'x', 1, 2)]), POSITIONAL)
+
+    def test_register_layout(self):
+        layout = register_layout(LogLayout('test-fr', {'Images par seconde': 'Framerate'}))
+        try:
+            self.assertEqual(resolve_header(['Images par seconde']).layout, 'test-fr')
+        finally:
+            LAYOUTS.remove(layout)
+
+
+class TestExcelProjection(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_reordered(self, path, rows=2_000):
+        # Capteurs dans un autre ordre que l'export historique, chaînes partagées (classeur normal)
+        df = generate_frame(rows, seed=7)
+        order = SENSOR_NAMES[::-1]
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append([0, '20-11-2025 22:00:00', 'Hardware monitoring log v1.6'])
+        ws.append([2, '20-11-2025 22:00:00'] + order)
+        scaled = np.round(df[order].to_numpy() * 1000).astype(np.int64)
+        for stamp, values in zip(df['Timestamp'].tolist(), scaled.tolist()):
+            ws.append([80, stamp] + values)
+        wb.save(path)
+        return df
+
+    def test_header_driven_columns(self):
+        path = os.path.join(self.tmp.name, 'reordered.xlsx')
+        df = self.write_reordered(path)
+        result, error = StatsModel().compute_stats(path)
+        self.assertIsNone(error)
+
+        keep = (df['Framerate'] < 1000) & (df['Timestamp'] != 'invalid')
+        self.assertAlmostEqual(result['stats']['Max Framerate']['max'], df['Framerate'][keep].max(), places=3)
+        self.assertAlmostEqual(result['stats']['Moyenne GPU temperature']['moyenne'],
+                               df['GPU temperature'][keep].mean(), places=3)
+
+    def test_fast_reader_matches_openpyxl(self):
+        for name, writer in (('inline.xlsx', lambda p: generate_log(p, 3_000, seed=2)),
+                             ('shared.xlsx', self.write_reordered)):
+            path = os.path.join(self.tmp.name, name)
+            writer(path)
+            model = StatsModel()
+            fast, _ = model.compute_stats(path)
+            model.open_xlsx = lambda file_path: None  # force la lecture openpyxl
+            slow, _ = model.compute_stats(path)
+            self.assertEqual(model.generate_export_text(fast['stats']), model.generate_export_text(slow['stats']))
+            np.testing.assert_array_equal(fast['session'].timestamps, slow['session'].timestamps)
+
+    def test_renamed_column_is_reported(self):
+        # Afterburner renomme 'Framerate' : colonne N/A, signalée dans les stats, les diagnostics et la vue
+        path = generate_log(os.path.join(self.tmp.name, 'renamed.hml'), 2_000, seed=5)
+        with open(path, 'rb') as f:
+            lines = f.readlines()
+        header = next(i for i, line in enumerate(lines) if line.startswith(b'02'))
+        lines[header] = lines[header].replace(b'Framerate', b'Frame rate')
+        with open(path, 'wb') as f:
+            f.writelines(lines)
+
+        diagnostics = LoadDiagnostics()
+        result, error = StatsModel().compute_stats(path, instrument=diagnostics)
+        self.assertIsNone(error)
+        columns = result['stats']['Colonnes']
+        self.assertEqual((columns['disposition'], columns['manquantes']), ('afterburner', ['Framerate']))
+        self.assertEqual(columns['requises manquantes'], ['Framerate'])
+        self.assertEqual(diagnostics.to_dict()['columns'], columns)
+        self.assertEqual(result['stats']['Max Framerate']['max'], 'N/A')
+        self.assertIn('Framerate', missing_columns_warning(columns))
+
+        result, _ = StatsModel().compute_stats(generate_log(os.path.join(self.tmp.name, 'ok.hml'), 500, seed=5))
+        self.assertIsNone(missing_columns_warning(result['stats']['Colonnes']))
+
+    def test_iso_date_cells(self):
+        # Horodatages en cellules date ISO (t="d"), en-tête compris
+        df = generate_frame(500, seed=8)
+        wb = openpyxl.Workbook()
+        wb.iso_dates = True
+        ws = wb.active
+        start = datetime.datetime(2025, 11, 20, 22, 0, 0)
+        ws.append([2, start] + SENSOR_NAMES)
+        for i, values in enumerate(np.round(df[SENSOR_NAMES].to_numpy() * 1000).astype(np.int64).tolist()):
+            ws.append([80, start + datetime.timedelta(seconds=i)] + values)
+        path = os.path.join(self.tmp.name, 'dates.xlsx')
+        wb.save(path)
+
+        result, error = StatsModel().compute_stats(path)
+        self.assertIsNone(error)
+        self.assertEqual(result['duration'], datetime.timedelta(seconds=499))
+
+    def test_read_progress_excludes_header(self):
+        path = generate_log(os.path.join(self.tmp.name, 'progress.xlsx'), 3_000, seed=3)
+        with XlsxSheetReader(path, block_bytes=1 << 14) as reader:
+            reader.head(4)
+            for _ in reader.iter_columns([0, 1]):
+                pass
+            self.assertEqual(reader.bytes_read, reader.sheet_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
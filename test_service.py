@@ -0,0 +1,173 @@
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+from service import MAX_JSON_BYTES, AnalysisService, ServiceBusy, make_server
+from synthetic_logs import generate_log
+
+
+class TestAnalysisService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.log = generate_log(os.path.join(cls.tmp.name, 'log.hml'), 4_000, seed=7)
+        cls.other = generate_log(os.path.join(cls.tmp.name, 'other.hml'), 4_000, seed=8)
+        cls.service = AnalysisService(workers=2, max_pending=4, work_dir=os.path.join(cls.tmp.name, 'work'),
+                                      cache_dir=os.path.join(cls.tmp.name, 'cache'), root=cls.tmp.name)
+        cls.server = make_server(cls.service, port=0, timeout=120)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.shutdown()
+        cls.tmp.cleanup()
+
+    def request(self, path, body=None, content_type='application/json'):
+        data = json.dumps(body).encode() if isinstance(body, dict) else body
+        req = urllib.request.Request(self.url + path, data=data, headers={'Content-Type': content_type})
+        try:
+            with urllib.request.urlopen(req, timeout=120) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def test_analyze_path_and_metrics(self):
+        status, body = self.request('/analyze', {'path': self.log})
+        self.assertEqual(status, 200)
+        result = json.loads(body)
+        self.assertIn('moyenne', result['stats']['Framerate'])
+
+        status, body = self.request('/metrics')
+        metrics = json.loads(body)
+        self.assertGreaterEqual(metrics['completed'], 1)
+        self.assertIsNotNone(metrics['latency_seconds']['p95'])
+
+        status, body = self.request('/analyze', {'path': os.path.join(self.tmp.name, 'absent.hml')})
+        self.assertEqual(status, 400)
+
+    def test_oversized_json_is_refused_unread(self):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=30)
+        try:
+            # Corps annoncé mais jamais envoyé : la réponse ne doit pas l'attendre
+            connection.putrequest('POST', '/analyze')
+            connection.putheader('Content-Type', 'application/json')
+            connection.putheader('Content-Length', str(100 * MAX_JSON_BYTES))
+            connection.endheaders()
+            self.assertEqual(connection.getresponse().status, 413)
+        finally:
+            connection.close()
+
+    def test_path_outside_root_is_refused(self):
+        status, _ = self.request('/analyze', {'path': 'log.hml'})  # relatif à root
+        self.assertEqual(status, 200)
+        for path in (os.path.abspath(__file__), os.path.join(self.tmp.name, '..', 'log.hml')):
+            status, _ = self.request('/analyze', {'path': path})
+            self.assertEqual(status, 403)
+        status, _ = self.request('/analyze', b'[1, 2]')
+        self.assertEqual(status, 400)
+
+        service = AnalysisService(workers=1, work_dir=os.path.join(self.tmp.name, 'no-root'))
+        try:
+            self.assertIsNone(service.allowed_path(self.log))  # sans --root : envoi du log seulement
+        finally:
+            service.shutdown()
+
+    def test_upload_with_series(self):
+        with open(self.other, 'rb') as f:
+            data = f.read()
+        status, body = self.request('/analyze?name=other.hml&series=csv', data, 'application/octet-stream')
+        self.assertEqual(status, 200)
+        result = json.loads(body)
+        status, series = self.request(result['series'])
+        self.assertEqual(status, 200)
+        self.assertIn(b'Timestamp', series.splitlines()[0])
+        # Log envoyé supprimé une fois analysé (callback de fin du job, peut suivre la réponse de peu)
+        deadline = time.monotonic() + 5
+        while os.listdir(self.service.upload_dir) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(os.listdir(self.service.upload_dir), [])
+
+        status, body = self.request('/analyze?name=bad.hml', b'pas un log\n', 'application/octet-stream')
+        self.assertEqual(status, 422)
+
+    def test_concurrent_requests_are_deduplicated(self):
+        options = {'window': '30s'}
+        first, shared_first = self.service.submit(self.log, options)
+        second, shared_second = self.service.submit(self.log, options)
+        self.assertIs(first, second)
+        self.assertEqual((shared_first, shared_second), (False, True))
+        self.assertTrue(first.result(timeout=120)['ok'])
+
+    def test_full_queue_is_rejected(self):
+        service = AnalysisService(workers=1, max_pending=1, work_dir=os.path.join(self.tmp.name, 'busy'),
+                                  cache_dir=os.path.join(self.tmp.name, 'busy-cache'))
+        try:
+            future, _ = service.submit(self.log)
+            with self.assertRaises(ServiceBusy):
+                service.submit(self.other)
+            self.assertLessEqual(service.metrics()['running'], 1)  # pas plus que de workers
+            future.result(timeout=120)
+            self.assertEqual(service.metrics()['rejected'], 1)
+        finally:
+            service.shutdown()
+
+    def test_full_queue_rejects_upload_before_reading_it(self):
+        service = AnalysisService(workers=1, max_pending=1, work_dir=os.path.join(self.tmp.name, 'full'),
+                                  cache_dir=os.path.join(self.tmp.name, 'full-cache'))
+        server = make_server(service, port=0, timeout=120)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        with open(self.log, 'rb') as f:
+            data = f.read(32 * 1024)
+        req = urllib.request.Request(f"http://127.0.0.1:{server.server_port}/analyze?name=log.hml", data=data,
+                                     headers={'Content-Type': 'application/octet-stream'})
+        try:
+            with service.reservation():  # un autre upload en cours occupe la seule place
+                with self.assertRaises(urllib.error.HTTPError) as ctx:
+                    urllib.request.urlopen(req, timeout=120)
+                self.assertEqual(ctx.exception.code, 503)
+                self.assertEqual(ctx.exception.headers['Retry-After'], '2')
+                self.assertEqual(os.listdir(service.upload_dir), [])
+            self.assertEqual(service.metrics()['rejected'], 1)
+            self.assertEqual(service.metrics()['receiving'], 0)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
+
+    def test_pool_recovers_after_worker_crash(self):
+        service = AnalysisService(workers=1, max_pending=2, work_dir=os.path.join(self.tmp.name, 'crash'),
+                                  cache_dir=os.path.join(self.tmp.name, 'crash-cache'), root=self.tmp.name)
+        server = make_server(service, port=0, timeout=120)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/analyze"
+        try:
+            service.submit(self.log)[0].result(timeout=120)
+            pool = service._pool
+            for process in list(pool._processes.values()):
+                process.kill()  # worker tué (OOM, segfault)
+            deadline = time.monotonic() + 10
+            while not pool._broken and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            req = urllib.request.Request(url, data=json.dumps({'path': self.other}).encode(),
+                                         headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(req, timeout=120) as response:
+                self.assertEqual(response.status, 200)
+            self.assertIsNot(service._pool, pool)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
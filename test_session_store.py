@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from model import StatsModel
+from session import Session
+from session_store import ALIGNMENT, SessionStoreError, open_session, read_header, save_session
+from stats_cache import StatsCache
+from synthetic_logs import generate_log
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_is_mapped(self):
+        values = np.random.default_rng(0).normal(size=(3, 10_000)).astype(np.float32)
+        values[1, ::7] = np.nan
+        timestamps = np.int64(1_700_000_000) * 10**9 + np.arange(10_000, dtype=np.int64) * 10**9
+        stats = {'Durée Partie': {'duration': pd.Timedelta(seconds=9_999)}, 'Moyenne a': {'moyenne': np.float64(1.5)},
+                 'Segments': [{'début': pd.Timedelta(0), 'échantillons': 10, 'source': 'auto'}]}
+        session = Session(['a', 'b', 'c '], values, timestamps, stats, {'source': 'log.hml'})
+        path = os.path.join(self.tmp.name, 'session.gsa')
+        save_session(session, path, {'extra': np.arange(5, dtype=np.int32)})
+
+        header = read_header(path)
+        self.assertTrue(all(entry['offset'] % ALIGNMENT == 0 for entry in header['arrays'].values()))
+
+        loaded, extras = open_session(path)
+        self.assertIsInstance(loaded.values, np.memmap)
+        self.assertEqual(loaded.columns, ('a', 'b', 'c '))
+        np.testing.assert_array_equal(loaded.values, values)
+        np.testing.assert_array_equal(loaded.timestamps, timestamps)
+        np.testing.assert_array_equal(extras['extra'], np.arange(5))
+        self.assertEqual(loaded.stats['Durée Partie']['duration'], pd.Timedelta(seconds=9_999))
+        self.assertEqual(loaded.stats['Segments'][0]['début'], pd.Timedelta(0))
+        self.assertEqual(loaded.meta, {'source': 'log.hml'})
+        with self.assertRaises(ValueError):
+            loaded.values[0, 0] = 1.0  # lecture seule
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.tmp.name, 'autre.gsa')
+        with open(path, 'wb') as f:
+            f.write(b'pas une session' * 10)
+        with self.assertRaises(SessionStoreError):
+            open_session(path)
+
+    def test_model_save_and_reopen(self):
+        log = generate_log(os.path.join(self.tmp.name, 'log.hml'), 5_000, seed=4)
+        model = StatsModel()
+        result, error = model.compute_stats(log)
+        self.assertIsNone(error)
+
+        path, error = model.save_session(result, os.path.join(self.tmp.name, 'log.gsa'))
+        self.assertIsNone(error)
+        reopened, error = model.compute_stats(path)
+        self.assertIsNone(error)
+
+        self.assertEqual(reopened['duration'], result['duration'])
+        self.assertEqual(model.format_stats_for_display(reopened['stats']),
+                         model.format_stats_for_display(result['stats']))
+        np.testing.assert_array_equal(reopened['session'].values, result['session'].values)
+        np.testing.assert_array_equal(reopened['rolling']['Framerate'], result['rolling']['Framerate'])
+        self.assertEqual(reopened['events'].query(), result['events'].query())
+
+        _, error = model.load_session(log)
+        self.assertTrue(error)
+
+    def test_disk_cache_maps_session(self):
+        log = generate_log(os.path.join(self.tmp.name, 'log.hml'), 3_000, seed=5)
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        first, _ = StatsModel(cache=StatsCache(cache_dir=cache_dir)).compute_stats(log)
+
+        cache = StatsCache(cache_dir=cache_dir)
+        second, _ = StatsModel(cache=cache).compute_stats(log)
+        self.assertEqual(cache.disk_hits, 1)
+        self.assertIsInstance(second['session'].values, np.memmap)
+        np.testing.assert_array_equal(second['session'].values, first['session'].values)
+
+    def test_compare_mixed_store_and_log(self):
+        log = generate_log(os.path.join(self.tmp.name, 'log.hml'), 3_000, seed=6)
+        model = StatsModel()
+        result, _ = model.compute_stats(log)
+        path, _ = model.save_session(result, os.path.join(self.tmp.name, 'log.gsa'))
+
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        cache = StatsCache(cache_dir=cache_dir)
+        (stored, error), (parsed, _) = StatsModel(cache=cache).compute_stats_many([path, log], workers=1)
+        self.assertIsNone(error)
+        self.assertTrue(os.path.samefile(stored['session'].values.filename, path))  # mappé, pas copié par le pool
+        np.testing.assert_array_equal(stored['session'].values, parsed['session'].values)
+        self.assertEqual(cache.misses, 1)  # seul le .hml passe par le cache
+        self.assertEqual(len([name for name in os.listdir(cache_dir) if name.endswith('.gsa')]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
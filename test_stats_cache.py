@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from stats_cache import StatsCache
+
+
+class TestStatsCache( unittest.TestCase ):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.logs = []
+        for i in range( 3 ):
+            path = os.path.join( self.dir, f'log{i}.hml' )
+            with open( path, 'w' ) as f:
+                f.write( f'80, 20-11-2025 22:19:2{i}, {i}.000\n' )
+            self.logs.append( path )
+        self.cache = StatsCache( max_entries=2, cache_dir=os.path.join( self.dir, 'cache' ) )
+
+    def tearDown(self):
+        shutil.rmtree( self.dir )
+
+    def test_lru_then_disk_tier(self):
+        keys = [self.cache.make_key( path ) for path in self.logs]
+        for i, key in enumerate( keys ):
+            self.cache.put( key, {'stats': {'n': i}} )
+
+        # La 1re entrée est sortie de la LRU mémoire mais reste sur disque
+        self.assertEqual( self.cache.get( keys[0] ), {'stats': {'n': 0}} )
+        self.assertEqual( self.cache.counters()['disk_hits'], 1 )
+        self.assertEqual( self.cache.get( keys[0] ), {'stats': {'n': 0}} )
+        self.assertEqual( self.cache.counters()['memory_hits'], 1 )
+
+    def test_key_changes_with_content_and_params(self):
+        key = self.cache.make_key( self.logs[0], {'streaming': False} )
+        self.assertNotEqual( key, self.cache.make_key( self.logs[0], {'streaming': True} ) )
+
+        with open( self.logs[0], 'a' ) as f:
+            f.write( '80, 20-11-2025 22:19:30, 1.000\n' )
+        self.assertNotEqual( key, self.cache.make_key( self.logs[0], {'streaming': False} ) )
+
+    def test_invalidate(self):
+        key = self.cache.make_key( self.logs[1] )
+        self.cache.put( key, {'stats': {}} )
+        self.cache.invalidate( self.logs[1] )
+
+        self.assertIsNone( self.cache.get( key ) )
+        self.assertEqual( self.cache.counters()['misses'], 1 )
+
+    def test_cold_instance_does_not_rehash(self):
+        # Nouveau process (redémarrage, batch, worker) : l'empreinte taille + mtime vient du disque
+        key = self.cache.make_key( self.logs[2] )
+        self.cache.put( key, {'stats': {'n': 2}} )
+
+        cold = StatsCache( cache_dir=self.cache.cache_dir )
+        with mock.patch.object( StatsCache, '_hash_file', side_effect=AssertionError( "fichier relu" ) ):
+            self.assertEqual( cold.get( cold.make_key( self.logs[2] ) ), {'stats': {'n': 2}} )
+        self.assertEqual( cold.counters()['disk_hits'], 1 )
+
+        # Fichier modifié : re-hashé malgré l'empreinte sur disque
+        with open( self.logs[2], 'a' ) as f:
+            f.write( '80, 20-11-2025 22:19:40, 3.000\n' )
+        self.assertNotEqual( StatsCache( cache_dir=self.cache.cache_dir ).make_key( self.logs[2] ), key )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from exporters import summary_dict
+from model import StatsModel
+from session import Session
+from stats_kernel import PERCENTILES, column_stats, stack_columns
+
+
+class TestColumnStats(unittest.TestCase):
+    def test_matches_pandas(self):
+        rng = np.random.default_rng(1)
+        values = rng.normal(60, 15, size=(3, 20_001))
+        values[1, ::7] = np.nan
+        values[2, 4:] = np.nan  # 4 valeurs : pas de percentiles
+
+        stats = column_stats(values)
+        for i in range(2):
+            series = pd.Series(values[i])
+            self.assertAlmostEqual(stats['moyenne'][i], series.mean(), places=9)
+            self.assertEqual(stats['min'][i], series.min())
+            self.assertEqual(stats['max'][i], series.max())
+            self.assertAlmostEqual(stats['écart-type'][i], series.std(), places=9)
+            for name, q in PERCENTILES.items():
+                self.assertAlmostEqual(stats[name][i], series.quantile(q / 100), places=9)
+        self.assertEqual(stats['nombre'][2], 4)
+        self.assertFalse(np.isnan(stats['moyenne'][2]))
+        self.assertTrue(np.isnan(stats['1% low'][2]))
+
+    def test_all_nan_and_empty(self):
+        stats = column_stats(np.full((2, 10), np.nan))
+        self.assertTrue(np.isnan(stats['min']).all())
+        self.assertTrue(np.isnan(stats['médiane']).all())
+        stats = column_stats(np.empty((2, 0)))
+        self.assertTrue(np.isnan(stats['max']).all())
+
+    def test_stack_columns_skips_missing(self):
+        session = Session(['a', 'b'], np.arange(6, dtype=np.float32).reshape(2, 3), np.arange(3, dtype=np.int64))
+        present, values = stack_columns(session, ['b', 'absente'])
+        self.assertEqual(present, ['b'])
+        np.testing.assert_array_equal(values, [[3, 4, 5]])
+
+
+class TestModelStats(unittest.TestCase):
+    def make_session(self):
+        rng = np.random.default_rng(2)
+        values = np.stack([rng.normal(100, 10, 1_000), rng.normal(70, 3, 1_000)])
+        return Session(['Framerate', 'GPU temperature'], values, np.arange(1_000, dtype=np.int64) * 10**9)
+
+    def test_basic_stats_and_display(self):
+        model = StatsModel()
+        session = self.make_session()
+        stats = model.compute_basic_stats(session, ['Framerate', 'GPU temperature', 'CPU usage'])
+        self.assertAlmostEqual(stats['1% Lows']['Framerate'], pd.Series(session['Framerate']).quantile(0.01))
+        self.assertEqual(stats['1% Lows']['CPU usage'], 'N/A (colonne absente)')
+        self.assertNotIn('CPU usage', stats['Percentiles'])
+
+        _, rows = model.format_stats_for_display(stats)
+        by_name = {row[0]: row for row in rows}
+        self.assertIn('Médiane', by_name)
+        self.assertEqual(by_name['P99'][1], f"{stats['Percentiles']['Framerate']['p99']:.1f}")
+        self.assertEqual(by_name['P99'][6], 'N/A')
+
+        exported = summary_dict(stats)
+        self.assertEqual(exported['Framerate']['p95'], stats['Percentiles']['Framerate']['p95'])
+
+    def test_display_computes_missing_percentiles(self):
+        # Session sans 'Percentiles' (ancien .gsa) : calculés à l'affichage ; stats de streaming : 4 lignes
+        model = StatsModel()
+        _, rows = model.format_stats_for_display(self.make_session())
+        self.assertIn('Écart-type', [row[0] for row in rows])
+        _, rows = model.format_stats_for_display({})
+        self.assertEqual([row[0] for row in rows], ['Moyenne', 'Min', 'Max', '1% Low'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from model import StatsModel
+from streaming import RELATIVE_ACCURACY, QuantileSketch, RunningStats
+from synthetic_logs import generate_log
+
+
+class TestStreamingAccumulators( unittest.TestCase ):
+    def setUp(self):
+        rng = np.random.default_rng( 42 )
+        self.values = np.concatenate( [rng.normal( 60, 10, 20_000 ), np.zeros( 50 ), [np.nan] * 10] )
+
+    def test_running_stats_match_pandas(self):
+        running = RunningStats()
+        for chunk in np.array_split( self.values, 7 ):
+            running.update( chunk )
+
+        series = pd.Series( self.values )
+        self.assertEqual( running.count, series.count() )
+        self.assertAlmostEqual( running.mean, series.mean(), places=9 )
+        self.assertEqual( running.min, series.min() )
+        self.assertEqual( running.max, series.max() )
+
+    def test_sketch_merge_within_tolerance(self):
+        # Deux sketches remplis séparément puis fusionnés = même résultat qu'un seul sketch
+        left, right, single = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        half = len( self.values ) // 2
+        left.update( self.values[:half] )
+        right.update( self.values[half:] )
+        single.update( self.values )
+        left.merge( right )
+
+        expected = pd.Series( self.values ).quantile( 0.01 )
+        self.assertEqual( left.quantile( 0.01 ), single.quantile( 0.01 ) )
+        self.assertLessEqual( abs( left.quantile( 0.01 ) - expected ) / expected, 2 * RELATIVE_ACCURACY )
+
+
+class TestStreamingMatchesInMemory( unittest.TestCase ):
+    def test_same_stats_as_in_memory(self):
+        # Moyenne / min / max exacts, 1% low dans la tolérance du sketch (RELATIVE_ACCURACY)
+        with tempfile.TemporaryDirectory() as tmp:
+            log = generate_log( os.path.join( tmp, 'log.hml' ), 5_000, seed=3 )
+            model = StatsModel()
+            in_memory, error = model.compute_stats( log )
+            self.assertIsNone( error )
+            streamed, error = model.compute_stats( log, streaming=True )
+            self.assertIsNone( error )
+
+        stats, expected = streamed['stats'], in_memory['stats']
+        self.assertEqual( stats['Durée Partie'], expected['Durée Partie'] )
+        for column, low in expected['1% Lows'].items():
+            self.assertAlmostEqual( stats[f"Moyenne {column}"]['moyenne'], expected[f"Moyenne {column}"]['moyenne'],
+                                    places=9 )
+            self.assertEqual( stats[f"Min {column}"], expected[f"Min {column}"] )
+            self.assertEqual( stats[f"Max {column}"], expected[f"Max {column}"] )
+            self.assertLessEqual( abs( stats['1% Lows'][column] - low ), RELATIVE_ACCURACY * abs( low ) )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import pandas as pd
 import unittest
 
+from model import StatsModel
+
 
 class TestTimestampProcessing( unittest.TestCase ):
     def test_timestamp_conversion_and_sort(self):
@@ -30,6 +32,29 @@ class TestTimestampProcessing( unittest.TestCase ):
         # Affiche pour debug (optionnel)
         print( test_data )
 
+    def test_process_timestamp_column_crosses_midnight(self):
+        df = pd.DataFrame( {'Action type': 80,
+                            'Timestamp': ['21-11-2025 00:00:02', '20-11-2025 23:59:58', 'invalid',
+                                          ' 21-11-2025  00:00:00 ', '20-11-2025 23:59:59'],
+                            'Framerate': [5.0, 1.0, 9.0, 4.0, 2.0]} )
+
+        df, duration = StatsModel().process_timestamp_column( df, col_index=1 )
+
+        # Tri numérique sur la date complète, pas sur l'heure seule
+        self.assertTrue( pd.api.types.is_datetime64_any_dtype( df['Timestamp'] ) )
+        self.assertEqual( df['Framerate'].tolist(), [1.0, 2.0, 4.0, 5.0] )
+        self.assertEqual( duration, pd.Timedelta( seconds=4 ) )
+        self.assertEqual( df.attrs['sample_interval'], pd.Timedelta( seconds=1 ) )
+
+    def test_process_timestamp_column_datetime_fast_path(self):
+        times = pd.to_datetime( ['2025-11-20 10:00:05', '2025-11-20 10:00:00'] )
+        df = pd.DataFrame( {'Action type': 80, 'Timestamp': times, 'Framerate': [2.0, 1.0]} )
+
+        df, duration = StatsModel().process_timestamp_column( df, col_index=1 )
+
+        self.assertEqual( df['Framerate'].tolist(), [1.0, 2.0] )
+        self.assertEqual( duration, pd.Timedelta( seconds=5 ) )
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from model import StatsModel
+from session import Session
+from synthetic_logs import generate_log
+from windowing import (detect_segments, parse_ranges, rolling_max, rolling_mean, rolling_min,
+                       segment_reductions, window_samples)
+
+
+class TestRolling(unittest.TestCase):
+    def test_matches_pandas_rolling(self):
+        values = np.random.default_rng(0).normal(size=5000)
+        values[::17] = np.nan
+        for window in (1, 5, 64, 10_000):
+            expected = pd.Series(values).rolling(window, min_periods=1)
+            np.testing.assert_allclose(rolling_mean(values, window), expected.mean(), equal_nan=True)
+            np.testing.assert_allclose(rolling_min(values, window), expected.min(), equal_nan=True)
+            np.testing.assert_allclose(rolling_max(values, window), expected.max(), equal_nan=True)
+
+    def test_load_computes_only_rolling_mean(self):
+        # min / max glissants : jamais lus au chargement, donc pas calculés
+        with tempfile.TemporaryDirectory() as tmp:
+            log = generate_log(os.path.join(tmp, 'log.hml'), 2_000, seed=1)
+            unused = mock.Mock(side_effect=AssertionError("réduction inutilisée calculée"))
+            with mock.patch.dict('model.ROLLING_REDUCTIONS', {'min': unused, 'max': unused}):
+                result, error = StatsModel().compute_stats(log)
+        self.assertIsNone(error)
+        self.assertIn('pire moyenne', result['stats']['Fenêtre glissante']['Framerate'])
+
+        session = Session(['a'], np.arange(10, dtype=np.float64)[None], np.arange(10, dtype=np.int64) * 10**9)
+        rolling = StatsModel().compute_rolling_stats(session, 3, reductions=('moyenne', 'min', 'max'))
+        np.testing.assert_allclose(rolling['columns']['a']['min'], [0, 0, 0, 1, 2, 3, 4, 5, 6, 7])
+
+    def test_time_window_uses_sample_interval(self):
+        self.assertEqual(window_samples('60s', pd.Timedelta(seconds=1)), 60)
+        self.assertEqual(window_samples('1min', pd.Timedelta(milliseconds=500)), 120)
+        self.assertEqual(window_samples(25, pd.Timedelta(seconds=1)), 25)
+
+
+class TestSegments(unittest.TestCase):
+    def make_session(self):
+        # 10 min de jeu à ~100 FPS, 30 s de chargement à 10 FPS, 5 min de jeu à ~60 FPS
+        fps = np.concatenate([np.full(600, 100.0), np.full(30, 10.0), np.full(300, 60.0)])
+        fps[::50] -= 5
+        timestamps = np.int64(1_700_000_000) * 10**9 + np.arange(len(fps), dtype=np.int64) * 10**9
+        values = np.stack([fps, np.full(len(fps), 70.0)])
+        session = Session(['Framerate', 'GPU temperature'], values, timestamps,
+                          meta={'sample_interval': pd.Timedelta(seconds=1)})
+        return session
+
+    def test_loading_screen_splits_segments(self):
+        session = self.make_session()
+        bounds = detect_segments(session['Framerate'], session.timestamps, pd.Timedelta(seconds=1))
+        self.assertEqual(len(bounds), 2)
+        self.assertAlmostEqual(bounds[0][1], 600, delta=6)
+        self.assertAlmostEqual(bounds[1][0], 630, delta=6)
+
+    def test_segment_stats(self):
+        session = self.make_session()
+        segments = StatsModel().compute_segments(session)
+        self.assertEqual([s['source'] for s in segments], ['auto', 'auto'])
+        self.assertGreater(segments[0]['Framerate']['moyenne'], 95)
+        self.assertLess(segments[1]['Framerate']['moyenne'], 61)
+
+        ranges = parse_ranges('00:00:00-00:01:39, 00:01:00-00:02:00')
+        segments = StatsModel().compute_segments(session, ranges)
+        self.assertEqual(segments[0]['échantillons'], 100)
+        self.assertEqual(segments[1]['Framerate']['min'], 95.0)
+
+    def test_reductions_ignore_nan(self):
+        values = np.array([[1.0, np.nan, 3.0, 4.0, np.nan, np.nan]])
+        out = segment_reductions(values, [(0, 3), (3, 4), (4, 6)])
+        np.testing.assert_allclose(out['moyenne'], [[2.0, 4.0, np.nan]])
+        np.testing.assert_allclose(out['max'], [[3.0, 4.0, np.nan]])
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            parse_ranges('00:10:00-00:05:00')
+
+
+if __name__ == '__main__':
+    unittest.main()
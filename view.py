@@ -1,13 +1,13 @@
 # view.py ← VERSION FINALE 100% FONCTIONNELLE (copie-colle intégral)
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
+
+# matplotlib / numpy / pandas sont importés dans les méthodes qui s'en servent :
+# la fenêtre principale s'affiche sans attendre leur chargement (voir startup.py)
 
 
 class StatsView:
-    def __init__(self, root, model):
+    def __init__(self, root, model=None):
         self.root = root
         self.model = model
         self.root.title("Game Stats Analyzer")
@@ -46,9 +46,22 @@ class StatsView:
         self.load_button = ttk.Button(self.main_frame, text="Charger le fichier Excel", style="Accent.TButton")
         self.load_button.pack(ipadx=60, ipady=20)
 
-        self.results_frame = None
+        self.follow_button = ttk.Button(self.main_frame, text="Suivre un log en direct", style="Success.TButton")
+        self.follow_button.pack(pady=(30, 0), ipadx=20)
+
+        self.compare_button = ttk.Button(self.main_frame, text="Comparer plusieurs logs", style="Success.TButton")
+        self.compare_button.pack(pady=(15, 0), ipadx=20)
+
+        self.results = None  # vue des résultats, construite une fois (voir build_results)
+        self.results_frame = None  # vues reconstruites à chaque affichage (comparaison, live)
+        self.results_figure = None
         self.back_button = None
         self.export_button = None
+        self.live = None  # widgets du mode live, mis à jour en place (voir update_live)
+
+        self.loading_frame = None
+        self.progress_bar = None
+        self.progress_label = None
 
     def center_window(self):
         self.root.update_idletasks()
@@ -56,20 +69,48 @@ class StatsView:
         x, y = (self.root.winfo_screenwidth() // 2) - (w // 2), (self.root.winfo_screenheight() // 2) - (h // 2)
         self.root.geometry(f"{w}x{h}+{x}+{y}")
 
-    def show_results(self, tree_columns, formatted_data, duration, df):
-        if self.results_frame:
-            self.results_frame.destroy()
+    def show_results(self, tree_columns, formatted_data, duration, session, diagnostics=None, segments=None,
+                     rolling=None, events=None):
+        # La vue est construite au premier affichage puis réutilisée : un rechargement ne fait
+        # que remplacer les données (lignes du tableau, courbes, limites des axes)
+        self.release_results_frame()
+        if self.results is None:
+            self.build_results()
+        r = self.results
 
         self.root.geometry("1450x950")
         self.center_window()
-
-        self.results_frame = ttk.Frame(self.root)
-        self.results_frame.pack(fill="both", expand=True)
-
-        self.results_frame.grid_rowconfigure(0, weight=1)
-        self.results_frame.grid_columnconfigure(0, weight=1)
-
-        notebook = ttk.Notebook(self.results_frame)
+        r['frame'].pack(fill="both", expand=True)
+        self.back_button = r['back']
+        self.export_button = r['export']
+
+        total = int(duration.total_seconds())
+        r['duration'].config(text=f"Durée : {total // 3600:02d}:{(total % 3600) // 60:02d}:{total % 60:02d}")
+        self.update_rows(r['tree'], tree_columns, formatted_data)
+        self.update_graph(session, segments, rolling, events)
+
+        # Onglets optionnels : masqués plutôt que détruits
+        self.toggle_tab(r['tab_segments'], segments is not None)
+        if segments is not None:
+            self.update_segments(segments)
+        self.toggle_tab(r['tab_events'], events is not None)
+        if events is not None:
+            self.update_events(events)
+        self.toggle_tab(r['tab_diag'], diagnostics is not None)
+        if diagnostics is not None:
+            self.update_diagnostics(diagnostics)
+        r['notebook'].select(r['tab_stats'])
+
+    def build_results(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+        frame = ttk.Frame(self.root)
+        frame.grid_rowconfigure(0, weight=1)
+        frame.grid_columnconfigure(0, weight=1)
+
+        notebook = ttk.Notebook(frame)
         notebook.grid(row=0, column=0, sticky="nsew", padx=25, pady=(25, 0))
 
         # === ONGLETS ===
@@ -78,89 +119,686 @@ class StatsView:
 
         ttk.Label(tab_stats, text="Résumé de la partie", font=("Segoe UI", 26, "bold"),
                   foreground="#58a6ff").pack(pady=(30, 10))
-        h = int(duration.total_seconds()) // 3600
-        m = (int(duration.total_seconds()) % 3600) // 60
-        s = int(duration.total_seconds()) % 60
-        ttk.Label(tab_stats, text=f"Durée : {h:02d}:{m:02d}:{s:02d}",
-                  font=("Segoe UI", 16), foreground="#58a6ff").pack(pady=(0, 30))
+        duration_label = ttk.Label(tab_stats, text="", font=("Segoe UI", 16), foreground="#58a6ff")
+        duration_label.pack(pady=(0, 30))
 
-        tree = ttk.Treeview(tab_stats, columns=tree_columns, show="headings")
+        tree = ttk.Treeview(tab_stats, show="headings")
         tree.pack(fill="both", expand=True, padx=40, pady=10)
-        tree.heading("Stat", text="Statistique")
-        tree.column("Stat", width=220, anchor="w")
-        for col in tree_columns[1:]:
-            tree.heading(col, text=col)
-            tree.column(col, width=150, anchor="center")
-        for row in formatted_data:
-            tree.insert("", "end", values=row)
 
-        # Graphiques
+        # Graphiques : figure, axes et courbes créés une fois, mis à jour par set_data
         tab_graph = ttk.Frame(notebook, style="Card.TFrame")
         notebook.add(tab_graph, text="   Graphiques   ")
 
-        fig = plt.Figure(figsize=(14, 8), dpi=100, facecolor='#0d1117')
+        fig = Figure(figsize=(14, 8), dpi=100, facecolor='#0d1117')
         ax1 = fig.add_subplot(111, facecolor='#0d1117')
 
-        total_minutes = len(df) / 60
-        time_minutes = np.linspace(0, total_minutes, len(df))
-
-        line1 = ax1.plot(time_minutes, df['Framerate'], color="#58a6ff", linewidth=3, label="Framerate (FPS)")[0]
+        line1 = ax1.plot([], [], color="#58a6ff", linewidth=3, label="Framerate (FPS)")[0]
         ax1.set_ylabel("FPS", color="#58a6ff", fontsize=14, fontweight="bold")
         ax1.tick_params(axis='y', labelcolor="#58a6ff")
-        ax1.set_ylim(bottom=0)
 
         ax2 = ax1.twinx()
-        line2 = ax2.plot(time_minutes, df['GPU temperature'], color="#ff5555", linewidth=3, label="GPU Temp (°C)")[0]
+        line2 = ax2.plot([], [], color="#ff5555", linewidth=3, label="GPU Temp (°C)")[0]
         ax2.set_ylabel("GPU °C", color="#ff5555", fontsize=14, fontweight="bold")
         ax2.tick_params(axis='y', labelcolor="#ff5555")
 
         ax3 = ax1.twinx()
         ax3.spines['right'].set_position(('outward', 60))
-        line3 = ax3.plot(time_minutes, df['CPU usage'], color="#50fa7b", linewidth=3, label="CPU Usage (%)")[0]
+        line3 = ax3.plot([], [], color="#50fa7b", linewidth=3, label="CPU Usage (%)")[0]
         ax3.set_ylabel("CPU %", color="#50fa7b", fontsize=14, fontweight="bold")
         ax3.tick_params(axis='y', labelcolor="#50fa7b")
         ax3.set_ylim(0, 100)
 
-        ax1.set_xlabel("Temps de jeu", color="white", fontsize=13)
-        ax1.set_xticks(np.arange(0, total_minutes + 1, max(1, total_minutes // 15)))
-        ax1.set_xticklabels([f"{int(m)}:{int((m%1)*60):02d}" for m in np.arange(0, total_minutes + 1, max(1, total_minutes // 15))],
-                            color="white")
+        # Moyenne glissante, segments de jeu en fond, saccades et limite thermique :
+        # un artiste chacun, masqué quand la session n'a pas la donnée
+        line4 = ax1.plot([], [], color="#f1fa8c", linewidth=2, linestyle="--")[0]
+        spans = ax1.broken_barh([], (0, 1), transform=ax1.get_xaxis_transform(),
+                                color="#58a6ff", alpha=0.06, linewidth=0)
+        stutters = ax1.plot([], [], linestyle="none", marker="v", markersize=6, color="#ffb86c",
+                            label="Saccades")[0]
+        thermal = ax1.broken_barh([], (0, 1), transform=ax1.get_xaxis_transform(),
+                                  color="#ff5555", alpha=0.15, linewidth=0, label="Limite thermique")
+        # Événement sélectionné dans la liste : artiste animé, redessiné par blitting
+        highlight = ax1.axvspan(0, 0, color="#e6edf3", alpha=0.25, linewidth=0, animated=True, visible=False)
 
+        ax1.set_xlabel("Temps de jeu", color="white", fontsize=13)
+        # Locator / formatter plutôt que des ticks figés : les graduations suivent le zoom
+        ax1.xaxis.set_major_locator(MaxNLocator(nbins=15, steps=[1, 2, 5, 10]))
+        ax1.xaxis.set_major_formatter(FuncFormatter(lambda m, _: f"{int(m)}:{int(round((m % 1) * 60)):02d}"))
+        ax1.tick_params(axis='x', labelcolor="white")
         ax1.grid(True, color="#30363d", linestyle="--", alpha=0.5)
 
-        lines = [line1, line2, line3]
-        labels = [l.get_label() for l in lines]
-        ax1.legend(lines, labels, loc="upper right", frameon=True, facecolor="#161b22",
-                   edgecolor="#30363d", labelcolor="white", fontsize=13)
-
         fig.suptitle("Évolution complète de la partie", color="white", fontsize=22, fontweight="bold")
         fig.tight_layout(rect=[0, 0.02, 1, 0.95])
 
         canvas = FigureCanvasTkAgg(fig, master=tab_graph)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=40, pady=30)
+        toolbar = NavigationToolbar2Tk(canvas, tab_graph, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side="bottom", fill="x", padx=40)
+        visible_label = ttk.Label(tab_graph, text="", font=("Segoe UI", 11), foreground="#8b949e")
+        visible_label.pack(side="bottom", anchor="e", padx=40)
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=40, pady=(30, 0))
+
+        # Zoom / pan : la plage visible est re-décimée depuis les données pleine résolution
+        redecimation = self.connect_redecimation(canvas, (ax1, ax2, ax3), [], [])
+
+        tab_segments = ttk.Frame(notebook, style="Card.TFrame")
+        notebook.add(tab_segments, text="   Segments   ")
+        self.build_segments_tab(tab_segments)
+
+        tab_events = ttk.Frame(notebook, style="Card.TFrame")
+        notebook.add(tab_events, text="   Événements   ")
+
+        tab_diag = ttk.Frame(notebook, style="Card.TFrame")
+        notebook.add(tab_diag, text="   Diagnostics   ")
+        self.build_diagnostics_tab(tab_diag)
 
         # === BOUTONS ===
-        btn_frame = tk.Frame(self.results_frame, bg="#0d1117")
+        btn_frame = tk.Frame(frame, bg="#0d1117")
         btn_frame.grid(row=1, column=0, sticky="ew", pady=(20, 30))
         btn_frame.grid_columnconfigure(0, weight=1)
 
         inner = tk.Frame(btn_frame, bg="#0d1117")
         inner.grid(row=0, column=0)
 
+        back = ttk.Button(inner, text="Retour", style="Success.TButton")
+        back.pack(side="left", padx=200)
+
+        export = ttk.Button(inner, text="Exporter", style="Warning.TButton")
+        export.pack(side="right", padx=200)
+
+        self.results = {'frame': frame, 'notebook': notebook, 'tab_stats': tab_stats, 'tab_graph': tab_graph,
+                        'tab_segments': tab_segments, 'tab_events': tab_events, 'tab_diag': tab_diag,
+                        'duration': duration_label, 'tree': tree, 'fig': fig, 'canvas': canvas,
+                        'toolbar': toolbar, 'axes': (ax1, ax2, ax3), 'lines': (line1, line2, line3, line4),
+                        'spans': spans, 'stutters': stutters, 'thermal': thermal, 'highlight': highlight,
+                        'visible_label': visible_label, 'redecimation': redecimation, 'events': None,
+                        'total_minutes': 0, 'background': None, 'back': back, 'export': export}
+        self.build_events_tab(tab_events)
+        self.connect_visible_events()
+        canvas.mpl_connect('draw_event', self.on_results_draw)
+
+    def update_rows(self, tree, tree_columns, formatted_data):
+        # Lignes identifiées par le nom de la stat : modifiées en place, pas recréées
+        if tuple(tree['columns']) != tuple(tree_columns):
+            tree.delete(*tree.get_children())
+            tree.configure(columns=tree_columns)
+            tree.heading("Stat", text="Statistique")
+            tree.column("Stat", width=220, anchor="w")
+            for col in tree_columns[1:]:
+                tree.heading(col, text=col)
+                tree.column(col, width=150, anchor="center")
+        names = [str(row[0]) for row in formatted_data]
+        stale = set(tree.get_children()) - set(names)
+        if stale:
+            tree.delete(*stale)
+        for i, (name, row) in enumerate(zip(names, formatted_data)):
+            if tree.exists(name):
+                tree.item(name, values=row)
+                tree.move(name, "", i)
+            else:
+                tree.insert("", i, iid=name, values=row)
+
+    def update_graph(self, session, segments=None, rolling=None, events=None):
+        from downsampling import minmax_decimate
+
+        r = self.results
+        ax1, ax2, ax3 = r['axes']
+        line1, line2, line3, line4 = r['lines']
+
+        time_minutes = self.elapsed_minutes(session)
+        total_minutes = time_minutes[-1] if len(time_minutes) else 0
+        n_buckets = self.graph_buckets(r['fig'])
+
+        # Séries décimées à ~la largeur du canvas en pixels (les pics / chutes restent visibles)
+        series = [(line1, session['Framerate']), (line2, session['GPU temperature']), (line3, session['CPU usage'])]
+        if rolling is not None:
+            line4.set_label(f"FPS moyen ({rolling['window']})")
+            series.append((line4, rolling['Framerate']))
+        line4.set_visible(rolling is not None)
+        for line, y in series:
+            line.set_data(*minmax_decimate(time_minutes, y, n_buckets))
+
+        self.set_spans(r['spans'], [(s['début'].total_seconds() / 60, s['fin'].total_seconds() / 60)
+                                    for s in segments or []])
+        self.draw_events(events)
+        r['highlight'].set_visible(False)
+
+        # Limites : x sur toute la session (courbes déjà décimées pour cette plage), y recalculé
+        xlim = (0.0, float(max(total_minutes, 1 / 60)))
+        r['redecimation'].update(x=time_minutes, series=series, xlim=xlim)
+        r['total_minutes'] = total_minutes
+        for ax in (ax1, ax2):
+            ax.relim(visible_only=True)
+            ax.autoscale_view(scalex=False)
+        ax1.set_ylim(bottom=0)
+        ax1.set_xlim(*xlim)
+        r['count_visible'](ax1)  # même plage que la session précédente : pas de xlim_changed
+
+        lines = [line for line in (line1, line2, line3, line4, r['stutters'], r['thermal']) if line.get_visible()]
+        ax1.legend(lines, [l.get_label() for l in lines], loc="upper right", frameon=True, facecolor="#161b22",
+                   edgecolor="#30363d", labelcolor="white", fontsize=13)
+
+        r['toolbar'].update()  # historique du zoom (bouton Accueil) remis à la nouvelle session
+        r['canvas'].draw_idle()
+
+    def toggle_tab(self, tab, visible):
+        notebook = self.results['notebook']
+        if visible:
+            notebook.add(tab)  # ré-affiche un onglet masqué, à sa place
+        else:
+            notebook.hide(tab)
+
+    def release_results_frame(self):
+        # Vues reconstruites à chaque affichage (comparaison, live) : la figure est vidée avec
+        # le cadre pour ne pas garder les séries en mémoire ; la vue des résultats est masquée
+        if self.results_frame:
+            self.results_frame.destroy()
+            self.results_frame = None
+        if self.results_figure is not None:
+            self.results_figure.clear()
+            self.results_figure = None
+        if self.results:
+            self.results['frame'].pack_forget()
+
+    # === GRAPHIQUES ===
+    def elapsed_minutes(self, session):
+        # Axe X = temps écoulé réel (timestamps), pas le numéro de ligne
+        return session.elapsed_seconds() / 60
+
+    def graph_buckets(self, fig):
+        # Un bucket min/max par pixel de largeur d'axe
+        return max(int(fig.get_figwidth() * fig.dpi), 100)
+
+    def connect_redecimation(self, canvas, axes, x, series):
+        # -> état partagé avec le callback : une vue réutilisée y remplace x et les séries
+        from downsampling import decimate_range
+
+        state = {'xlim': None, 'x': x, 'series': series}
+
+        def on_xlim_changed(ax):
+            xlim = tuple(ax.get_xlim())
+            if xlim == state['xlim']:
+                return  # les axes jumeaux signalent le même changement
+            state['xlim'] = xlim
+            width = max(canvas.get_tk_widget().winfo_width(), 100)
+            for line, y in state['series']:
+                line.set_data(*decimate_range(state['x'], y, xlim[0], xlim[1], width))
+            canvas.draw_idle()
+
+        for ax in axes:
+            ax.callbacks.connect('xlim_changed', on_xlim_changed)
+        return state
+
+    # === ÉVÉNEMENTS ===
+    EVENT_COLUMNS = ("Type", "Début", "Durée", "Valeur")
+    EVENT_UNITS = {'saccade': "FPS min", 'limite thermique': "°C max", 'saturation GPU': "% max",
+                   'saturation CPU': "% max"}
+    EVENT_MARGIN_MINUTES = 0.5  # contexte affiché de part et d'autre d'un événement sélectionné
+    ALL_EVENTS = "Tous"
+
+    def set_spans(self, collection, spans):
+        # Bandes verticales [(début, fin)] en minutes, sur toute la hauteur de l'axe
+        collection.set_verts([[(a, 0), (a, 1), (b, 1), (b, 0)] for a, b in spans])
+        collection.set_visible(bool(spans))
+
+    def draw_events(self, events):
+        # Un seul artiste par type (marqueurs pour les saccades, bandes pour la limite thermique),
+        # quel que soit le nombre d'événements
+        from events import STUTTER, THERMAL
+
+        r = self.results
+        r['events'] = events
+        to_minutes = 1 / 60e9
+        if events is not None and events.count(STUTTER):
+            r['stutters'].set_data((events.starts[STUTTER] - events.origin) * to_minutes, events.values[STUTTER])
+            r['stutters'].set_visible(True)
+        else:
+            r['stutters'].set_data([], [])
+            r['stutters'].set_visible(False)
+        thermal = []
+        if events is not None and events.count(THERMAL):
+            thermal = list(zip((events.starts[THERMAL] - events.origin) * to_minutes,
+                               (events.stops[THERMAL] - events.origin) * to_minutes))
+        self.set_spans(r['thermal'], thermal)
+
+    def connect_visible_events(self):
+        # Nombre d'événements dans la plage visible : deux recherches dichotomiques par type
+        r = self.results
+        ax = r['axes'][0]
+
+        def on_xlim_changed(ax):
+            events = r['events']
+            if events is None:
+                r['visible_label'].config(text="")
+                return
+            lo, hi = ax.get_xlim()
+            start, stop = events.origin + int(lo * 60e9), events.origin + int(hi * 60e9)
+            counts = [f"{kind} : {events.count_between(start, stop, [kind])}" for kind in events.kinds]
+            r['visible_label'].config(text="Plage visible — " + ("  |  ".join(counts) if counts
+                                                                 else "aucun événement"))
+
+        ax.callbacks.connect('xlim_changed', on_xlim_changed)
+        r['count_visible'] = on_xlim_changed
+
+    def on_results_draw(self, _):
+        # Après chaque rendu complet : fond mémorisé, puis l'événement sélectionné par-dessus
+        r = self.results
+        r['background'] = r['canvas'].copy_from_bbox(r['fig'].bbox)
+        if r['highlight'].get_visible():
+            r['axes'][0].draw_artist(r['highlight'])
+
+    def zoom_to_event(self, event):
+        # Événement déjà visible en entier : seule la bande de sélection bouge (blitting, sans
+        # re-rendre les courbes) ; sinon on zoome dessus et le rendu complet la redessine
+        r = self.results
+        ax, canvas, highlight = r['axes'][0], r['canvas'], r['highlight']
+        origin = r['events'].origin
+        start = (event.start - origin) / 60e9
+        stop = (event.stop - origin) / 60e9
+        highlight.set_x(start)
+        highlight.set_width(max(stop - start, 1 / 600))
+        highlight.set_visible(True)
+
+        lo, hi = ax.get_xlim()
+        if lo <= start and stop <= hi and r['background'] is not None:
+            canvas.restore_region(r['background'])
+            ax.draw_artist(highlight)
+            canvas.blit(r['fig'].bbox)
+            return
+        margin = max(self.EVENT_MARGIN_MINUTES, (stop - start) / 2)
+        ax.set_xlim(max(start - margin, 0), min(stop + margin, max(r['total_minutes'], 1 / 60)))
+        canvas.draw_idle()
+
+    def build_events_tab(self, parent):
+        bar = tk.Frame(parent, bg="#161b22")
+        bar.pack(fill="x", padx=40, pady=(30, 10))
+        ttk.Label(bar, text="Type :", font=("Segoe UI", 11), foreground="#8b949e").pack(side="left")
+        kind_box = ttk.Combobox(bar, values=[self.ALL_EVENTS], state="readonly", width=25)
+        kind_box.set(self.ALL_EVENTS)
+        kind_box.pack(side="left", padx=10)
+        count_label = ttk.Label(bar, text="", font=("Segoe UI", 11), foreground="#8b949e")
+        count_label.pack(side="left", padx=10)
+
+        tree = ttk.Treeview(parent, columns=self.EVENT_COLUMNS, show="headings")
+        tree.pack(fill="both", expand=True, padx=40, pady=10)
+        for col in self.EVENT_COLUMNS:
+            tree.heading(col, text=col)
+            tree.column(col, width=160, anchor="center")
+
+        def select(_):
+            selection = tree.selection()
+            if selection:
+                self.results['notebook'].select(self.results['tab_graph'])
+                self.zoom_to_event(self.results['listed'][int(selection[0])])
+
+        kind_box.bind("<<ComboboxSelected>>", lambda _: self.fill_events())
+        tree.bind("<<TreeviewSelect>>", select)
+        self.results.update(events_kind=kind_box, events_count=count_label, events_tree=tree, listed=[])
+
+    def update_events(self, events):
+        kind_box = self.results['events_kind']
+        kind_box.configure(values=[self.ALL_EVENTS] + events.kinds)
+        if kind_box.get() not in events.kinds:
+            kind_box.set(self.ALL_EVENTS)
+        self.fill_events()
+
+    def fill_events(self):
+        def fmt(td):
+            total = td.total_seconds()
+            return f"{int(total) // 3600:02d}:{(int(total) % 3600) // 60:02d}:{total % 60:04.1f}"
+
+        r = self.results
+        events, kind, tree = r['events'], r['events_kind'].get(), r['events_tree']
+        listed = events.query(kinds=None if kind == self.ALL_EVENTS else [kind])
+        r['listed'] = listed
+        tree.delete(*tree.get_children())
+        for i, event in enumerate(listed):
+            start = events.elapsed(event.start)
+            tree.insert("", "end", iid=str(i), values=(
+                event.kind, fmt(start), fmt(events.elapsed(event.stop) - start),
+                f"{event.value:.1f} {self.EVENT_UNITS.get(event.kind, '')}".strip()))
+        r['events_count'].config(text=f"{len(listed)} événement(s)")
+
+    # === COMPARAISON ===
+    COMPARE_COLORS = ["#58a6ff", "#ff5555", "#50fa7b", "#f1fa8c", "#bd93f9", "#ffb86c", "#8be9fd",
+                      "#ff79c6", "#e6edf3", "#6272a4"]
+
+    def show_comparison(self, tree_columns, formatted_data, sessions):
+        # sessions : [(nom, Session)] ; les courbes sont alignées sur le temps écoulé depuis le
+        # début de chaque session, et chaque série est décimée séparément (re-décimée au zoom)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.ticker import FuncFormatter, MaxNLocator
+        from downsampling import minmax_decimate
+
+        self.release_results_frame()
+
+        self.root.geometry("1450x950")
+        self.center_window()
+
+        self.results_frame = ttk.Frame(self.root)
+        self.results_frame.pack(fill="both", expand=True)
+        self.results_frame.grid_rowconfigure(0, weight=1)
+        self.results_frame.grid_columnconfigure(0, weight=1)
+
+        notebook = ttk.Notebook(self.results_frame)
+        notebook.grid(row=0, column=0, sticky="nsew", padx=25, pady=(25, 0))
+
+        tab_stats = ttk.Frame(notebook, style="Card.TFrame")
+        notebook.add(tab_stats, text="   Comparaison   ")
+        ttk.Label(tab_stats, text=f"Comparaison de {len(sessions)} sessions", font=("Segoe UI", 26, "bold"),
+                  foreground="#58a6ff").pack(pady=(30, 10))
+        ttk.Label(tab_stats, text=f"Écarts par rapport à : {sessions[0][0]}",
+                  font=("Segoe UI", 13), foreground="#8b949e").pack(pady=(0, 20))
+
+        table = ttk.Frame(tab_stats, style="Card.TFrame")
+        table.pack(fill="both", expand=True, padx=40, pady=10)
+        tree = ttk.Treeview(table, columns=tree_columns, show="headings")
+        scroll_y = ttk.Scrollbar(table, orient="vertical", command=tree.yview)
+        scroll_x = ttk.Scrollbar(table, orient="horizontal", command=tree.xview)
+        tree.configure(yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set)
+        scroll_y.pack(side="right", fill="y")
+        scroll_x.pack(side="bottom", fill="x")
+        tree.pack(fill="both", expand=True)
+        tree.heading("Stat", text="Statistique")
+        tree.column("Stat", width=240, anchor="w", stretch=False)
+        for col in tree_columns[1:]:
+            tree.heading(col, text=col)
+            tree.column(col, width=160, anchor="center", stretch=False)
+        for row in formatted_data:
+            tree.insert("", "end", values=row)
+
+        tab_graph = ttk.Frame(notebook, style="Card.TFrame")
+        notebook.add(tab_graph, text="   Graphiques   ")
+
+        fig = Figure(figsize=(14, 8), dpi=100, facecolor='#0d1117')
+        self.results_figure = fig
+        ax_fps = fig.add_subplot(211, facecolor='#0d1117')
+        ax_gpu = fig.add_subplot(212, facecolor='#0d1117', sharex=ax_fps)
+        n_buckets = self.graph_buckets(fig)
+
+        series_by_x = []
+        total_minutes = 0
+        for i, (name, session) in enumerate(sessions):
+            color = self.COMPARE_COLORS[i % len(self.COMPARE_COLORS)]
+            minutes = self.elapsed_minutes(session)
+            if len(minutes):
+                total_minutes = max(total_minutes, minutes[-1])
+            line_fps = ax_fps.plot(*minmax_decimate(minutes, session['Framerate'], n_buckets),
+                                   color=color, linewidth=1.5, label=name)[0]
+            line_gpu = ax_gpu.plot(*minmax_decimate(minutes, session['GPU temperature'], n_buckets),
+                                   color=color, linewidth=1.5, label=name)[0]
+            series_by_x.append((minutes, [(line_fps, session['Framerate']), (line_gpu, session['GPU temperature'])]))
+
+        for ax, label in ((ax_fps, "FPS"), (ax_gpu, "GPU °C")):
+            ax.set_ylabel(label, color="white", fontsize=13, fontweight="bold")
+            ax.tick_params(axis='both', labelcolor="white")
+            ax.grid(True, color="#30363d", linestyle="--", alpha=0.5)
+        ax_fps.set_ylim(bottom=0)
+        ax_fps.legend(loc="upper right", frameon=True, facecolor="#161b22", edgecolor="#30363d",
+                      labelcolor="white", fontsize=11)
+        ax_gpu.set_xlabel("Temps écoulé depuis le début de chaque session", color="white", fontsize=13)
+        ax_gpu.set_xlim(0, max(total_minutes, 1 / 60))
+        ax_gpu.xaxis.set_major_locator(MaxNLocator(nbins=15, steps=[1, 2, 5, 10]))
+        ax_gpu.xaxis.set_major_formatter(FuncFormatter(lambda m, _: f"{int(m)}:{int(round((m % 1) * 60)):02d}"))
+        fig.tight_layout(rect=[0, 0.02, 1, 0.97])
+
+        canvas = FigureCanvasTkAgg(fig, master=tab_graph)
+        toolbar = NavigationToolbar2Tk(canvas, tab_graph, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side="bottom", fill="x", padx=40)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=40, pady=(30, 0))
+
+        # Axe X partagé : chaque session garde son propre x, re-décimé à la plage visible
+        for minutes, series in series_by_x:
+            self.connect_redecimation(canvas, (ax_fps, ax_gpu), minutes, series)
+
+        btn_frame = tk.Frame(self.results_frame, bg="#0d1117")
+        btn_frame.grid(row=1, column=0, sticky="ew", pady=(20, 30))
+        btn_frame.grid_columnconfigure(0, weight=1)
+        inner = tk.Frame(btn_frame, bg="#0d1117")
+        inner.grid(row=0, column=0)
         self.back_button = ttk.Button(inner, text="Retour", style="Success.TButton")
         self.back_button.pack(side="left", padx=200)
+        self.export_button = ttk.Button(inner, text="Exporter JSON", style="Warning.TButton")
+        self.export_button.pack(side="right", padx=200)
+
+    # === MODE LIVE ===
+    def show_live(self, tree_columns, stat_names, file_name):
+        # Construit la vue une seule fois ; update_live ne fait que changer les données
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.release_results_frame()
+
+        self.root.geometry("1450x950")
+        self.center_window()
+
+        self.results_frame = ttk.Frame(self.root)
+        self.results_frame.pack(fill="both", expand=True)
+        self.results_frame.grid_rowconfigure(0, weight=1)
+        self.results_frame.grid_columnconfigure(0, weight=1)
 
+        notebook = ttk.Notebook(self.results_frame)
+        notebook.grid(row=0, column=0, sticky="nsew", padx=25, pady=(25, 0))
+
+        tab_stats = ttk.Frame(notebook, style="Card.TFrame")
+        notebook.add(tab_stats, text="   Statistiques   ")
+        ttk.Label(tab_stats, text=f"En direct : {file_name}", font=("Segoe UI", 26, "bold"),
+                  foreground="#58a6ff").pack(pady=(30, 10))
+        status = ttk.Label(tab_stats, text="En attente de données...", font=("Segoe UI", 16), foreground="#58a6ff")
+        status.pack(pady=(0, 30))
+
+        tree = ttk.Treeview(tab_stats, columns=tree_columns, show="headings")
+        tree.pack(fill="both", expand=True, padx=40, pady=10)
+        tree.heading("Stat", text="Statistique")
+        tree.column("Stat", width=220, anchor="w")
+        for col in tree_columns[1:]:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor="center")
+        # Une ligne par stat, créée une fois (iid = nom de la stat)
+        for name in stat_names:
+            tree.insert("", "end", iid=name, values=(name,) + ("",) * (len(tree_columns) - 1))
+
+        tab_graph = ttk.Frame(notebook, style="Card.TFrame")
+        notebook.add(tab_graph, text="   Graphiques   ")
+        fig = Figure(figsize=(14, 8), dpi=100, facecolor='#0d1117')
+        ax1 = fig.add_subplot(111, facecolor='#0d1117')
+        ax2 = ax1.twinx()
+        ax3 = ax1.twinx()
+        ax3.spines['right'].set_position(('outward', 60))
+        lines = {
+            'Framerate': ax1.plot([], [], color="#58a6ff", linewidth=2, label="Framerate (FPS)")[0],
+            'GPU temperature': ax2.plot([], [], color="#ff5555", linewidth=2, label="GPU Temp (°C)")[0],
+            'CPU usage': ax3.plot([], [], color="#50fa7b", linewidth=2, label="CPU Usage (%)")[0],
+        }
+        for ax, label, color in ((ax1, "FPS", "#58a6ff"), (ax2, "GPU °C", "#ff5555"), (ax3, "CPU %", "#50fa7b")):
+            ax.set_ylabel(label, color=color, fontsize=14, fontweight="bold")
+            ax.tick_params(axis='y', labelcolor=color)
+        ax3.set_ylim(0, 100)
+        ax1.set_xlabel("Temps de jeu (minutes)", color="white", fontsize=13)
+        ax1.tick_params(axis='x', labelcolor="white")
+        ax1.grid(True, color="#30363d", linestyle="--", alpha=0.5)
+        ax1.legend(list(lines.values()), [l.get_label() for l in lines.values()], loc="upper left",
+                   frameon=True, facecolor="#161b22", edgecolor="#30363d", labelcolor="white", fontsize=13)
+        fig.tight_layout(rect=[0, 0.02, 1, 0.97])
+
+        canvas = FigureCanvasTkAgg(fig, master=tab_graph)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=40, pady=(30, 0))
+
+        btn_frame = tk.Frame(self.results_frame, bg="#0d1117")
+        btn_frame.grid(row=1, column=0, sticky="ew", pady=(20, 30))
+        btn_frame.grid_columnconfigure(0, weight=1)
+        inner = tk.Frame(btn_frame, bg="#0d1117")
+        inner.grid(row=0, column=0)
+        self.back_button = ttk.Button(inner, text="Arrêter", style="Success.TButton")
+        self.back_button.pack(side="left", padx=200)
         self.export_button = ttk.Button(inner, text="Exporter JSON", style="Warning.TButton")
         self.export_button.pack(side="right", padx=200)
 
+        self.live = {'tree': tree, 'status': status, 'lines': lines, 'axes': (ax1, ax2, ax3),
+                     'canvas': canvas, 'fig': fig}
+
+    def update_live(self, formatted_data, duration, rows, series):
+        # Données bornées (stats + séries décimées) : le coût ne dépend pas de la durée de session
+        if not self.live:
+            return
+        tree = self.live['tree']
+        for row in formatted_data:
+            if tree.exists(row[0]):
+                tree.item(row[0], values=row)
+
+        total = int(duration.total_seconds())
+        self.live['status'].config(text=f"Durée : {total // 3600:02d}:{(total % 3600) // 60:02d}:{total % 60:02d}"
+                                        f"  —  {rows} échantillons")
+
+        for col, line in self.live['lines'].items():
+            if col in series:
+                line.set_data(*series[col])
+        ax1, ax2, _ = self.live['axes']
+        for ax in (ax1, ax2):
+            ax.relim()
+            ax.autoscale_view()
+        ax1.set_ylim(bottom=0)
+        ax1.set_xlim(0, max(duration.total_seconds() / 60, 1 / 60))
+        self.live['canvas'].draw_idle()
+
+    def hide_live(self):
+        if self.live:
+            self.live['fig'].clear()
+        self.live = None
+
+    # === SEGMENTS ===
+    SEGMENT_COLUMNS = ("#", "Début", "Fin", "Durée", "FPS moyen", "FPS min", "1% low FPS",
+                       "GPU °C moyen", "CPU % moyen")
+
+    def build_segments_tab(self, parent):
+        bar = tk.Frame(parent, bg="#161b22")
+        bar.pack(fill="x", padx=40, pady=(30, 10))
+        ttk.Label(bar, text="Plages (HH:MM:SS-HH:MM:SS, ...) — vide = détection automatique :",
+                  font=("Segoe UI", 11), foreground="#8b949e").pack(side="left")
+        self.segments_entry = ttk.Entry(bar, width=50)
+        self.segments_entry.pack(side="left", padx=10)
+        self.segments_button = ttk.Button(bar, text="Appliquer")
+        self.segments_button.pack(side="left")
+        if getattr(self, '_segments_command', None):
+            self.set_segments_command(self._segments_command)
+
+        self.segments_tree = ttk.Treeview(parent, columns=self.SEGMENT_COLUMNS, show="headings")
+        self.segments_tree.pack(fill="both", expand=True, padx=40, pady=10)
+        for col in self.SEGMENT_COLUMNS:
+            self.segments_tree.heading(col, text=col)
+            self.segments_tree.column(col, width=120, anchor="center")
+        self.segments_tree.column("#", width=50)
+
+    def update_segments(self, segments):
+        def fmt(td):
+            total = int(td.total_seconds())
+            return f"{total // 3600:02d}:{(total % 3600) // 60:02d}:{total % 60:02d}"
+
+        def num(value):
+            return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+        tree = self.segments_tree
+        tree.delete(*tree.get_children())
+        for i, seg in enumerate(segments, 1):
+            fps, gpu, cpu = seg.get('Framerate', {}), seg.get('GPU temperature', {}), seg.get('CPU usage', {})
+            tree.insert("", "end", values=(i, fmt(seg['début']), fmt(seg['fin']), fmt(seg['durée']),
+                                           num(fps.get('moyenne', 'N/A')), num(fps.get('min', 'N/A')),
+                                           num(fps.get('1% low', 'N/A')), num(gpu.get('moyenne', 'N/A')),
+                                           num(cpu.get('moyenne', 'N/A'))))
+
+    def set_segments_command(self, command):
+        # command(texte des plages) ; mémorisé si l'onglet n'est pas encore construit
+        self._segments_command = command
+        if getattr(self, 'segments_button', None):
+            self.segments_button.config(command=lambda: command(self.segments_entry.get()))
+
+    # === DIAGNOSTICS ===
+    def build_diagnostics_tab(self, parent):
+        self.diagnostics_title = ttk.Label(parent, text="", font=("Segoe UI", 16), foreground="#58a6ff")
+        self.diagnostics_title.pack(pady=(30, 10))
+
+        columns = ("Étape", "Temps (ms)", "Self (ms)", "Entrée", "Sortie", "Mémoire (Mo)", "Lignes retirées")
+        tree = ttk.Treeview(parent, columns=columns, show="headings")
+        tree.pack(fill="both", expand=True, padx=40, pady=10)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=130, anchor="center")
+        tree.column("Étape", width=220, anchor="w")
+        tree.column("Lignes retirées", width=280, anchor="w")
+        self.diagnostics_tree = tree
+
+    def update_diagnostics(self, diagnostics):
+        total = diagnostics.total_seconds or 0
+        title = f"Chargement : {total * 1000:.0f} ms" + (" (depuis le cache)" if diagnostics.cache_hit else "")
+        if diagnostics.columns is not None:
+            missing = ', '.join(name.strip() for name in diagnostics.columns['manquantes']) or 'aucune'
+            title += f" — colonnes : '{diagnostics.columns['disposition']}', manquantes : {missing}"
+        self.diagnostics_title.config(text=title)
+
+        tree = self.diagnostics_tree
+        tree.delete(*tree.get_children())
+        for r in diagnostics.stages:
+            tree.insert("", "end", values=(
+                "    " * r.depth + r.name,
+                f"{r.seconds * 1000:.1f}",
+                f"{r.self_seconds * 1000:.1f}",
+                "" if r.rows_in is None else r.rows_in,
+                "" if r.rows_out is None else r.rows_out,
+                "" if r.memory_delta is None else f"{r.memory_delta / 1e6:+.1f}",
+                ", ".join(f"{reason} : {count}" for reason, count in r.dropped.items()),
+            ))
+
+    # === CHARGEMENT EN COURS ===
+    def show_loading(self, file_name, cancel_command):
+        self.hide_loading()
+        self.loading_frame = ttk.Frame(self.root, style="Card.TFrame", padding="80")
+        self.loading_frame.pack(fill="both", expand=True, padx=40, pady=40)
+
+        ttk.Label(self.loading_frame, text="Chargement...", font=("Segoe UI", 26, "bold"),
+                  foreground="#58a6ff").pack(pady=(0, 10))
+        ttk.Label(self.loading_frame, text=file_name, font=("Segoe UI", 13),
+                  foreground="#8b949e").pack(pady=(0, 40))
+
+        self.progress_bar = ttk.Progressbar(self.loading_frame, length=500, mode="determinate", maximum=100)
+        self.progress_bar.pack(pady=10)
+        self.progress_label = ttk.Label(self.loading_frame, text="", font=("Segoe UI", 12), foreground="#8b949e")
+        self.progress_label.pack(pady=(0, 40))
+
+        ttk.Button(self.loading_frame, text="Annuler", style="Warning.TButton",
+                   command=cancel_command).pack()
+
+    def update_progress(self, stage, fraction):
+        if not self.progress_bar:
+            return
+        if fraction is None:
+            # Taille inconnue : barre indéterminée
+            if str(self.progress_bar['mode']) != "indeterminate":
+                self.progress_bar.config(mode="indeterminate")
+                self.progress_bar.start(15)
+        else:
+            if str(self.progress_bar['mode']) != "determinate":
+                self.progress_bar.stop()
+                self.progress_bar.config(mode="determinate")
+            self.progress_bar['value'] = fraction * 100
+        self.progress_label.config(text=stage)
+
+    def hide_loading(self):
+        if self.loading_frame:
+            self.loading_frame.destroy()
+        self.loading_frame = None
+        self.progress_bar = None
+        self.progress_label = None
+
     # === NAVIGATION & D'ACCUEIL ===
     def hide_main(self):
         self.main_frame.pack_forget()
 
     def show_main(self):
-        if self.results_frame:
-            self.results_frame.pack_forget()
+        self.release_results_frame()
         self.root.geometry("1000x620")
         self.center_window()
         self.main_frame.pack(fill="both", expand=True, padx=40, pady=40)
@@ -171,6 +809,11 @@ class StatsView:
             filetypes = [("Fichiers Excel", "*.xlsx *.xls"), ("Tous les fichiers", "*.*")]
         return filedialog.askopenfilename(title=title, filetypes=filetypes)
 
+    def ask_open_filenames(self, title="Ouvrir", filetypes=None):
+        if filetypes is None:
+            filetypes = [("Fichiers Excel", "*.xlsx *.xls"), ("Tous les fichiers", "*.*")]
+        return list(filedialog.askopenfilenames(title=title, filetypes=filetypes))
+
     def ask_save_filename(self, title="Enregistrer sous", filetypes=None, defaultextension=".json"):
         if filetypes is None:
             filetypes = [("Fichier JSON", "*.json"), ("Texte", "*.txt"), ("Tous", "*.*")]
@@ -185,6 +828,12 @@ class StatsView:
     def set_load_command(self, command):
         self.load_button.config(command=command)
 
+    def set_follow_command(self, command):
+        self.follow_button.config(command=command)
+
+    def set_compare_command(self, command):
+        self.compare_button.config(command=command)
+
     def set_back_command(self, command):
         if self.back_button:
             self.back_button.config(command=command)
@@ -198,4 +847,7 @@ class StatsView:
         messagebox.showerror(title, message, parent=self.root)
 
     def show_info(self, title, message):
-        messagebox.showinfo(title, message, parent=self.root)
\ No newline at end of file
+        messagebox.showinfo(title, message, parent=self.root)
+
+    def show_warning(self, title, message):
+        messagebox.showwarning(title, message, parent=self.root)
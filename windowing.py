@@ -0,0 +1,187 @@
+# windowing.py
+# Stats sur fenêtre glissante et par segment, en une passe vectorisée sur les tableaux
+# de la Session (pas de .rolling().apply ligne par ligne) :
+#   - moyenne glissante : sommes cumulées (somme et nombre de valeurs non-NaN)
+#   - min / max glissants : algorithme de van Herk / Gil-Werman, O(n) quelle que soit la
+#     taille de fenêtre (équivalent vectorisé du deque monotone, qui lui est séquentiel)
+#   - segments : parties de jeu séparées par des écrans de chargement / menus
+#     (framerate moyen bas) ou des trous dans le log
+# Les fenêtres sont "à droite" : la valeur i couvre les échantillons [i - w + 1, i].
+# Les w - 1 premières valeurs portent sur une fenêtre incomplète (voir full_windows).
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOW = '60s'
+
+# Détection automatique des segments
+LOADING_FPS = 30.0  # framerate moyen (lissé) en dessous duquel on considère un chargement / menu
+SMOOTHING_WINDOW = '10s'
+MIN_SEGMENT_SECONDS = 60.0
+GAP_SECONDS = 30.0  # trou dans le log (Afterburner en pause) : coupe le segment
+
+
+def window_samples(window, sample_interval):
+    # Fenêtre en nombre d'échantillons (int) ou en temps ('60s', secondes, Timedelta) :
+    # le temps est converti via l'intervalle d'échantillonnage médian
+    if isinstance(window, (int, np.integer)) and not isinstance(window, bool):
+        return max(int(window), 1)
+    duration = window if isinstance(window, pd.Timedelta) else (
+        pd.Timedelta(seconds=window) if isinstance(window, (float, np.floating)) else pd.Timedelta(window))
+    interval = pd.Timedelta(sample_interval)
+    if interval <= pd.Timedelta(0):
+        return 1
+    return max(int(round(duration / interval)), 1)
+
+
+def rolling_mean(values, window):
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    n = counts[end] - counts[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, (sums[end] - sums[start]) / np.maximum(n, 1), np.nan)
+
+
+def _van_herk(values, window, op, fill):
+    # Blocs de taille w : préfixe cumulé (gauche -> droite) et suffixe cumulé (droite -> gauche)
+    # dans chaque bloc ; fenêtre [i - w + 1, i] = op(suffixe[i - w + 1], préfixe[i])
+    n = len(values)
+    if n == 0:
+        return np.array([], dtype=np.float64)
+    w = min(window, n)
+    padded = np.concatenate([np.full(w - 1, fill), values])
+    blocks = -(-len(padded) // w)
+    padded = np.concatenate([padded, np.full(blocks * w - len(padded), fill)]).reshape(blocks, w)
+    prefix = op.accumulate(padded, axis=1).ravel()
+    suffix = op.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    i = np.arange(n)
+    return op(suffix[i], prefix[i + w - 1])
+
+
+def rolling_min(values, window):
+    values = np.asarray(values, dtype=np.float64)
+    out = _van_herk(np.where(np.isnan(values), np.inf, values), window, np.minimum, np.inf)
+    out[np.isinf(out) & (out > 0)] = np.nan  # fenêtre sans valeur
+    return out
+
+
+def rolling_max(values, window):
+    values = np.asarray(values, dtype=np.float64)
+    out = _van_herk(np.where(np.isnan(values), -np.inf, values), window, np.maximum, -np.inf)
+    out[np.isinf(out) & (out < 0)] = np.nan
+    return out
+
+
+def full_windows(values, window):
+    # Valeurs des fenêtres complètes seulement (les w - 1 premières sont partielles)
+    return values[min(window, len(values)) - 1:]
+
+
+def detect_segments(framerate, timestamps, sample_interval, loading_fps=LOADING_FPS,
+                    smoothing=SMOOTHING_WINDOW, min_seconds=MIN_SEGMENT_SECONDS, gap_seconds=GAP_SECONDS):
+    # -> [(début, fin)] en positions d'échantillons (fin exclue), parties "en jeu" seulement
+    n = len(framerate)
+    if n == 0:
+        return []
+    w = window_samples(smoothing, sample_interval)
+    # Moyenne lissée centrée : la frontière d'un chargement tombe au bon endroit
+    smooth = rolling_mean(framerate, w)
+    shift = w // 2
+    smooth = np.concatenate([smooth[shift:], np.full(shift, smooth[-1])])
+    playing = smooth >= loading_fps
+
+    # Ruptures : changement d'état ou trou dans le log
+    gaps = np.diff(timestamps) > gap_seconds * 1e9
+    breaks = np.flatnonzero((playing[1:] != playing[:-1]) | gaps) + 1
+    starts = np.concatenate([[0], breaks])
+    stops = np.concatenate([breaks, [n]])
+
+    keep = playing[starts] & ((timestamps[stops - 1] - timestamps[starts]) >= min_seconds * 1e9)
+    return list(zip(starts[keep].tolist(), stops[keep].tolist()))
+
+
+def ranges_to_segments(timestamps, ranges):
+    # Plages définies par l'utilisateur, en temps écoulé depuis le début de la session
+    # ('HH:MM:SS', secondes ou Timedelta) -> [(début, fin)] en positions d'échantillons
+    if not len(timestamps):
+        return []
+    origin = timestamps[0]
+    segments = []
+    for start, stop in ranges:
+        start_ns = origin + _elapsed(start).value
+        stop_ns = origin + _elapsed(stop).value
+        i = int(np.searchsorted(timestamps, start_ns, side='left'))
+        j = int(np.searchsorted(timestamps, stop_ns, side='right'))
+        if j > i:
+            segments.append((i, j))
+    return segments
+
+
+def parse_ranges(text):
+    # 'HH:MM:SS-HH:MM:SS, HH:MM:SS-HH:MM:SS' -> [(Timedelta, Timedelta)] ; ValueError si invalide
+    ranges = []
+    for part in text.replace(';', ',').split(','):
+        if not part.strip():
+            continue
+        bounds = part.split('-')
+        if len(bounds) != 2:
+            raise ValueError(f"Plage invalide : '{part.strip()}' (attendu HH:MM:SS-HH:MM:SS)")
+        try:
+            start, stop = _elapsed(bounds[0]), _elapsed(bounds[1])
+        except ValueError:
+            raise ValueError(f"Plage invalide : '{part.strip()}' (attendu HH:MM:SS-HH:MM:SS)") from None
+        if stop <= start:
+            raise ValueError(f"Plage invalide : '{part.strip()}' (la fin doit suivre le début)")
+        ranges.append((start, stop))
+    return ranges
+
+
+def _elapsed(value):
+    if isinstance(value, pd.Timedelta):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return pd.Timedelta(seconds=float(value))
+    return pd.Timedelta(str(value).strip())
+
+
+def segment_reductions(values, segments):
+    # values : (n_colonnes, n) ; -> dict de tableaux (n_colonnes, n_segments), NaN ignorés
+    if not segments:
+        empty = np.empty((values.shape[0], 0))
+        return {'moyenne': empty, 'min': empty, 'max': empty, '1% low': empty}
+    values = np.asarray(values, dtype=np.float64)
+    bounds = np.asarray(segments)
+    starts, stops = bounds[:, 0], bounds[:, 1]
+
+    # Segments disjoints et triés (cas de la détection) : reduceat sur les bornes.
+    # Sinon (plages utilisateur qui se chevauchent) : segment par segment.
+    ordered = np.all(starts[1:] >= stops[:-1])
+    if ordered:
+        edges = np.unique(np.concatenate([starts, stops[stops < values.shape[1]]]))
+        which = np.searchsorted(edges, starts)
+        valid = ~np.isnan(values)
+        counts = np.add.reduceat(valid.astype(np.int64), edges, axis=1)[:, which]
+        sums = np.add.reduceat(np.where(valid, values, 0.0), edges, axis=1)[:, which]
+        mins = np.minimum.reduceat(np.where(valid, values, np.inf), edges, axis=1)[:, which]
+        maxs = np.maximum.reduceat(np.where(valid, values, -np.inf), edges, axis=1)[:, which]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        mins = np.where(counts > 0, mins, np.nan)
+        maxs = np.where(counts > 0, maxs, np.nan)
+
+    # Colonne absente (tout NaN) sur un segment : NaN, sans avertissement numpy
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if not ordered:
+            means = np.stack([np.nanmean(values[:, a:b], axis=1) for a, b in segments], axis=1)
+            mins = np.stack([np.nanmin(values[:, a:b], axis=1) for a, b in segments], axis=1)
+            maxs = np.stack([np.nanmax(values[:, a:b], axis=1) for a, b in segments], axis=1)
+        # 1% low : un quantile par segment (les segments sont peu nombreux, chacun O(taille))
+        lows = np.stack([np.nanquantile(values[:, a:b], 0.01, axis=1) for a, b in segments], axis=1)
+    return {'moyenne': means, 'min': mins, 'max': maxs, '1% low': lows}
+
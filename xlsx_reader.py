@@ -0,0 +1,321 @@
+# xlsx_reader.py
+# Lecture par colonnes de la feuille active d'un .xlsx, sans passer par openpyxl pour les cellules.
+#
+# openpyxl construit un objet par cellule, y compris pour les capteurs qu'on jette ensuite
+# (~90 % du temps de chargement d'un export Excel). Ici le XML de la feuille est lu par blocs
+# et parcouru par une expression régulière qui ne retient que les colonnes demandées
+# (projection) : les autres cellules sont sautées sans être décodées. Les valeurs sont
+# converties par colonne, directement en float64 (métriques) ou en texte (horodatages).
+#
+# Limité à ce que produisent les exports de logs : valeurs numériques, chaînes partagées ou
+# en ligne, formules avec valeur en cache. Une feuille hors de ce cadre (cellules sans
+# référence 'r', ...) lève XlsxFormatError : l'appelant retombe alors sur openpyxl.
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+
+BLOCK_BYTES = 4 * 1024 * 1024
+
+_NS = {
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+_R_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+_ENTITY = re.compile(rb'&(amp|lt|gt|quot|apos|#x?[0-9a-fA-F]+);')
+_ENTITIES = {b'amp': '&', b'lt': '<', b'gt': '>', b'quot': '"', b'apos': "'"}
+_TEXT = re.compile(rb'<t\b[^>]*>([^<]*)</t>')
+_VALUE = re.compile(rb'<v>([^<]*)</v>')
+_TYPE = re.compile(rb'\bt="([a-zA-Z]+)"')
+
+EXCEL_EPOCH_1900 = np.datetime64('1899-12-30', 'ns')
+EXCEL_EPOCH_1904 = np.datetime64('1904-01-01', 'ns')
+
+
+class XlsxFormatError(ValueError):
+    pass
+
+
+def column_letters(index):
+    # 0 -> 'A', 25 -> 'Z', 26 -> 'AA'
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return letters
+
+
+def column_index(letters):
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - ord('A') + 1
+    return index - 1
+
+
+def _cell_pattern(letters):
+    # Cellule d'une des colonnes demandées -> (lettres, n° de ligne, attributs, valeur '<v>' seule,
+    # texte en ligne simple, contenu quelconque) ; les deux cas courants sont extraits par la regex
+    columns = b'[A-Z]{1,3}' if letters is None else b'|'.join(l.encode() for l in letters)
+    return re.compile(rb'<c r="(' + columns + rb')(\d+)"([^>]*?)'
+                      rb'(?:/>|><v>([^<]*)</v></c>|><is><t>([^<]*)</t></is></c>|>(.*?)</c>)', re.S)
+
+
+def _unescape(raw):
+    if b'&' not in raw:
+        return raw.decode('utf-8')
+
+    def entity(m):
+        name = m.group(1)
+        if name.startswith(b'#x'):
+            return chr(int(name[2:], 16)).encode('utf-8')
+        if name.startswith(b'#'):
+            return chr(int(name[1:])).encode('utf-8')
+        return _ENTITIES[name].encode('utf-8')
+    return _ENTITY.sub(entity, raw).decode('utf-8')
+
+
+class XlsxSheetReader:
+    def __init__(self, file_path, block_bytes=BLOCK_BYTES):
+        self.file_path = file_path
+        self.block_bytes = block_bytes
+        self.zip = zipfile.ZipFile(file_path)
+        try:
+            self._resolve_workbook()
+        except Exception:
+            self.zip.close()
+            raise
+        self._shared_strings = None
+        self.bytes_read = 0  # avancement (octets du XML de la feuille, décompressés)
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # === STRUCTURE DU CLASSEUR ===
+    def _rels(self, part):
+        folder, name = posixpath.split(part)
+        path = posixpath.join(folder, '_rels', name + '.rels')
+        if path not in self.zip.namelist():
+            return {}
+        rels = {}
+        for rel in ElementTree.fromstring(self.zip.read(path)).iter(f"{{{_NS['rel']}}}Relationship"):
+            target = rel.get('Target')
+            target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(folder, target))
+            rels[rel.get('Id')] = (rel.get('Type', '').rsplit('/', 1)[-1], target)
+        return rels
+
+    def _resolve_workbook(self):
+        root_rels = self._rels('')
+        workbook = next((target for kind, target in root_rels.values() if kind == 'officeDocument'),
+                        'xl/workbook.xml')
+        tree = ElementTree.fromstring(self.zip.read(workbook))
+        rels = self._rels(workbook)
+
+        sheets = [sheet.get(_R_ID) for sheet in tree.iter(f"{{{_NS['main']}}}sheet")]
+        if not sheets:
+            raise XlsxFormatError("Classeur sans feuille.")
+        view = tree.find(f"main:bookViews/main:workbookView", _NS)
+        active = int(view.get('activeTab', 0)) if view is not None else 0
+        rel_id = sheets[active if active < len(sheets) else 0]
+        if rel_id not in rels:
+            raise XlsxFormatError("Feuille introuvable dans le classeur.")
+        self.sheet_path = rels[rel_id][1]
+        self.sheet_bytes = self.zip.getinfo(self.sheet_path).file_size  # XML décompressé, pour la progression
+        self.shared_strings_path = next((target for kind, target in rels.values() if kind == 'sharedStrings'), None)
+
+        props = tree.find('main:workbookPr', _NS)
+        date1904 = props is not None and props.get('date1904', '0').lower() in ('1', 'true')
+        self.epoch = EXCEL_EPOCH_1904 if date1904 else EXCEL_EPOCH_1900
+
+    @property
+    def shared_strings(self):
+        if self._shared_strings is None:
+            strings = []
+            if self.shared_strings_path and self.shared_strings_path in self.zip.namelist():
+                with self.zip.open(self.shared_strings_path) as f:
+                    for _, element in ElementTree.iterparse(f):
+                        if element.tag == f"{{{_NS['main']}}}si":
+                            strings.append(''.join(t.text or '' for t in element.iter(f"{{{_NS['main']}}}t")))
+                            element.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    # === CELLULES ===
+    def _blocks(self):
+        # XML de la feuille par blocs coupés sur une fin de ligne ('</row>')
+        with self.zip.open(self.sheet_path) as f:
+            tail = b''
+            while True:
+                block = f.read(self.block_bytes)
+                self.bytes_read += len(block)
+                if not block:
+                    if tail.strip():
+                        yield tail
+                    return
+                data = tail + block
+                end = data.rfind(b'</row>')
+                if end < 0:
+                    tail = data
+                    continue
+                end += len(b'</row>')
+                yield data[:end]
+                tail = data[end:]
+
+    def _cell_value(self, attrs, body):
+        # -> float, str ou None (valeur d'une cellule isolée, pour l'en-tête)
+        kind = _TYPE.search(attrs)
+        kind = kind.group(1) if kind else b'n'
+        if body is None:
+            return None
+        if kind == b'inlineStr':
+            return ''.join(_unescape(t) for t in _TEXT.findall(body))
+        value = _VALUE.search(body)
+        if value is None:
+            return None
+        raw = value.group(1)
+        if kind == b's':
+            return self.shared_strings[int(raw)]
+        if kind in (b'str', b'e', b'd'):
+            return _unescape(raw)  # 'd' : date ISO 8601 en texte (horodatage : voir to_datetime_column)
+        if kind == b'b':
+            return float(raw == b'1')
+        return float(raw)
+
+    def head(self, n_rows):
+        # Premières lignes, toutes colonnes -> [tuple de valeurs], comme ws.iter_rows(values_only=True)
+        pattern = _cell_pattern(None)
+        rows = {}
+        done = False
+        for block in self._blocks():
+            for letters, row, attrs, value, text, body in pattern.findall(block):
+                row = int(row)
+                if row > n_rows:
+                    done = True
+                    break
+                rows.setdefault(row, {})[column_index(letters.decode())] = self._cell_value(
+                    attrs, _rebuild_body(value, text, body))
+            if done:
+                break
+        if not rows and self.sheet_has_cells():
+            raise XlsxFormatError("Cellules sans référence : format non pris en charge.")
+        result = []
+        for row in range(1, max(rows, default=0) + 1):
+            cells = rows.get(row, {})
+            result.append(tuple(cells.get(i) for i in range(max(cells, default=-1) + 1)))
+        return result
+
+    def sheet_has_cells(self):
+        with self.zip.open(self.sheet_path) as f:
+            return b'<c' in f.read(self.block_bytes)
+
+    def iter_columns(self, fields, text_fields=(), chunk_rows=200_000, min_row=1):
+        # fields : positions (0 = colonne A) à lire ; text_fields : celles gardées en texte
+        # -> blocs {position: tableau} d'environ chunk_rows lignes (lignes à partir de min_row)
+        self.bytes_read = 0  # avancement de cette lecture seule (pas de l'en-tête lu par head)
+        letters = [column_letters(field) for field in fields]
+        pattern = _cell_pattern(letters)
+        pending = []
+        pending_rows = 0
+        for block in self._blocks():
+            cells = pattern.findall(block)
+            if not cells:
+                continue
+            # Un bloc se termine sur une fin de ligne : chaque bloc est converti indépendamment
+            columns = self._to_columns(cells, fields, text_fields, min_row)
+            pending.append(columns)
+            pending_rows += len(columns[fields[0]])
+            if pending_rows >= chunk_rows:
+                yield _concat(pending, fields)
+                pending, pending_rows = [], 0
+        if pending:
+            yield _concat(pending, fields)
+
+    def _to_columns(self, cells, fields, text_fields, min_row):
+        letters, rows, attrs, values, texts, bodies = (np.array(part) for part in zip(*cells))
+        rows = rows.astype(np.int64)
+        typed = np.char.find(attrs, b't="') >= 0
+        kind_s = np.char.find(attrs, b't="s"') >= 0
+        kind_inline = np.char.find(attrs, b't="inlineStr"') >= 0
+        kind_n = ~typed | (np.char.find(attrs, b't="n"') >= 0)
+
+        # Nombres : '<v>' seul (cas courant), converti en bloc
+        numeric = kind_n & (values != b'')
+        # Chaînes partagées / en ligne simples, sinon décodage cellule par cellule
+        shared = kind_s & (values != b'')
+        inline = kind_inline & (bodies == b'') & (values == b'')
+        other = ~(numeric | shared | inline) & ((values != b'') | (texts != b'') | (bodies != b''))
+
+        strings = np.full(len(cells), None, dtype=object)
+        if shared.any():
+            table = np.array(self.shared_strings + [None], dtype=object)
+            index = values[shared].astype(np.int64)
+            strings[shared] = table[np.where(index < len(table) - 1, index, len(table) - 1)]
+        if inline.any():
+            strings[inline] = [_unescape(t) for t in texts[inline]]
+        for i in np.flatnonzero(other):
+            strings[i] = self._cell_value(attrs[i], _rebuild_body(values[i], texts[i], bodies[i]))
+
+        all_rows = np.unique(rows)
+        all_rows = all_rows[all_rows >= min_row]
+        columns = {}
+        for field in fields:
+            mask = (letters == column_letters(field).encode()) & (rows >= min_row)
+            positions = np.searchsorted(all_rows, rows[mask])
+            number_mask = numeric[mask]
+            columns[field] = self._column(len(all_rows), positions[number_mask], values[mask][number_mask],
+                                          positions[~number_mask], strings[mask][~number_mask],
+                                          field in text_fields)
+        return columns
+
+    def _column(self, n, positions, values, text_positions, texts, as_text):
+        try:
+            numbers = values.astype(np.float64)
+        except ValueError:
+            numbers = pd.to_numeric(pd.Series(values.astype(str), dtype=object), errors='coerce').to_numpy(
+                dtype=np.float64)
+        keep = np.array([t is not None for t in texts], dtype=bool)
+        text_positions, texts = text_positions[keep], texts[keep]
+
+        if as_text:
+            # Horodatages : un nombre est une date Excel (jours depuis l'epoch), convertie en
+            # datetime64. Colonne mixte : le type majoritaire l'emporte, l'autre donne NaT / None
+            # (Excel n'a laissé en texte que ce qu'il n'a pas su lire comme date, et inversement)
+            if len(numbers) > len(texts):
+                out = np.full(n, np.datetime64('NaT'), dtype='datetime64[ns]')
+                # arrondi à la milliseconde : précision d'un nombre de jours en float64
+                out[positions] = self.epoch + (numbers * 86400e3).round().astype('timedelta64[ms]')
+                return out
+            out = np.full(n, None, dtype=object)
+            out[text_positions] = texts
+            return out
+
+        out = np.full(n, np.nan)
+        out[positions] = numbers
+        if len(texts):
+            out[text_positions] = pd.to_numeric(pd.Series(texts, dtype=object), errors='coerce').to_numpy(
+                dtype=np.float64)
+        return out
+
+
+def _concat(pieces, fields):
+    if len(pieces) == 1:
+        return pieces[0]
+    return {field: np.concatenate([piece[field] for piece in pieces]) for field in fields}
+
+
+def _rebuild_body(value, text, body):
+    # Contenu d'une cellule, quelle que soit l'alternative de _cell_pattern qui l'a capturé
+    if value:
+        return b'<v>' + value + b'</v>'
+    if text:
+        return b'<is><t>' + text + b'</t></is>'
+    return body or None